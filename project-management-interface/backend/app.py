@@ -2,11 +2,13 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 
 from models import Project, db
+from webhooks import webhooks
 
 app = Flask(__name__)
 CORS(app)
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///projects.db"
 db.init_app(app)
+app.register_blueprint(webhooks)
 
 
 @app.route("/projects", methods=["GET"])
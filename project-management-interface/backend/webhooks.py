@@ -0,0 +1,61 @@
+import os
+import sys
+import uuid
+
+from flask import Blueprint, abort, current_app, jsonify, request
+
+# The ingestion logic lives in the orchestrator package at the repository root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT_DIR)
+
+from src.database.issue_mirror import DEFAULT_MIRROR_PATH, IssueMirror  # noqa: E402
+from src.integrations.github_webhooks import (  # noqa: E402
+    DEFAULT_QUEUE_PATH,
+    HANDLED_EVENTS,
+    WebhookProcessor,
+    WebhookQueue,
+    verify_signature,
+)
+
+webhooks = Blueprint("webhooks", __name__)
+
+
+def get_ingestion():
+    """Create the queue and processor once per app, using paths from the app config"""
+    if "github_webhooks" not in current_app.extensions:
+        queue_path = current_app.config.get("WEBHOOK_QUEUE_PATH", os.path.join(ROOT_DIR, DEFAULT_QUEUE_PATH))
+        mirror_path = current_app.config.get("ISSUE_MIRROR_PATH", os.path.join(ROOT_DIR, DEFAULT_MIRROR_PATH))
+        current_app.extensions["github_webhooks"] = (
+            WebhookQueue(queue_path),
+            WebhookProcessor(IssueMirror(mirror_path)),
+        )
+    return current_app.extensions["github_webhooks"]
+
+
+@webhooks.route("/webhooks/github", methods=["POST"])
+def receive_github_webhook():
+    secret = current_app.config.get("GITHUB_WEBHOOK_SECRET", os.getenv("GITHUB_WEBHOOK_SECRET", ""))
+    body = request.get_data()
+    if not verify_signature(secret, body, request.headers.get("X-Hub-Signature-256")):
+        abort(401)
+
+    event = request.headers.get("X-GitHub-Event", "")
+    if event == "ping":
+        return jsonify({"status": "pong"})
+    if event not in HANDLED_EVENTS:
+        return jsonify({"status": "ignored", "event": event}), 202
+
+    queue, processor = get_ingestion()
+    delivery_id = request.headers.get("X-GitHub-Delivery") or str(uuid.uuid4())
+    if not queue.append(delivery_id, event, request.get_json(force=True)):
+        return jsonify({"status": "duplicate"}), 202
+
+    # Applying to the local mirror is cheap, so keep the mirror current right away
+    processor.drain(queue)
+    return jsonify({"status": "queued"}), 202
+
+
+@webhooks.route("/webhooks/github/status", methods=["GET"])
+def webhook_queue_status():
+    queue, _ = get_ingestion()
+    return jsonify({"pending": queue.depth()})
@@ -1,5 +1,24 @@
 """Initialization for agents module."""
 
-from .llama_agent import LlamaAgent
+import importlib
+from typing import TYPE_CHECKING
 
 # __all__
+
+# Agents import crewai and langchain, so they load on first access only
+_EXPORTS = {
+    "LlamaAgent": ".llama_agent",
+}
+
+if TYPE_CHECKING:
+    from .llama_agent import LlamaAgent
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
@@ -1,13 +1,14 @@
 import os
 
 from crewai import Agent
-from langchain.llms import LlamaCpp
+
+from src.utils.model_pool import get_llm
 
 
 class LlamaAgent:
     def __init__(self):
 # model_path
-        self.llm = LlamaCpp(
+        self.llm = get_llm(
 # model_path
 # temperature
 # max_tokens
@@ -1,12 +1,13 @@
 import os
 
 from crewai import Agent
-from langchain.llms import LlamaCpp
+
+from src.utils.model_pool import get_llm
 
 
 class ProjectAgents:
     def __init__(self):
-        self.llm = LlamaCpp(
+        self.llm = get_llm(
 # model_path
 # n_gpu_layers
 # n_batch
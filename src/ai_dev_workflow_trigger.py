@@ -1,12 +1,13 @@
 import os
 
-from github import Github
 from github.GithubException import GithubException
 
+from src.utils.github_client import get_github
+
 
 class AIDevWorkflowTrigger:
     def __init__(self, github_token):
-        self.gh = Github(github_token)
+        self.gh = get_github(github_token)
         self.project_repo = self.gh.get_repo("ZubeidHendricks/project-orchestrator")
         self.aidev_repo = self.gh.get_repo("ZubeidHendricks/ai-dev-orchestrator")
 
@@ -2,12 +2,14 @@ import json
 import os
 from datetime import datetime
 
-from github import Github
+from src.integrations.mutation_outbox import MutationOutbox
+from src.utils.github_client import get_github
 
 
 class AlertManager:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
+        self.outbox = MutationOutbox.from_config(self.github)
         self.alerts_dir = "alerts"
         self.thresholds = self._load_thresholds()
 
@@ -79,11 +81,15 @@ class AlertManager:
         for alert in alerts:
             if alert["severity"] == "high":
                 self._create_github_issue(alert)
+        self.outbox.flush()
 
     def _create_github_issue(self, alert):
 # repo
-        repo.create_issue(
+        self.outbox.create_issue(
+            repo.full_name,
 # title
 # body
 # labels
+            # At most one issue per alert and day, even if the check runs repeatedly
+            key=f"alert:{repo.full_name}:{alert['title']}:{datetime.now():%Y-%m-%d}",
         )
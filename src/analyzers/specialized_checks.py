@@ -1,11 +1,9 @@
-import os
-
-from github import Github
+from src.utils.github_client import get_github
 
 
 class SpecializedAnalyzer:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
 
     def analyze_pos_system(self, repo_name):
         """Specialized checks for POS systems"""
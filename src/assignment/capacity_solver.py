@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import argparse
+import time
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+
+# Largest total penalty for filling a developer's last slot; only breaks ties between equal scores
+LOAD_PENALTY = 1e-3
+
+
+def score_matrix(
+    issue_skills: Sequence[Sequence[str]], developer_skills: Mapping[str, Mapping[str, float]]
+) -> np.ndarray:
+    """(issues x developers) sum of each developer's skill counts over the issue's skills"""
+    vocabulary: Dict[str, int] = {}
+    rows, cols, values = [], [], []
+    for row, skills in enumerate(developer_skills.values()):
+        for skill, count in skills.items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(skill, len(vocabulary)))
+            values.append(count)
+    developers = sparse.csr_matrix(
+        (values, (rows, cols)), shape=(len(developer_skills), max(len(vocabulary), 1)), dtype=np.float64
+    )
+
+    rows, cols = [], []
+    for row, skills in enumerate(issue_skills):
+        for skill in set(skills):
+            col = vocabulary.get(skill)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    issues = sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(issue_skills), developers.shape[1]), dtype=np.float64
+    )
+    return (issues @ developers.T).toarray()
+
+
+def solve(scores: np.ndarray, capacities: Sequence[int], load_penalty: float = LOAD_PENALTY) -> np.ndarray:
+    """Developer column for each issue row, or -1, maximising the total score under per-developer capacity.
+
+    Each developer is expanded into one column per free slot and the
+    (issues x slots) problem is solved with the Hungarian method. Later
+    slots of a developer cost slightly more, so equal scores go to the
+    least loaded developer. When there are more issues than slots, only
+    each developer's best len(slots) issues can be part of an optimal plan,
+    so the other rows are dropped before solving.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    issues, developers = scores.shape
+    assignment = np.full(issues, -1, dtype=np.int64)
+    capacities = np.clip(np.asarray(capacities, dtype=np.int64), 0, issues)
+    slot_developer = np.repeat(np.arange(developers), capacities)
+    if issues == 0 or slot_developer.size == 0:
+        return assignment
+
+    candidates = np.arange(issues)
+    if issues > slot_developer.size:
+        top = np.argpartition(-scores, slot_developer.size - 1, axis=0)[: slot_developer.size]
+        candidates = np.unique(top[:, capacities > 0])
+
+    slot_rank = np.arange(slot_developer.size) - np.repeat(np.cumsum(capacities) - capacities, capacities)
+    profit = scores[np.ix_(candidates, slot_developer)] - load_penalty * slot_rank / max(capacities.max(), 1)
+    rows, cols = linear_sum_assignment(profit, maximize=True)
+    assignment[candidates[rows]] = slot_developer[cols]
+    return assignment
+
+
+def plan_assignments(
+    issue_skills: Sequence[Sequence[str]],
+    developer_skills: Mapping[str, Mapping[str, float]],
+    capacities: Mapping[str, int],
+    critical: Optional[Sequence[bool]] = None,
+    critical_capacities: Optional[Mapping[str, int]] = None,
+) -> List[Optional[str]]:
+    """Developer for each issue (None when everyone is at capacity).
+
+    Critical issues are planned first within critical_capacities, then the
+    rest within what is left of capacities.
+    """
+    developers = list(developer_skills)
+    scores = score_matrix(issue_skills, developer_skills)
+    remaining = np.array([max(capacities.get(dev, 0), 0) for dev in developers], dtype=np.int64)
+    plan: List[Optional[str]] = [None] * len(issue_skills)
+
+    critical = np.zeros(len(issue_skills), dtype=bool) if critical is None else np.asarray(critical, dtype=bool)
+    phases = [np.flatnonzero(critical), np.flatnonzero(~critical)]
+    for phase, rows in enumerate(phases):
+        if not rows.size:
+            continue
+        limit = remaining
+        if phase == 0 and critical_capacities is not None:
+            limit = np.minimum(remaining, [max(critical_capacities.get(dev, 0), 0) for dev in developers])
+        assignment = solve(scores[rows], limit)
+        for row, column in zip(rows, assignment):
+            if column >= 0:
+                plan[row] = developers[column]
+        remaining = remaining - np.bincount(assignment[assignment >= 0], minlength=len(developers))
+    return plan
+
+
+def benchmark(issues: int = 5000, developers: int = 50, capacity: int = 5, seed: int = 0) -> Dict[str, float]:
+    """Time scoring and solving a bulk plan for synthetic issues and developers"""
+    rng = np.random.default_rng(seed)
+    skills = [f"skill-{i}" for i in range(200)]
+    developer_skills = {
+        f"dev-{i}": {skills[j]: int(rng.integers(1, 20)) for j in rng.choice(len(skills), 15, replace=False)}
+        for i in range(developers)
+    }
+    issue_skills = [[skills[j] for j in rng.choice(len(skills), 3, replace=False)] for _ in range(issues)]
+    capacities = {dev: capacity for dev in developer_skills}
+
+    start = time.perf_counter()
+    plan = plan_assignments(issue_skills, developer_skills, capacities)
+    seconds = time.perf_counter() - start
+
+    return {
+        "issues": issues,
+        "developers": developers,
+        "assigned": sum(dev is not None for dev in plan),
+        "seconds": round(seconds, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark capacity-constrained bulk issue assignment")
+    parser.add_argument("--issues", type=int, default=5000)
+    parser.add_argument("--developers", type=int, default=50)
+    parser.add_argument("--capacity", type=int, default=5)
+    args = parser.parse_args()
+
+    for key, value in benchmark(args.issues, args.developers, args.capacity).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# Issues scored per matrix product; bounds the dense (issues x developers) score block
+BATCH_SIZE = 4096
+
+
+def profile_skills(profile: dict) -> List[str]:
+    """Skills of a developer profile: its weighted skills, else its languages and technologies"""
+    if profile.get("skill_weights"):
+        return list(profile["skill_weights"])
+    skills = profile.get("skills", {})
+    return list(skills.get("languages", {})) + list(skills.get("technologies", {}))
+
+
+class SkillMatcher:
+    """Scores issues against every developer with one sparse matrix product.
+
+    Developers and issues are binary skill vectors, as with the
+    MultiLabelBinarizer encoding used before, and the score is their cosine
+    similarity |issue & developer| / sqrt(|issue| * |developer|). The
+    developer matrix is rebuilt only when the profiles change; `best_match`
+    can score a subset of its developers without rebuilding it.
+    """
+
+    def __init__(self, profiles: Optional[List[dict]] = None):
+        self.usernames: List[str] = []
+        self.columns: Dict[str, int] = {}
+        self.vocabulary: Dict[str, int] = {}
+        self.matrix = sparse.csr_matrix((0, 0))
+        self.fingerprint: Optional[str] = None
+        if profiles is not None:
+            self.update(profiles)
+
+    @staticmethod
+    def _fingerprint(profiles: List[dict]) -> str:
+        digest = hashlib.sha256()
+        for profile in profiles:
+            digest.update(json.dumps([profile.get("username"), sorted(profile_skills(profile))]).encode())
+        return digest.hexdigest()
+
+    def update(self, profiles: List[dict]) -> bool:
+        """Rebuild the developer matrix if the profiles changed; returns whether it was rebuilt"""
+        fingerprint = self._fingerprint(profiles)
+        if fingerprint == self.fingerprint:
+            return False
+
+        vocabulary: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, profile in enumerate(profiles):
+            for skill in set(profile_skills(profile)):
+                rows.append(row)
+                cols.append(vocabulary.setdefault(skill.lower(), len(vocabulary)))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(profiles), max(len(vocabulary), 1)), dtype=np.float64
+        )
+        matrix.data[:] = 1.0
+        norms = np.sqrt(np.asarray(matrix.sum(axis=1)).ravel())
+        # Pre-normalise rows so a product gives |issue & developer| / sqrt(|developer|)
+        self.matrix = sparse.diags(np.where(norms > 0, 1 / np.where(norms > 0, norms, 1), 0)) @ matrix
+        self.matrix = self.matrix.T.tocsr()
+        self.usernames = [profile["username"] for profile in profiles]
+        self.columns = {username: col for col, username in reversed(list(enumerate(self.usernames)))}
+        self.vocabulary = vocabulary
+        self.fingerprint = fingerprint
+        return True
+
+    def _encode(self, issues: Sequence[Iterable[str]]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        """Binary issue matrix over the developer vocabulary, plus each issue's full skill count"""
+        rows, cols, sizes = [], [], np.zeros(len(issues))
+        for row, skills in enumerate(issues):
+            unique = {skill.lower() for skill in skills}
+            # Skills no developer has still count towards the issue's norm
+            sizes[row] = len(unique)
+            for skill in unique:
+                col = self.vocabulary.get(skill)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        encoded = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(issues), self.matrix.shape[0]), dtype=np.float64
+        )
+        return encoded, sizes
+
+    def scores(self, issues: Sequence[Iterable[str]]) -> np.ndarray:
+        """Dense (issues x developers) cosine similarities"""
+        encoded, sizes = self._encode(issues)
+        products = (encoded @ self.matrix).toarray()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(sizes[:, None] > 0, products / np.sqrt(np.maximum(sizes, 1))[:, None], 0.0)
+
+    def top_k(self, issues: Sequence[Iterable[str]], k: int = 3) -> List[List[Tuple[str, float]]]:
+        """Best k (username, score) per issue, highest first; ties keep profile order"""
+        if not self.usernames:
+            return [[] for _ in issues]
+        k = min(k, len(self.usernames))
+        results = []
+        for start in range(0, len(issues), BATCH_SIZE):
+            block = self.scores(issues[start : start + BATCH_SIZE])
+            if k < block.shape[1]:
+                # argpartition picks arbitrarily among scores equal to the k-th best, so take
+                # everything above it and fill the remaining slots with the first tied columns
+                kth = -np.partition(-block, k - 1, axis=1)[:, k - 1 : k]
+                above = block > kth
+                tied = block == kth
+                tied &= np.cumsum(tied, axis=1) <= k - above.sum(axis=1, keepdims=True)
+                candidates = np.nonzero(above | tied)[1].reshape(-1, k)
+            else:
+                candidates = np.tile(np.arange(block.shape[1]), (block.shape[0], 1))
+            picked = np.take_along_axis(block, candidates, axis=1)
+            # Sort by score, then by column so equal scores keep profile order
+            order = np.lexsort((candidates, -picked), axis=1)
+            candidates = np.take_along_axis(candidates, order, axis=1)
+            picked = np.take_along_axis(picked, order, axis=1)
+            for row_candidates, row_scores in zip(candidates, picked):
+                results.append(
+                    [(self.usernames[col], round(float(score), 6)) for col, score in zip(row_candidates, row_scores)]
+                )
+        return results
+
+    def best_match(self, issue_skills: Iterable[str], among: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Best-scoring username; ties keep profile order.
+
+        `among` restricts scoring to those developers' columns. Developers
+        outside it are taken to score zero, so with no scored developer the
+        first profile is returned, as argmax over all-zero scores did.
+        """
+        if not self.usernames:
+            return None
+        if among is None:
+            return self.top_k([list(issue_skills)], k=1)[0][0][0]
+        columns = sorted({self.columns[username] for username in among if username in self.columns})
+        if not columns:
+            return self.usernames[0]
+        encoded, _ = self._encode([list(issue_skills)])
+        products = (encoded @ self.matrix[:, columns]).toarray()[0]
+        if products.max() <= 0:
+            return self.usernames[0]
+        return self.usernames[columns[int(np.argmax(products))]]
+
+
+def _synthetic(developers: int, issues: int, vocabulary: int = 300, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    skills = [f"skill-{i}" for i in range(vocabulary)]
+    profiles = [
+        {"username": f"dev-{i}", "skill_weights": {skills[j]: 1.0 for j in rng.choice(vocabulary, 12, replace=False)}}
+        for i in range(developers)
+    ]
+    issue_skills = [[skills[j] for j in rng.choice(vocabulary, 4, replace=False)] for _ in range(issues)]
+    return profiles, issue_skills
+
+
+def benchmark(developers: int = 1000, issues: int = 10000, k: int = 3) -> Dict[str, float]:
+    """Time building the developer matrix and ranking every issue against every developer"""
+    profiles, issue_skills = _synthetic(developers, issues)
+
+    start = time.perf_counter()
+    matcher = SkillMatcher(profiles)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher.top_k(issue_skills, k=k)
+    match_seconds = time.perf_counter() - start
+
+    return {
+        "developers": developers,
+        "issues": issues,
+        "build_seconds": round(build_seconds, 4),
+        "match_seconds": round(match_seconds, 4),
+        "issues_per_second": round(issues / match_seconds, 1) if match_seconds else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched developer/issue skill matching")
+    parser.add_argument("--developers", type=int, default=1000)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+
+    for key, value in benchmark(args.developers, args.issues, args.k).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,11 @@
 import json
-import os
 
-from github import Github
+from src.utils.github_client import get_github
 
 
 class TeamManager:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
         self.load_team_structure()
 
     def load_team_structure(self):
@@ -1,12 +1,13 @@
 import os
 
 import slack
-from github import Github
+
+from src.utils.github_client import get_github
 
 
 class CollaborationIntegrator:
     def __init__(self, github_token, slack_token):
-        self.gh = Github(github_token)
+        self.gh = get_github(github_token)
         self.slack_client = slack.WebClient(token=slack_token)
         self.project_repo = self.gh.get_repo("ZubeidHendricks/project-orchestrator")
 
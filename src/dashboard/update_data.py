@@ -4,36 +4,43 @@ import os
 from datetime import datetime
 
 import networkx as nx
-from github import Github
+
+from src.utils.github_client import get_github
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.repository_counts import RepositoryCountsFetcher
 
 
 class CrossRepositoryOrchestrator:
     def __init__(self, token):
-        self.gh = Github(token)
+        self.gh = get_github(token)
+        self.counts_fetcher = RepositoryCountsFetcher(token)
         self.repositories = ["project-orchestrator", "ai-dev-orchestrator"]
 
     def build_dependency_graph(self):
         """Create a dependency network between repositories"""
 # G
+        # Repository names keep their separators: "repo a" must not reference "repo-a"
+        references = KeywordMatcher({"repositories": self.repositories}, exact=True)
+        counts = self.counts_fetcher.fetch(self.repositories)
 
         for repo_name in self.repositories:
             try:
 # repo
+                repo_counts = counts[self.counts_fetcher.full_name(repo_name)]
 
                 # Add repository as a node
                 G.add_node(
                     repo_name,
 # total_issues
-                    open_issues=repo.get_issues(state="open").totalCount,
+                    open_issues=repo_counts["open_issues"] if repo_counts else repo.get_issues(state="open").totalCount,
 # last_updated
                 )
 
                 # Analyze inter-repository references
                 for issue in repo.get_issues(state="open"):
                     # Check for cross-repository references in issue body
-                    for other_repo in self.repositories:
-                        if other_repo in (issue.body or ""):
-                            G.add_edge(repo_name, other_repo)
+                    for other_repo in references.find(issue.body):
+                        G.add_edge(repo_name, other_repo)
 
             except Exception as e:
                 print(f"Error processing repository {repo_name}: {e}")
@@ -50,8 +57,19 @@ class CrossRepositoryOrchestrator:
             "dependencies": list(dependency_graph.edges()),
         }
 
+        counts = self.counts_fetcher.fetch(self.repositories)
+
         for repo in self.repositories:
             try:
+                repo_counts = counts[self.counts_fetcher.full_name(repo)]
+                if repo_counts:
+                    insights["repositories"][repo] = {
+                        "total_issues": repo_counts["open_issues"] + repo_counts["closed_issues"],
+                        "open_issues": repo_counts["open_issues"],
+                        "last_updated": repo_counts["updated_at"].isoformat(),
+                    }
+                    continue
+
 # repo_data
 
                 insights["repositories"][repo] = {
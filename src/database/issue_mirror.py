@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIRROR_PATH = "data/issue_mirror.db"
+
+# Mirrored issues expose the same attribute shapes as PyGithub objects for read-only code
+MirroredLabel = namedtuple("MirroredLabel", ["name"])
+MirroredUser = namedtuple("MirroredUser", ["login"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    is_pull_request INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL,
+    title TEXT,
+    body TEXT,
+    author TEXT,
+    assignee TEXT,
+    assignees TEXT,
+    labels TEXT,
+    comments INTEGER DEFAULT 0,
+    html_url TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    closed_at TEXT,
+    PRIMARY KEY (repo, number)
+);
+CREATE TABLE IF NOT EXISTS issue_labels (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (repo, number, label)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT
+);
+CREATE TABLE IF NOT EXISTS workflow_runs (
+    repo TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    name TEXT,
+    head_branch TEXT,
+    status TEXT,
+    conclusion TEXT,
+    html_url TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (repo, run_id)
+);
+CREATE TABLE IF NOT EXISTS deployments (
+    repo TEXT NOT NULL,
+    deployment_id INTEGER NOT NULL,
+    environment TEXT,
+    state TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (repo, deployment_id)
+);
+CREATE TABLE IF NOT EXISTS repository_activity (
+    repo TEXT PRIMARY KEY,
+    last_event TEXT,
+    last_event_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_workflow_runs_updated ON workflow_runs (repo, updated_at);
+CREATE INDEX IF NOT EXISTS idx_repository_activity_at ON repository_activity (last_event_at);
+CREATE INDEX IF NOT EXISTS idx_issues_repo_state ON issues (repo, state);
+CREATE INDEX IF NOT EXISTS idx_issues_assignee ON issues (assignee);
+CREATE INDEX IF NOT EXISTS idx_issues_updated ON issues (repo, updated_at);
+CREATE INDEX IF NOT EXISTS idx_issue_labels_label ON issue_labels (label, repo);
+"""
+
+COLUMNS = [
+    "repo",
+    "number",
+    "is_pull_request",
+    "state",
+    "title",
+    "body",
+    "author",
+    "assignee",
+    "assignees",
+    "labels",
+    "comments",
+    "html_url",
+    "created_at",
+    "updated_at",
+    "closed_at",
+]
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime("%Y-%m-%dT%H:%M:%S") if value else None
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S") if value else None
+
+
+def _to_precise_text(value: datetime) -> str:
+    """Microsecond timestamps for activity, which is compared against the time a drain started"""
+    return value.isoformat(timespec="microseconds")
+
+
+def _payload_time(value: Optional[str]) -> Optional[str]:
+    """Normalise webhook timestamps ("2024-12-27T06:10:24Z") to the mirror's text format"""
+    return value[:19] if value else None
+
+
+@dataclass
+class MirroredIssue:
+    """Read-only snapshot of an issue or pull request stored in the mirror"""
+
+    repo: str
+    number: int
+    state: str
+    title: str
+    body: Optional[str]
+    user: Optional[MirroredUser]
+    assignee: Optional[MirroredUser]
+    assignees: List[MirroredUser] = field(default_factory=list)
+    labels: List[MirroredLabel] = field(default_factory=list)
+    comments: int = 0
+    html_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
+    pull_request: bool = False
+
+    @property
+    def label_names(self) -> List[str]:
+        return [label.name for label in self.labels]
+
+
+class IssueMirror:
+    """Local SQLite mirror of GitHub issues and pull requests.
+
+    `sync` only downloads issues updated since the last watermark of a
+    repository, so routine runs cost one or two requests instead of paging
+    through the full history. A full re-scan happens only with rebuild=True.
+    """
+
+    def __init__(self, path: str = DEFAULT_MIRROR_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def watermark(self, repo: str) -> Optional[datetime]:
+        with self._lock:
+            row = self._conn.execute("SELECT watermark FROM sync_state WHERE repo = ?", (repo,)).fetchone()
+        return _to_datetime(row[0]) if row else None
+
+    def sync(self, repository, rebuild: bool = False) -> int:
+        """Fold issues updated since the last sync of a PyGithub repository into the mirror"""
+        repo = repository.full_name
+        watermark = None if rebuild else self.watermark(repo)
+        if rebuild:
+            self.clear(repo)
+
+        params = {"state": "all", "sort": "updated", "direction": "asc"}
+        if watermark:
+            params["since"] = watermark
+
+        latest = watermark
+        synced = 0
+        for issue in repository.get_issues(**params):
+            self.upsert(self._row_from_issue(repo, issue), commit=False)
+            if latest is None or issue.updated_at > latest:
+                latest = issue.updated_at
+            synced += 1
+            if synced % 100 == 0:
+                self._commit()
+
+        self._set_watermark(repo, latest)
+        logger.info(f"Issue mirror synced {synced} issues for {repo} (since {watermark or 'beginning'})")
+        return synced
+
+    def upsert(self, row: dict, commit: bool = True) -> bool:
+        """Insert or replace one issue row (see COLUMNS) and its label index.
+
+        A stored row is only replaced by one at least as recently updated, so
+        redelivered or out-of-order webhook payloads cannot move an issue
+        back to an older state. Returns whether the row was written.
+        """
+        values = [row.get(column) for column in COLUMNS]
+        updates = ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[2:])
+        with self._lock:
+            cursor = self._conn.execute(
+                f"INSERT INTO issues ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+                f"ON CONFLICT (repo, number) DO UPDATE SET {updates} "
+                "WHERE issues.updated_at IS NULL OR excluded.updated_at >= issues.updated_at",
+                values,
+            )
+            if cursor.rowcount == 0:
+                return False
+            self._conn.execute("DELETE FROM issue_labels WHERE repo = ? AND number = ?", (row["repo"], row["number"]))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO issue_labels (repo, number, label) VALUES (?, ?, ?)",
+                [(row["repo"], row["number"], label) for label in json.loads(row.get("labels") or "[]")],
+            )
+            if commit:
+                self._conn.commit()
+        return True
+
+    def issues(
+        self,
+        repo: str,
+        state: Optional[str] = "open",
+        assignee: Optional[str] = None,
+        labels: Optional[Iterable[str]] = None,
+        updated_since: Optional[datetime] = None,
+        closed_since: Optional[datetime] = None,
+        pull_requests: Optional[bool] = None,
+    ) -> List[MirroredIssue]:
+        """Query mirrored issues; state="all" matches any state, labels must all be present.
+
+        pull_requests=None returns issues and pull requests alike, like the
+        REST issues listing; True or False restricts to one kind.
+        """
+        clauses = ["repo = ?"]
+        params: list = [repo]
+
+        if state and state != "all":
+            clauses.append("state = ?")
+            params.append(state)
+        if assignee:
+            clauses.append("assignee = ?")
+            params.append(assignee)
+        if updated_since:
+            clauses.append("updated_at >= ?")
+            params.append(_to_text(updated_since))
+        if closed_since:
+            clauses.append("closed_at > ?")
+            params.append(_to_text(closed_since))
+        if pull_requests is not None:
+            clauses.append("is_pull_request = ?")
+            params.append(int(pull_requests))
+        for label in labels or []:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM issue_labels l "
+                "WHERE l.repo = issues.repo AND l.number = issues.number AND l.label = ?)"
+            )
+            params.append(label)
+
+        query = f"SELECT {', '.join(COLUMNS)} FROM issues WHERE {' AND '.join(clauses)} ORDER BY number DESC"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._issue_from_row(dict(zip(COLUMNS, row))) for row in rows]
+
+    def get(self, repo: str, number: int) -> Optional[MirroredIssue]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM issues WHERE repo = ? AND number = ?", (repo, number)
+            ).fetchone()
+        return self._issue_from_row(dict(zip(COLUMNS, row))) if row else None
+
+    def count(
+        self,
+        repo: str,
+        state: Optional[str] = "open",
+        pull_requests: Optional[bool] = None,
+        exclude_labels: Iterable[str] = (),
+    ) -> int:
+        """Number of mirrored issues, leaving out those carrying any of exclude_labels"""
+        clauses = ["repo = ?"]
+        params: list = [repo]
+        exclude_labels = list(exclude_labels)
+        if exclude_labels:
+            clauses.append(
+                "NOT EXISTS (SELECT 1 FROM issue_labels l WHERE l.repo = issues.repo AND l.number = issues.number "
+                f"AND l.label IN ({', '.join('?' * len(exclude_labels))}))"
+            )
+            params.extend(exclude_labels)
+        if state and state != "all":
+            clauses.append("state = ?")
+            params.append(state)
+        if pull_requests is not None:
+            clauses.append("is_pull_request = ?")
+            params.append(int(pull_requests))
+        query = f"SELECT COUNT(*) FROM issues WHERE {' AND '.join(clauses)}"
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def is_synced(self, repo: str) -> bool:
+        """Whether the repository has been fully synced at least once, so its counts are complete"""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM sync_state WHERE repo = ?", (repo,)).fetchone() is not None
+
+    def upsert_payload(self, repo: str, item: dict) -> bool:
+        """Apply an issue or pull_request object from a webhook payload; older payloads are ignored"""
+        return self.upsert(self._row_from_payload(repo, item))
+
+    def record_workflow_run(self, repo: str, run: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO workflow_runs "
+                "(repo, run_id, name, head_branch, status, conclusion, html_url, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    repo,
+                    run["id"],
+                    run.get("name"),
+                    run.get("head_branch"),
+                    run.get("status"),
+                    run.get("conclusion"),
+                    run.get("html_url"),
+                    _payload_time(run.get("created_at")),
+                    _payload_time(run.get("updated_at")),
+                ),
+            )
+            self._conn.commit()
+
+    def record_deployment(self, repo: str, deployment: dict, state: Optional[str] = None) -> None:
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT state FROM deployments WHERE repo = ? AND deployment_id = ?", (repo, deployment["id"])
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO deployments (repo, deployment_id, environment, state, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    repo,
+                    deployment["id"],
+                    deployment.get("environment"),
+                    state or (previous[0] if previous else "pending"),
+                    _payload_time(deployment.get("created_at")),
+                    _payload_time(deployment.get("updated_at")),
+                ),
+            )
+            self._conn.commit()
+
+    def workflow_runs(self, repo: str, limit: int = 10) -> List[dict]:
+        columns = ["run_id", "name", "head_branch", "status", "conclusion", "html_url", "created_at", "updated_at"]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM workflow_runs WHERE repo = ? ORDER BY updated_at DESC LIMIT ?",
+                (repo, limit),
+            ).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def latest_deployment(self, repo: str) -> Optional[dict]:
+        columns = ["deployment_id", "environment", "state", "created_at", "updated_at"]
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM deployments WHERE repo = ? ORDER BY created_at DESC LIMIT 1",
+                (repo,),
+            ).fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    def record_activity(self, repo: str, event: str, at: Optional[datetime] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO repository_activity (repo, last_event, last_event_at) VALUES (?, ?, ?)",
+                (repo, event, _to_precise_text(at or datetime.utcnow())),
+            )
+            self._conn.commit()
+
+    def changed_repositories(self, since: datetime) -> List[str]:
+        """Repositories that received a webhook event at or after `since`"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT repo FROM repository_activity WHERE last_event_at >= ? ORDER BY repo",
+                (_to_precise_text(since),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self, repo: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM issues WHERE repo = ?", (repo,))
+            self._conn.execute("DELETE FROM issue_labels WHERE repo = ?", (repo,))
+            self._conn.execute("DELETE FROM sync_state WHERE repo = ?", (repo,))
+            self._conn.commit()
+
+    def _set_watermark(self, repo: str, watermark: Optional[datetime]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (repo, watermark, synced_at) VALUES (?, ?, ?)",
+                (repo, _to_text(watermark), _to_text(datetime.utcnow())),
+            )
+            self._conn.commit()
+
+    def _commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+    @staticmethod
+    def _row_from_issue(repo: str, issue) -> dict:
+        return {
+            "repo": repo,
+            "number": issue.number,
+            "is_pull_request": int(issue.pull_request is not None),
+            "state": issue.state,
+            "title": issue.title,
+            "body": issue.body,
+            "author": issue.user.login if issue.user else None,
+            "assignee": issue.assignee.login if issue.assignee else None,
+            "assignees": json.dumps([user.login for user in issue.assignees]),
+            "labels": json.dumps([label.name for label in issue.labels]),
+            "comments": issue.comments,
+            "html_url": issue.html_url,
+            "created_at": _to_text(issue.created_at),
+            "updated_at": _to_text(issue.updated_at),
+            "closed_at": _to_text(issue.closed_at),
+        }
+
+    @staticmethod
+    def _row_from_payload(repo: str, item: dict) -> dict:
+        is_pull_request = "pull_request" in item or "merged" in item or "head" in item
+        return {
+            "repo": repo,
+            "number": item["number"],
+            "is_pull_request": int(is_pull_request),
+            "state": item["state"],
+            "title": item.get("title"),
+            "body": item.get("body"),
+            "author": (item.get("user") or {}).get("login"),
+            "assignee": (item.get("assignee") or {}).get("login"),
+            "assignees": json.dumps([user["login"] for user in item.get("assignees") or []]),
+            "labels": json.dumps([label["name"] for label in item.get("labels") or []]),
+            "comments": item.get("comments", 0),
+            "html_url": item.get("html_url"),
+            "created_at": _payload_time(item.get("created_at")),
+            "updated_at": _payload_time(item.get("updated_at")),
+            "closed_at": _payload_time(item.get("closed_at")),
+        }
+
+    @staticmethod
+    def _issue_from_row(row: dict) -> MirroredIssue:
+        return MirroredIssue(
+            repo=row["repo"],
+            number=row["number"],
+            state=row["state"],
+            title=row["title"],
+            body=row["body"],
+            user=MirroredUser(row["author"]) if row["author"] else None,
+            assignee=MirroredUser(row["assignee"]) if row["assignee"] else None,
+            assignees=[MirroredUser(login) for login in json.loads(row["assignees"] or "[]")],
+            labels=[MirroredLabel(name) for name in json.loads(row["labels"] or "[]")],
+            comments=row["comments"] or 0,
+            html_url=row["html_url"],
+            created_at=_to_datetime(row["created_at"]),
+            updated_at=_to_datetime(row["updated_at"]),
+            closed_at=_to_datetime(row["closed_at"]),
+            pull_request=bool(row["is_pull_request"]),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the local issue mirror")
+    parser.add_argument("repositories", nargs="+", help="Repositories to sync (owner/name)")
+    parser.add_argument("--rebuild", action="store_true", help="Drop mirrored data and re-scan full history")
+    args = parser.parse_args()
+
+    from src.utils.github_client import get_github
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    github = get_github()
+    mirror = IssueMirror()
+    for full_name in args.repositories:
+        mirror.sync(github.get_repo(full_name), rebuild=args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
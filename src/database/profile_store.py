@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from src.assignment.skill_matcher import profile_skills
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_STORE_PATH = "data/developer_profiles.db"
+
+PROFILE_LABEL = "developer-profile"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    username TEXT PRIMARY KEY,
+    issue_number INTEGER,
+    updated_at TEXT,
+    profile TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_skills (
+    skill TEXT NOT NULL,
+    username TEXT NOT NULL,
+    PRIMARY KEY (skill, username)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_profile_skills_username ON profile_skills (username);
+"""
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime("%Y-%m-%dT%H:%M:%S") if value else None
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S") if value else None
+
+
+class ProfileStore:
+    """Local SQLite copy of the developer profiles published as issues, indexed by skill.
+
+    The `developer-profile` issues stay the published copy. `refresh` only
+    fetches profile issues updated since the last watermark, and each
+    profile is versioned by its issue's updated_at so an older issue never
+    overwrites a newer profile of the same developer. `candidates` reads the
+    skill -> developer index, so it touches only developers that share a
+    skill with the request. `revision` counts the changes made through this
+    store, so callers can tell when data derived from `profiles` is stale.
+    """
+
+    def __init__(self, path: str = DEFAULT_PROFILE_STORE_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self.revision = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def watermark(self, repo: str) -> Optional[datetime]:
+        with self._lock:
+            row = self._conn.execute("SELECT watermark FROM sync_state WHERE repo = ?", (repo,)).fetchone()
+        return _to_datetime(row[0]) if row else None
+
+    def refresh(self, repository, rebuild: bool = False) -> int:
+        """Fold profile issues updated since the last refresh of a PyGithub repository into the store"""
+        repo = repository.full_name
+        watermark = None if rebuild else self.watermark(repo)
+        if rebuild:
+            self.clear()
+
+        params = {"labels": [PROFILE_LABEL], "state": "all", "sort": "updated", "direction": "asc"}
+        if watermark:
+            params["since"] = watermark
+
+        latest = watermark
+        changed = 0
+        for issue in repository.get_issues(**params):
+            if latest is None or issue.updated_at > latest:
+                latest = issue.updated_at
+            if issue.state == "closed":
+                changed += self.remove(issue.number, commit=False)
+                continue
+            try:
+                profile = json.loads(issue.body)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping unparsable developer profile in issue #{issue.number}: {e}")
+                continue
+            changed += self.upsert(profile, issue.updated_at, issue.number, commit=False)
+
+        self._set_watermark(repo, latest)
+        if changed:
+            logger.info(f"Profile store refreshed {changed} developer profiles from {repo}")
+        return changed
+
+    def upsert(
+        self, profile: dict, updated_at: Optional[datetime] = None, issue_number: Optional[int] = None, commit=True
+    ) -> bool:
+        """Store a profile unless a newer version of it is already stored; returns whether it was stored"""
+        username = profile.get("username")
+        if not username:
+            return False
+        updated = _to_text(updated_at or datetime.utcnow())
+        with self._lock:
+            row = self._conn.execute("SELECT updated_at FROM profiles WHERE username = ?", (username,)).fetchone()
+            if row and row[0] and row[0] > updated:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (username, issue_number, updated_at, profile) VALUES (?, ?, ?, ?)",
+                (username, issue_number, updated, json.dumps(profile)),
+            )
+            self._conn.execute("DELETE FROM profile_skills WHERE username = ?", (username,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO profile_skills (skill, username) VALUES (?, ?)",
+                [(skill.lower(), username) for skill in profile_skills(profile)],
+            )
+            self.revision += 1
+            if commit:
+                self._conn.commit()
+        return True
+
+    def remove(self, issue_number: int, commit: bool = True) -> bool:
+        """Drop the profile published by a (closed) issue, if it is the stored version"""
+        with self._lock:
+            row = self._conn.execute("SELECT username FROM profiles WHERE issue_number = ?", (issue_number,)).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM profiles WHERE username = ?", (row[0],))
+            self._conn.execute("DELETE FROM profile_skills WHERE username = ?", (row[0],))
+            self.revision += 1
+            if commit:
+                self._conn.commit()
+        return True
+
+    def get(self, username: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT profile FROM profiles WHERE username = ?", (username,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def profiles(self) -> List[dict]:
+        """Every stored profile, newest profile issue first as the issue listing returned them"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT profile FROM profiles ORDER BY issue_number IS NULL, issue_number DESC, username"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def candidates(self, skills: Iterable[str]) -> List[str]:
+        """Usernames of the developers having at least one of the skills"""
+        skills = sorted({skill.lower() for skill in skills})
+        if not skills:
+            return []
+        query = f"SELECT DISTINCT username FROM profile_skills WHERE skill IN ({', '.join('?' * len(skills))})"
+        with self._lock:
+            rows = self._conn.execute(query, skills).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM profiles")
+            self._conn.execute("DELETE FROM profile_skills")
+            self._conn.execute("DELETE FROM sync_state")
+            self.revision += 1
+            self._conn.commit()
+
+    def _set_watermark(self, repo: str, watermark: Optional[datetime]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (repo, watermark, synced_at) VALUES (?, ?, ?)",
+                (repo, _to_text(watermark), _to_text(datetime.utcnow())),
+            )
+            self._conn.commit()
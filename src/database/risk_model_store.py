@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/risk_model.json"
+
+DEFAULT_CONFIG = {
+    "directory": "data/risk_model",
+    # Closed issues added or changed since the last fit before the model is retrained
+    "retrain_after": 50,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch(when: Optional[datetime]) -> int:
+    return int((when - _EPOCH).total_seconds()) if when else 0
+
+
+class RiskModelStore:
+    """Persisted training data and fitted model of the project risk predictor.
+
+    The feature matrix of closed issues is kept in `features.npz` with one
+    row per issue number and the issue's updated_at, next to an updated_at
+    cursor so a run only reads closed issues updated since the previous one.
+    Label or comment changes after closing bump updated_at and so refresh
+    the row. The fitted model is stored with
+    joblib in `model.joblib`. `needs_training` is true until a model exists
+    and again once `retrain_after` rows were added or changed since it was
+    fitted; in between the stored model is reused as-is.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CONFIG["directory"], retrain_after: int = 50):
+        self.directory = directory
+        self.retrain_after = retrain_after
+        self.features_path = os.path.join(directory, "features.npz")
+        self.model_path = os.path.join(directory, "model.joblib")
+        self._lock = threading.Lock()
+        self._model = None
+
+        self.numbers = np.empty(0, dtype=np.int64)
+        self.updated_at = np.empty(0, dtype=np.int64)
+        self.features = np.empty((0, 0), dtype=np.float64)
+        self.labels = np.empty(0, dtype=str)
+        self._cursor = 0
+        # Rows added or changed since the model was last fitted
+        self.pending = 0
+
+        if os.path.exists(self.features_path):
+            self._load()
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH) -> "RiskModelStore":
+        config = dict(DEFAULT_CONFIG)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                config.update(json.load(f))
+        return cls(config["directory"], int(os.getenv("RISK_RETRAIN_AFTER", config["retrain_after"])))
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def _load(self) -> None:
+        with np.load(self.features_path, allow_pickle=False) as data:
+            self.numbers = data["numbers"]
+            # Stores written before rows were versioned by updated_at hold closed_at, which is never later
+            self.updated_at = data["updated_at"] if "updated_at" in data else data["closed_at"]
+            self.features = data["features"]
+            self.labels = data["labels"]
+            self._cursor = int(data["cursor"])
+            self.pending = int(data["pending"])
+
+    @property
+    def cursor(self) -> Optional[datetime]:
+        """updated_at of the latest issue added"""
+        return _EPOCH + timedelta(seconds=self._cursor) if self._cursor else None
+
+    def fetch_since(self) -> Optional[datetime]:
+        """Lower bound for the next closed-issue query.
+
+        One second before the cursor, since updated_at has second
+        resolution; issues seen again unchanged are skipped.
+        """
+        cursor = self.cursor
+        return cursor - timedelta(seconds=1) if cursor else None
+
+    def add(
+        self,
+        numbers: Iterable[int],
+        updated_at: Iterable[Optional[datetime]],
+        features: Iterable[Iterable[float]],
+        labels: Iterable[str],
+    ) -> int:
+        """Add feature rows of closed issues; returns how many were new or changed.
+
+        A row replaces the stored row of the same issue number when the
+        issue was updated since (edited, relabelled, commented on or closed
+        again); otherwise it is skipped.
+        """
+        numbers = np.asarray(list(numbers), dtype=np.int64)
+        updated_at = np.array([_epoch(when) for when in updated_at], dtype=np.int64)
+        features = np.asarray(list(features), dtype=np.float64).reshape(len(numbers), -1)
+        labels = np.asarray(list(labels), dtype=str)
+        if not len(numbers):
+            return 0
+
+        with self._lock:
+            # Latest row per incoming number, then drop those already stored unchanged
+            last = len(numbers) - 1 - np.unique(numbers[::-1], return_index=True)[1]
+            numbers, updated_at, features, labels = numbers[last], updated_at[last], features[last], labels[last]
+
+            stored = dict(zip(self.numbers.tolist(), self.updated_at.tolist()))
+            changed = np.array([stored.get(n) != u for n, u in zip(numbers.tolist(), updated_at.tolist())])
+            if not changed.any():
+                return 0
+            numbers, updated_at, features, labels = (
+                numbers[changed],
+                updated_at[changed],
+                features[changed],
+                labels[changed],
+            )
+
+            keep = ~np.isin(self.numbers, numbers)
+            if not len(self.numbers):
+                self.features = np.empty((0, features.shape[1]), dtype=np.float64)
+            self.numbers = np.concatenate([self.numbers[keep], numbers])
+            self.updated_at = np.concatenate([self.updated_at[keep], updated_at])
+            self.features = np.concatenate([self.features[keep], features])
+            self.labels = np.concatenate([self.labels[keep], labels])
+
+            self._cursor = max(self._cursor, int(updated_at.max()))
+            self.pending += len(numbers)
+            return len(numbers)
+
+    def needs_training(self) -> bool:
+        if not len(self.numbers):
+            return False
+        return self.pending >= self.retrain_after or not os.path.exists(self.model_path)
+
+    @property
+    def model(self):
+        """The fitted model, loaded from disk on first use; None before the first fit"""
+        if self._model is None and os.path.exists(self.model_path):
+            self._model = joblib.load(self.model_path)["model"]
+        return self._model
+
+    def save_model(self, model, **metadata) -> None:
+        """Persist a model fitted on the current rows and reset the retraining counter"""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.model_path + ".tmp"
+        joblib.dump(
+            {"model": model, "rows": len(self.numbers), "trained_at": datetime.utcnow().isoformat(), **metadata},
+            tmp_path,
+        )
+        os.replace(tmp_path, self.model_path)
+        self._model = model
+        self.pending = 0
+        self.save()
+
+    def save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.features_path + ".tmp.npz"
+        with self._lock:
+            np.savez_compressed(
+                tmp_path,
+                numbers=self.numbers,
+                updated_at=self.updated_at,
+                features=self.features,
+                labels=self.labels,
+                cursor=np.int64(self._cursor),
+                pending=np.int64(self.pending),
+            )
+        os.replace(tmp_path, self.features_path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.numbers = np.empty(0, dtype=np.int64)
+            self.updated_at = np.empty(0, dtype=np.int64)
+            self.features = np.empty((0, 0), dtype=np.float64)
+            self.labels = np.empty(0, dtype=str)
+            self._cursor = 0
+            self.pending = 0
+            self._model = None
+        for path in (self.features_path, self.model_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/skill_model.json"
+
+DEFAULT_CONFIG = {
+    "path": "data/developer_skills.db",
+    # Days after which a closed issue counts half as much; null keeps plain counts
+    "half_life_days": None,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skill_counts (
+    developer TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    weight REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (developer, skill)
+);
+CREATE TABLE IF NOT EXISTS counted_issues (
+    number INTEGER PRIMARY KEY,
+    closed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS model_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime("%Y-%m-%dT%H:%M:%S") if value else None
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S") if value else None
+
+
+class SkillCountStore:
+    """Persisted per-developer skill counts from closed issues, folded in incrementally.
+
+    Each closed issue adds one to every (assignee, label skill) pair, once:
+    counted issue numbers are remembered, and the cursor is the latest
+    closed_at seen, so a run only reads issues closed since the previous
+    one. With a half-life, each issue also adds a weight that halves every
+    half_life_days after it was closed. Weights are kept as of the `as_of`
+    time and rescaled in one UPDATE when time moves on, so decay never
+    requires re-reading old issues.
+    """
+
+    def __init__(self, path: str = DEFAULT_CONFIG["path"], half_life_days: Optional[float] = None):
+        self.path = path
+        self.half_life_days = half_life_days
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH) -> "SkillCountStore":
+        config = dict(DEFAULT_CONFIG)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                config.update(json.load(f))
+        half_life = os.getenv("SKILL_HALF_LIFE_DAYS", config["half_life_days"])
+        return cls(config["path"], float(half_life) if half_life not in (None, "", "off") else None)
+
+    def _state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM model_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO model_state (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def cursor(self) -> Optional[datetime]:
+        """closed_at of the latest issue folded in"""
+        return _to_datetime(self._state("cursor"))
+
+    @property
+    def as_of(self) -> Optional[datetime]:
+        """Time the stored weights are decayed to"""
+        return _to_datetime(self._state("as_of"))
+
+    def _decay(self, seconds: float) -> float:
+        if not self.half_life_days:
+            return 1.0
+        return 0.5 ** (seconds / (self.half_life_days * 86400))
+
+    def _advance(self, now: datetime) -> None:
+        """Decay every stored weight from as_of to now"""
+        as_of = self.as_of
+        if as_of is not None and now > as_of:
+            factor = self._decay((now - as_of).total_seconds())
+            if factor != 1.0:
+                self._conn.execute("UPDATE skill_counts SET weight = weight * ?", (factor,))
+        if as_of is None or now > as_of:
+            self._set_state("as_of", _to_text(now))
+
+    def fold(self, issues: Iterable[tuple], now: Optional[datetime] = None) -> int:
+        """Add (number, developer, skills, closed_at) tuples not counted yet; returns how many were added"""
+        now = now or datetime.utcnow()
+        added = 0
+        with self._lock:
+            self._advance(now)
+            as_of = self.as_of
+            cursor = self.cursor
+            for number, developer, skills, closed_at in issues:
+                if self._conn.execute("SELECT 1 FROM counted_issues WHERE number = ?", (number,)).fetchone():
+                    continue
+                closed_at = closed_at or now
+                weight = self._decay(max((as_of - closed_at).total_seconds(), 0))
+                self._conn.executemany(
+                    "INSERT INTO skill_counts (developer, skill, count, weight) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT (developer, skill) DO UPDATE SET count = count + 1, weight = weight + excluded.weight",
+                    [(developer, skill, weight) for skill in set(skills)],
+                )
+                self._conn.execute(
+                    "INSERT INTO counted_issues (number, closed_at) VALUES (?, ?)", (number, _to_text(closed_at))
+                )
+                if cursor is None or closed_at > cursor:
+                    cursor = closed_at
+                added += 1
+            self._set_state("cursor", _to_text(cursor))
+            self._conn.commit()
+        return added
+
+    def skills(self, now: Optional[datetime] = None) -> Dict[str, Dict[str, float]]:
+        """{developer: {skill: count}}; decayed weights as of now when a half-life is set"""
+        with self._lock:
+            if not self.half_life_days:
+                rows = self._conn.execute("SELECT developer, skill, count FROM skill_counts").fetchall()
+            else:
+                self._advance(now or datetime.utcnow())
+                self._conn.commit()
+                rows = self._conn.execute("SELECT developer, skill, weight FROM skill_counts").fetchall()
+        skills: Dict[str, Dict[str, float]] = {}
+        for developer, skill, value in rows:
+            skills.setdefault(developer, {})[skill] = value
+        return skills
+
+    def fetch_since(self) -> Optional[datetime]:
+        """Lower bound for the next closed-issue query.
+
+        One second before the cursor, since closed_at has second
+        resolution; issues seen again are skipped by number.
+        """
+        cursor = self.cursor
+        return cursor - timedelta(seconds=1) if cursor else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM skill_counts")
+            self._conn.execute("DELETE FROM counted_issues")
+            self._conn.execute("DELETE FROM model_state")
+            self._conn.commit()
@@ -3,17 +3,23 @@ import json
 import os
 
 import numpy as np
-from github import Github
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import MultiLabelBinarizer
+
+from src.assignment.skill_matcher import SkillMatcher
+from src.database.profile_store import DEFAULT_PROFILE_STORE_PATH, ProfileStore
+from src.utils.github_client import get_github
+from src.utils.keyword_matcher import get_keyword_matcher
 
 
 class DeveloperSkillOrchestrator:
     def __init__(self, token):
         """Initialize Developer Skill Management System"""
-        self.gh = Github(token)
+        self.gh = get_github(token)
         self.project_repo = self.gh.get_repo("ZubeidHendricks/project-orchestrator")
         self.dev_repo = self.gh.get_repo("ZubeidHendricks/ai-dev-orchestrator")
+        self.skill_matcher = SkillMatcher()
+        self.profile_store = ProfileStore(os.getenv("PROFILE_STORE_PATH", DEFAULT_PROFILE_STORE_PATH))
+        # Profile store revision the skill matcher was last built from
+        self._matcher_revision = None
 
     def create_developer_profile(self, github_username):
         """Create a comprehensive developer profile"""
@@ -56,56 +62,15 @@ class DeveloperSkillOrchestrator:
 # language_skills
 # tech_skills
 
-        # Predefined technology categories
-# tech_categories
-            "frontend": [
-                "react",
-                "vue",
-                "angular",
-                "svelte",
-                "html",
-                "css",
-                "javascript",
-            ],
-            "backend": [
-                "python",
-                "node",
-                "django",
-                "flask",
-                "fastapi",
-                "java",
-                "spring",
-            ],
-            "ml": [
-                "tensorflow",
-                "pytorch",
-                "scikit",
-                "keras",
-                "machine-learning",
-                "data-science",
-            ],
-            "devops": [
-                "docker",
-                "kubernetes",
-                "aws",
-                "azure",
-                "gcp",
-                "ci-cd",
-                "jenkins",
-            ],
-        }
-
         for repo in repos:
             # Extract languages and technologies
 # languages
             for lang, lines in languages.items():
                 language_skills[lang.lower()] = language_skills.get(lang.lower(), 0) + lines
 
-            # Match against tech categories
-            for category, category_skills in tech_categories.items():
-                for skill in category_skills:
-                    if skill in repo.name.lower() or skill in (repo.description or "").lower():
-                        tech_skills[skill] = tech_skills.get(skill, 0) + 1
+            # Match against tech categories (config/keywords.json), counting each skill once per repo
+            for skill in get_keyword_matcher("skill_categories").find(f"{repo.name} {repo.description or ''}"):
+                tech_skills[skill] = tech_skills.get(skill, 0) + 1
 
         # Normalize and weight skills
 # total_language_lines
@@ -150,6 +115,7 @@ class DeveloperSkillOrchestrator:
                 body=json.dumps(profile, indent=2),
 # labels
             )
+            self.profile_store.upsert(profile, issue.updated_at, issue.number)
             print(f"Saved profile for {profile['username']}")
         except Exception as e:
             print(f"Error saving profile: {e}")
@@ -163,73 +129,59 @@ class DeveloperSkillOrchestrator:
 # description_skills
         issue_skills.extend(description_skills)
 
-        # Get all developer profiles
-# developer_profiles
+        # Only developers sharing a skill with the issue can score above zero
+        candidates = self._candidate_usernames(issue_skills)
 
         # Compute skill matching
-# best_match
+        best_match = self._compute_skill_match(issue_skills, candidates)
 
         return best_match
 
     def _extract_skills_from_description(self, description):
         """Extract skills from issue description"""
-        # Predefined skill keywords
-# skill_keywords
-            "python",
-            "javascript",
-            "react",
-            "backend",
-            "frontend",
-            "machine learning",
-            "data science",
-            "docker",
-            "kubernetes",
-        ]
-
-# skills
+        # Skill keywords are configured in config/keywords.json
+        skills = get_keyword_matcher("description_skills").find(description)
 
         return skills
 
     def _get_developer_profiles(self):
-        """Retrieve all developer profiles from AI Dev Orchestrator"""
-# profiles
-        for issue in self.dev_repo.get_issues(labels=["developer-profile"]):
-            try:
-# profile
-                profiles.append(profile)
-            except Exception as e:
-                print(f"Error parsing profile: {e}")
-
-        return profiles
+        """Retrieve all developer profiles, refreshing the local store from AI Dev Orchestrator"""
+        self._refresh_profiles()
+        return self.profile_store.profiles()
 
-    def _compute_skill_match(self, issue_skills, developer_profiles):
-        """Compute best developer match using skill similarity"""
-        if not developer_profiles:
-            return None
+    def _candidate_usernames(self, skills):
+        """Developers having at least one of the skills"""
+        self._refresh_profiles()
+        return self.profile_store.candidates(skills)
 
-        # Prepare multi-label encoding
-# mlb
-
-        # Prepare issue skills
-# issue_skills_encoded
-
-        # Prepare developer skills
-# developer_skill_matrices
-# developer_usernames
-
-        for profile in developer_profiles:
-# profile_skills
-            developer_skill_matrices.append(mlb.transform([profile_skills]))
-            developer_usernames.append(profile["username"])
-
-        # Compute cosine similarity
-# similarities
-            cosine_similarity(issue_skills_encoded, dev_skills)[0][0] for dev_skills in developer_skill_matrices
+    def _refresh_profiles(self):
+        try:
+            self.profile_store.refresh(self.dev_repo)
+        except Exception as e:
+            # Fall back to the profiles stored by the last successful refresh
+            print(f"Error refreshing developer profiles: {e}")
+
+    def _update_skill_matcher(self):
+        """Rebuild the shared developer matrix from every stored profile, only after the store changed"""
+        if self._matcher_revision != self.profile_store.revision:
+            self.skill_matcher.update(self.profile_store.profiles())
+            self._matcher_revision = self.profile_store.revision
+        return self.skill_matcher
+
+    def _compute_skill_match(self, issue_skills, candidates):
+        """Compute best developer match using skill similarity, scoring only the candidate developers"""
+        return self._update_skill_matcher().best_match(issue_skills, among=candidates)
+
+    def match_developers_to_issues(self, issues, k=3):
+        """Top-k developers for many issues, scored in one sparse product: {issue number: [(username, score)]}"""
+        issues = list(issues)
+        self._refresh_profiles()
+        self._update_skill_matcher()
+        issue_skills = [
+            [label.name.lower() for label in issue.labels] + self._extract_skills_from_description(issue.body or "")
+            for issue in issues
         ]
-
-        # Return developer with highest skill match
-# best_match_index
-        return developer_usernames[best_match_index]
+        return {issue.number: matches for issue, matches in zip(issues, self.skill_matcher.top_k(issue_skills, k))}
 
 
 def main():
@@ -1,33 +1,58 @@
 import os
 from datetime import datetime
 
-from github import Github
+from src.database.issue_mirror import IssueMirror
+from src.integrations.mutation_outbox import MutationOutbox
+from src.utils.github_client import get_github
+from src.utils.keyword_matcher import get_keyword_matcher
 
 
 class DevOrchestratorIntegration:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
         self.project_repo = self.github.get_repo("ZubeidHendricks/project-orchestrator")
         self.dev_repo = self.github.get_repo("ZubeidHendricks/ai-dev-orchestrator")
+        self.issue_mirror = IssueMirror()
+        self.outbox = MutationOutbox.from_config(self.github)
 
-    def assign_to_dev_orchestrator(self, issue):
-        """Assign a project issue to the dev orchestrator"""
+    def assign_to_dev_orchestrator(self, issue, flush=True):
+        """Assign a project issue to the dev orchestrator.
+
+        The GitHub writes go through the outbox. With flush=False they are
+        only queued and the mutation key of the dev issue is returned.
+        """
         try:
+            project = self.project_repo.full_name
             # Add development label to original issue
-            issue.add_to_labels("needs-development")
+            self.outbox.edit_issue(
+                project, issue.number, add_labels=["needs-development"], key=f"needs-development:{issue.html_url}"
+            )
 
             # Create corresponding issue in dev orchestrator
-# dev_issue
+            dev_key = self.outbox.create_issue(
+                self.dev_repo.full_name,
 # title
 # body
 # labels
+                key=f"dev-task:{issue.html_url}",
             )
 
-            # Add cross-reference comment
-            issue.create_comment(f"Assigned to Dev Orchestrator: {dev_issue.html_url}")
+            # Add cross-reference comment, once the dev issue exists
+            self.outbox.comment(
+                project,
+                issue.number,
+                "Assigned to Dev Orchestrator: {html_url}",
+                key=f"dev-task-comment:{issue.html_url}",
+                after=dev_key,
+            )
+            if not flush:
+                return dev_key
 
-            # Log the assignment
-            self._log_assignment(issue, dev_issue)
+            self.outbox.flush()
+            dev_issue = self.outbox.issue(dev_key)
+            if dev_issue:
+                # Log the assignment
+                self._log_assignment(issue, dev_issue)
 
             return dev_issue
 
@@ -35,12 +60,29 @@ class DevOrchestratorIntegration:
             print(f"Error assigning to dev orchestrator: {str(e)}")
             return None
 
+    def assign_many_to_dev_orchestrator(self, issues):
+        """Assign several project issues, sending all their GitHub writes in one flush"""
+        queued = [(issue, self.assign_to_dev_orchestrator(issue, flush=False)) for issue in issues]
+        self.outbox.flush()
+
+        dev_issues = []
+        for issue, dev_key in queued:
+            dev_issue = self.outbox.issue(dev_key) if dev_key else None
+            if dev_issue:
+                self._log_assignment(issue, dev_issue)
+                dev_issues.append(dev_issue)
+        return dev_issues
+
     def check_dev_progress(self):
         """Check progress of assigned development tasks"""
         try:
-            issues = self.project_repo.get_issues(labels=["needs-development"])
+            self.issue_mirror.sync(self.project_repo)
+            self.issue_mirror.sync(self.dev_repo)
+
+            issues = self.issue_mirror.issues(self.project_repo.full_name, labels=["needs-development"])
             for issue in issues:
                 self._check_issue_progress(issue)
+            self.outbox.flush()
         except Exception as e:
             print(f"Error checking dev progress: {str(e)}")
 
@@ -69,28 +111,18 @@ Assigned: {datetime.now().isoformat()}
         return "normal"
 
     def _determine_task_type(self, issue):
-# type_mapping
-            "frontend": ["ui", "frontend", "react", "vue"],
-            "backend": ["api", "backend", "server"],
-            "database": ["db", "database", "model"],
-            "devops": ["deployment", "pipeline", "ci-cd"],
-        }
-
 # issue_text
-        for type_name, keywords in type_mapping.items():
-            if any(keyword in issue_text for keyword in keywords):
-                return type_name
-
-        return "feature"
+        # Task type keywords are configured in config/keywords.json; the first matching type wins
+        return get_keyword_matcher("task_types").first_category(issue_text) or "feature"
 
     def _check_issue_progress(self, issue):
         """Check progress of a specific issue"""
         try:
             # Find corresponding dev issue
-            dev_issues = self.dev_repo.get_issues(state="all", labels=["ai-development"])
+            dev_issues = self.issue_mirror.issues(self.dev_repo.full_name, state="all", labels=["ai-development"])
 
             for dev_issue in dev_issues:
-                if f"#{issue.number}" in dev_issue.body:
+                if f"#{issue.number}" in (dev_issue.body or ""):
                     self._update_progress(issue, dev_issue)
                     break
 
@@ -104,9 +136,21 @@ Assigned: {datetime.now().isoformat()}
             linked_prs = [pr for pr in self.dev_repo.get_pulls(state="all") if f"#{dev_issue.number}" in pr.body]
 
             if linked_prs and linked_prs[0].merged:
-                project_issue.add_to_labels("development-completed")
-                project_issue.remove_from_labels("needs-development")
-                project_issue.create_comment(f"Development completed! PR: {linked_prs[0].html_url}")
+                # Queued for check_dev_progress's flush: both label changes go out as one edit
+                project = self.project_repo.full_name
+                self.outbox.edit_issue(
+                    project,
+                    project_issue.number,
+                    add_labels=["development-completed"],
+                    remove_labels=["needs-development"],
+                    key=f"development-completed:{project}#{project_issue.number}",
+                )
+                self.outbox.comment(
+                    project,
+                    project_issue.number,
+                    f"Development completed! PR: {linked_prs[0].html_url}",
+                    key=f"development-completed-comment:{project}#{project_issue.number}",
+                )
 
     def _log_assignment(self, project_issue, dev_issue):
         """Log the assignment for tracking"""
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from src.database.issue_mirror import IssueMirror
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = "data/webhook_queue.db"
+
+HANDLED_EVENTS = {
+    "issues",
+    "issue_comment",
+    "pull_request",
+    "workflow_run",
+    "deployment",
+    "deployment_status",
+}
+
+
+def verify_signature(secret: str, body: bytes, signature_header: Optional[str]) -> bool:
+    """Check the X-Hub-Signature-256 header GitHub computes over the raw request body"""
+    if not secret or not signature_header or not signature_header.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len("sha256=") :])
+
+
+class WebhookQueue:
+    """Durable append-only queue of received webhook deliveries.
+
+    Deliveries are keyed by their X-GitHub-Delivery id, so redeliveries are
+    stored once. Events stay pending until a consumer marks them processed.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, delivery_id TEXT UNIQUE, event TEXT NOT NULL, "
+            "payload TEXT NOT NULL, received_at TEXT NOT NULL, processed_at TEXT, error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_pending ON events (processed_at, id)")
+        self._conn.commit()
+
+    def append(self, delivery_id: str, event: str, payload: dict) -> bool:
+        """Store a delivery; returns False if it was already queued"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO events (delivery_id, event, payload, received_at) VALUES (?, ?, ?, ?)",
+                (delivery_id, event, json.dumps(payload), datetime.utcnow().isoformat()),
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def pending(self, limit: int = 100) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, delivery_id, event, payload FROM events WHERE processed_at IS NULL ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [{"id": row[0], "delivery_id": row[1], "event": row[2], "payload": json.loads(row[3])} for row in rows]
+
+    def mark_processed(self, event_id: int, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE events SET processed_at = ?, error = ? WHERE id = ?",
+                (datetime.utcnow().isoformat(), error, event_id),
+            )
+            self._conn.commit()
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM events WHERE processed_at IS NULL").fetchone()[0]
+
+
+class WebhookProcessor:
+    """Applies queued webhook events to the local IssueMirror and notifies listeners"""
+
+    def __init__(self, mirror: Optional[IssueMirror] = None):
+        self.mirror = mirror or IssueMirror()
+        self.listeners: List[Callable[[str, str, dict], None]] = []
+
+    def subscribe(self, listener: Callable[[str, str, dict], None]) -> None:
+        """Register listener(event, repo, payload), called after each applied event"""
+        self.listeners.append(listener)
+
+    def apply(self, event: str, payload: dict) -> Optional[str]:
+        """Apply one event and return the repository it touched"""
+        repository = payload.get("repository") or {}
+        repo = repository.get("full_name")
+        if not repo or event not in HANDLED_EVENTS:
+            return None
+
+        if event in ("issues", "issue_comment"):
+            self.mirror.upsert_payload(repo, payload["issue"])
+        elif event == "pull_request":
+            self.mirror.upsert_payload(repo, payload["pull_request"])
+        elif event == "workflow_run":
+            self.mirror.record_workflow_run(repo, payload["workflow_run"])
+        elif event == "deployment":
+            self.mirror.record_deployment(repo, payload["deployment"])
+        elif event == "deployment_status":
+            self.mirror.record_deployment(repo, payload["deployment"], payload["deployment_status"]["state"])
+
+        self.mirror.record_activity(repo, event)
+        for listener in self.listeners:
+            listener(event, repo, payload)
+        return repo
+
+    def drain(self, queue: WebhookQueue, limit: int = 100) -> int:
+        """Apply pending events in arrival order; failures are recorded and do not block the queue"""
+        processed = 0
+        for item in queue.pending(limit):
+            try:
+                self.apply(item["event"], item["payload"])
+                queue.mark_processed(item["id"])
+            except Exception as e:
+                logger.error(f"Failed to apply {item['event']} delivery {item['delivery_id']}: {e}")
+                queue.mark_processed(item["id"], error=str(e))
+            processed += 1
+        return processed
+
+
+def follow(queue: WebhookQueue, processor: WebhookProcessor, alert_manager, interval: float = 2.0, iterations=None):
+    """Drain the queue and re-check alerts for repositories whose mirror changed since the previous pass.
+
+    The re-check runs on every pass, whatever this loop drained itself: the
+    webhook endpoint applies deliveries inline, so the mirror often changes
+    without anything left in the queue here.
+    """
+    last_check = datetime.utcnow()
+    passes = 0
+    while iterations is None or passes < iterations:
+        now = datetime.utcnow()
+        processor.drain(queue)
+        alert_manager.check_changed_repositories(processor.mirror, last_check)
+        last_check = now
+        passes += 1
+        if iterations is None or passes < iterations:
+            time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply queued GitHub webhook events to the local mirror")
+    parser.add_argument("--follow", action="store_true", help="Keep draining and re-check alerts as events arrive")
+    parser.add_argument("--interval", type=float, default=2.0, help="Seconds between queue polls with --follow")
+    parser.add_argument("--replay", nargs="*", default=[], help="Recorded payload files (event name = file prefix)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    queue = WebhookQueue()
+    processor = WebhookProcessor()
+
+    for path in args.replay:
+        with open(path, "r") as f:
+            payload = json.load(f)
+        event = os.path.basename(path).split(".")[0].rsplit("_", 1)[0]
+        queue.append(f"replay-{os.path.basename(path)}-{time.time()}", event, payload)
+
+    if args.follow:
+        from src.monitoring.alert_manager import AlertManager
+
+        follow(queue, processor, AlertManager(), args.interval)
+    else:
+        logger.info(f"Applied {processor.drain(queue, limit=10000)} webhook events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from github import GithubException
+
+from src.utils.github_client import get_github, uncached
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/outbox.json"
+
+DEFAULT_CONFIG = {
+    "path": "data/mutation_outbox.db",
+    "max_workers": 4,
+    "max_attempts": 5,
+    "backoff_seconds": 2.0,
+    # Longest a flush waits for scheduled retries before leaving them for the next run
+    "max_wait_seconds": 60,
+    "retention_days": 7,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mutations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    repo TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    number INTEGER,
+    payload TEXT NOT NULL,
+    after TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mutations_status ON mutations (status, next_attempt_at);
+"""
+
+COLUMNS = ["id", "key", "repo", "kind", "number", "payload", "after", "status", "attempts", "created_at"]
+
+# HTTP statuses worth retrying besides server errors; a 403 only when it is a rate limit
+RETRYABLE_STATUSES = {429}
+
+# Clock skew allowed between the outbox and GitHub when looking for an issue created by a lost request
+LOOKUP_SLACK = timedelta(minutes=10)
+
+
+def _marker(key: str) -> str:
+    """Hidden tag identifying the mutation that created an issue or comment, checked before retrying one"""
+    return f"<!-- outbox:{key} -->"
+
+
+def _fill(template: str, result: Dict[str, Any]) -> str:
+    """Substitute {name} fields of a dependency's result, leaving other braces alone"""
+    for name, value in result.items():
+        template = template.replace(f"{{{name}}}", str(value))
+    return template
+
+
+def _now_text() -> str:
+    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S") if value else None
+
+
+def _headers(error: Exception) -> Dict[str, str]:
+    return {str(name).lower(): value for name, value in (getattr(error, "headers", None) or {}).items()}
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether a 403 is GitHub's primary or secondary rate limit rather than a permission error"""
+    if str(_headers(error).get("x-ratelimit-remaining")) == "0":
+        return True
+    return "rate limit" in json.dumps(getattr(error, "data", None) or "").lower()
+
+
+@dataclass
+class Operation:
+    """One GitHub call planned from one or more queued mutations"""
+
+    kind: str
+    repo: str
+    number: Optional[int]
+    payload: Dict[str, Any]
+    keys: List[str] = field(default_factory=list)
+    attempts: int = 0
+    created_at: Optional[str] = None
+
+    def describe(self) -> str:
+        target = f"{self.repo}#{self.number}" if self.number else self.repo
+        merged = f" ({len(self.keys)} mutations)" if len(self.keys) > 1 else ""
+        if self.kind == "create_issue":
+            labels = f" labels={self.payload.get('labels')}" if self.payload.get("labels") else ""
+            assignees = f" assignees={self.payload.get('assignees')}" if self.payload.get("assignees") else ""
+            return f"POST {target} issue {self.payload['title']!r}{labels}{assignees}"
+        if self.kind == "comment":
+            return f"POST {target} comment {self.payload['body'][:60]!r}"
+        changes = [f"+{label}" for label in self.payload.get("add_labels", [])]
+        changes += [f"-{label}" for label in self.payload.get("remove_labels", [])]
+        changes += [f"{name}={self.payload[name]}" for name in ("assignees", "state") if name in self.payload]
+        verbs = [
+            verb
+            for verb, names in (
+                ("POST", ["add_labels"]),
+                ("DELETE", ["remove_labels"]),
+                ("PATCH", ["assignees", "state"]),
+            )
+            if any(name in self.payload for name in names)
+        ]
+        return f"{'+'.join(verbs)} {target} {' '.join(changes)}{merged}"
+
+
+def _merge_edits(payloads: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine issue edits in queue order; a later add or removal of a label wins over an earlier one"""
+    add: List[str] = []
+    remove: List[str] = []
+    merged: Dict[str, Any] = {}
+    for payload in payloads:
+        for label in payload.get("add_labels", []):
+            remove = [item for item in remove if item != label]
+            add += [] if label in add else [label]
+        for label in payload.get("remove_labels", []):
+            add = [item for item in add if item != label]
+            remove += [] if label in remove else [label]
+        merged.update({name: payload[name] for name in ("assignees", "state") if name in payload})
+    if add:
+        merged["add_labels"] = add
+    if remove:
+        merged["remove_labels"] = remove
+    return merged
+
+
+class MutationOutbox:
+    """Durable queue of GitHub writes, executed in batches.
+
+    Callers record intended mutations (create an issue, edit labels,
+    assignees or state, comment) and `flush` carries them out. Rows live in
+    SQLite until they succeed, so a crash or rate limit only delays them.
+    Every mutation has an idempotency key: queueing an existing key is a
+    no-op, and issues and comments carry a hidden marker that is looked up
+    before a create is retried, so a request that timed out after GitHub
+    applied it is not applied twice. Edits of one issue are merged, so it
+    gets at most one label POST, a DELETE per removed label and one PATCH;
+    operations on different issues run concurrently, and failures are
+    retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        github=None,
+        path: str = DEFAULT_CONFIG["path"],
+        max_workers: int = DEFAULT_CONFIG["max_workers"],
+        max_attempts: int = DEFAULT_CONFIG["max_attempts"],
+        backoff_seconds: float = DEFAULT_CONFIG["backoff_seconds"],
+        max_wait_seconds: float = DEFAULT_CONFIG["max_wait_seconds"],
+        retention_days: float = DEFAULT_CONFIG["retention_days"],
+        dry_run: bool = False,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._github = github
+        self.path = path
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.retention_days = retention_days
+        self.dry_run = dry_run
+        self.clock = clock
+        self.sleep = sleep
+        self._repos: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, github=None, config_path: str = DEFAULT_CONFIG_PATH) -> "MutationOutbox":
+        config = dict(DEFAULT_CONFIG)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                config.update(json.load(f))
+        return cls(
+            github,
+            path=config["path"],
+            max_workers=config["max_workers"],
+            max_attempts=config["max_attempts"],
+            backoff_seconds=config["backoff_seconds"],
+            max_wait_seconds=config["max_wait_seconds"],
+            retention_days=config["retention_days"],
+            dry_run=os.getenv("OUTBOX_DRY_RUN", "").lower() in ("1", "true", "yes", "on"),
+        )
+
+    @property
+    def github(self):
+        if self._github is None:
+            self._github = get_github()
+        return self._github
+
+    def _enqueue(
+        self, repo: str, kind: str, number: Optional[int], payload: dict, key: Optional[str], after: Optional[str]
+    ) -> str:
+        key = key or f"{kind}:{uuid.uuid4().hex}"
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO mutations (key, repo, kind, number, payload, after, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, repo, kind, number, json.dumps(payload), after, _now_text(), _now_text()),
+            )
+            self._conn.commit()
+        return key
+
+    def create_issue(
+        self,
+        repo: str,
+        title: str,
+        body: str = "",
+        labels: Optional[List[str]] = None,
+        assignees: Optional[List[str]] = None,
+        key: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> str:
+        """Queue an issue; returns the mutation key, whose result() holds number, title and html_url"""
+        payload = {"title": title, "body": body or "", "labels": list(labels or []), "assignees": list(assignees or [])}
+        return self._enqueue(repo, "create_issue", None, payload, key, after)
+
+    def edit_issue(
+        self,
+        repo: str,
+        number: int,
+        add_labels: Iterable[str] = (),
+        remove_labels: Iterable[str] = (),
+        assignees: Optional[List[str]] = None,
+        state: Optional[str] = None,
+        key: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> str:
+        """Queue label, assignee or state changes; pending edits of one issue are applied in one call"""
+        payload: Dict[str, Any] = {}
+        if add_labels:
+            payload["add_labels"] = list(add_labels)
+        if remove_labels:
+            payload["remove_labels"] = list(remove_labels)
+        if assignees is not None:
+            payload["assignees"] = list(assignees)
+        if state is not None:
+            payload["state"] = state
+        return self._enqueue(repo, "edit_issue", number, payload, key, after)
+
+    def comment(self, repo: str, number: int, body: str, key: Optional[str] = None, after: Optional[str] = None) -> str:
+        """Queue a comment. With `after`, it waits for that mutation and body may use its result,
+        e.g. "Created {html_url}"."""
+        return self._enqueue(repo, "comment", number, {"body": body}, key, after)
+
+    def status(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM mutations WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def result(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM mutations WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def issue(self, key: str) -> Optional[SimpleNamespace]:
+        """Created issue of a create_issue mutation as an object with number, title and html_url"""
+        result = self.result(key)
+        return SimpleNamespace(**result) if result else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM mutations GROUP BY status").fetchall()
+        return dict(rows)
+
+    def _pending(self, ready_only: bool) -> List[dict]:
+        query = (
+            f"SELECT {', '.join('m.' + column for column in COLUMNS)}, d.status, d.result FROM mutations m "
+            "LEFT JOIN mutations d ON d.key = m.after WHERE m.status = 'pending'"
+        )
+        params: list = []
+        if ready_only:
+            query += " AND m.next_attempt_at <= ? AND (m.after IS NULL OR d.status = 'done')"
+            params.append(self.clock())
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY m.id", params).fetchall()
+        return [dict(zip(COLUMNS + ["after_status", "after_result"], row)) for row in rows]
+
+    def plan(self, ready_only: bool = False) -> List[Operation]:
+        """Operations a flush would perform; edits of the same issue are merged into one"""
+        operations: List[Operation] = []
+        edits: Dict[tuple, Operation] = {}
+        for row in self._pending(ready_only):
+            payload = json.loads(row["payload"])
+            if row["after_result"] and row["kind"] == "comment":
+                payload["body"] = _fill(payload["body"], json.loads(row["after_result"]))
+            if row["kind"] == "edit_issue":
+                target = (row["repo"], row["number"])
+                if target in edits:
+                    operation = edits[target]
+                    operation.payload = _merge_edits([operation.payload, payload])
+                    operation.keys.append(row["key"])
+                    operation.attempts = max(operation.attempts, row["attempts"])
+                    continue
+                edits[target] = Operation("edit_issue", row["repo"], row["number"], _merge_edits([payload]))
+                operation = edits[target]
+            else:
+                operation = Operation(row["kind"], row["repo"], row["number"], payload)
+            operation.keys.append(row["key"])
+            operation.attempts = row["attempts"]
+            operation.created_at = row["created_at"]
+            operations.append(operation)
+        return operations
+
+    def flush(self, dry_run: Optional[bool] = None) -> Dict[str, int]:
+        """Carry out pending mutations; returns how many are done, failed and still pending.
+
+        Mutations that depend on another run in a later round, once it
+        succeeded. Retries scheduled within max_wait_seconds are waited for;
+        later ones stay queued for the next flush. In dry-run mode the plan
+        is printed and nothing is sent.
+        """
+        dry_run = self.dry_run if dry_run is None else dry_run
+        if dry_run:
+            for operation in self.plan():
+                print(f"[dry-run] {operation.describe()}")
+            return self.counts()
+
+        self._fail_orphans()
+        deadline = self.clock() + self.max_wait_seconds
+        while True:
+            operations = self.plan(ready_only=True)
+            if operations:
+                self._execute_all(operations)
+                self._fail_orphans()
+                continue
+
+            wake = self._next_retry()
+            if wake is None or wake > deadline:
+                break
+            self.sleep(max(wake - self.clock(), 0))
+
+        self.prune()
+        counts = self.counts()
+        if counts.get("failed"):
+            logger.warning(f"GitHub outbox: {counts['failed']} mutations failed permanently")
+        return counts
+
+    def _execute_all(self, operations: List[Operation]) -> None:
+        # Calls on one issue stay in order on one worker; different issues run concurrently
+        lanes: Dict[tuple, List[Operation]] = {}
+        for operation in operations:
+            lane = (operation.repo, operation.number) if operation.number else (operation.repo, operation.keys[0])
+            lanes.setdefault(lane, []).append(operation)
+
+        def run(lane: List[Operation]) -> None:
+            for operation in lane:
+                self._execute(operation)
+
+        if self.max_workers <= 1 or len(lanes) <= 1:
+            for lane in lanes.values():
+                run(lane)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(run, lanes.values()))
+
+    def _execute(self, operation: Operation) -> None:
+        try:
+            result = self._call(operation)
+        except Exception as e:
+            self._record_failure(operation, e)
+            return
+        self._update(operation.keys, status="done", result=json.dumps(result), error=None)
+        logger.info(f"GitHub outbox: {operation.describe()}")
+
+    def _repo(self, name: str):
+        if name not in self._repos:
+            self._repos[name] = self.github.get_repo(name, lazy=True)
+        return self._repos[name]
+
+    def _call(self, operation: Operation) -> dict:
+        repo = self._repo(operation.repo)
+        key = operation.keys[0]
+
+        if operation.kind == "create_issue":
+            existing = self._find_created_issue(repo, key, operation.created_at) if operation.attempts else None
+            issue = existing or repo.create_issue(
+                title=operation.payload["title"],
+                body=f"{operation.payload['body']}\n\n{_marker(key)}",
+                labels=operation.payload["labels"],
+                assignees=operation.payload["assignees"],
+            )
+            return {"number": issue.number, "title": issue.title, "html_url": issue.html_url}
+
+        issue = repo.get_issue(operation.number)
+        if operation.kind == "comment":
+            existing = self._find_comment(issue, key, operation.created_at) if operation.attempts else None
+            comment = existing or issue.create_comment(f"{operation.payload['body']}\n\n{_marker(key)}")
+            return {"id": comment.id, "html_url": comment.html_url}
+
+        # Labels are added and removed one by one rather than replacing the whole set, so labels
+        # someone else set in the meantime are kept; both calls are safe to repeat on retry
+        payload = operation.payload
+        if payload.get("add_labels"):
+            issue.add_to_labels(*payload["add_labels"])
+        for label in payload.get("remove_labels", []):
+            try:
+                issue.remove_from_labels(label)
+            except GithubException as e:
+                # Not on the issue (any more)
+                if e.status != 404:
+                    raise
+
+        changes: Dict[str, Any] = {name: payload[name] for name in ("assignees", "state") if name in payload}
+        if changes:
+            issue.edit(**changes)
+        return {"number": operation.number}
+
+    @staticmethod
+    def _find_created_issue(repo, key: str, created_at: Optional[str]):
+        """Issue carrying the mutation's marker among every issue created since it was queued.
+
+        Read past the response cache: a listing cached by the attempt whose
+        response was lost would not show the issue it created.
+        """
+        marker = _marker(key)
+        params: Dict[str, Any] = {"state": "all", "sort": "created", "direction": "desc"}
+        since = _to_datetime(created_at) - LOOKUP_SLACK if created_at else None
+        if since:
+            # Filters on updated_at, which is never before created_at
+            params["since"] = since
+        with uncached():
+            for issue in repo.get_issues(**params):
+                if since and issue.created_at and issue.created_at < since:
+                    break
+                if marker in (issue.body or ""):
+                    return issue
+        return None
+
+    @staticmethod
+    def _find_comment(issue, key: str, created_at: Optional[str]):
+        marker = _marker(key)
+        since = _to_datetime(created_at) - LOOKUP_SLACK if created_at else None
+        with uncached():
+            comments = issue.get_comments(since=since) if since else issue.get_comments()
+            for comment in comments:
+                if marker in (comment.body or ""):
+                    return comment
+        return None
+
+    def _record_failure(self, operation: Operation, error: Exception) -> None:
+        status_code = getattr(error, "status", None)
+        retryable = (
+            not isinstance(status_code, int)
+            or status_code >= 500
+            or status_code in RETRYABLE_STATUSES
+            or (status_code == 403 and _is_rate_limited(error))
+        )
+        attempts = operation.attempts + 1
+        if not retryable or attempts >= self.max_attempts:
+            logger.error(f"GitHub outbox: giving up on {operation.describe()} after {attempts} attempts: {error}")
+            self._update(operation.keys, status="failed", error=str(error), attempts=attempts)
+            return
+
+        delay = self.backoff_seconds * 2 ** (attempts - 1) * (1 + random.random() / 4)
+        headers = _headers(error)
+        retry_after = headers.get("retry-after")
+        if retry_after and str(retry_after).isdigit():
+            delay = max(delay, float(retry_after))
+        elif str(headers.get("x-ratelimit-remaining")) == "0" and str(headers.get("x-ratelimit-reset")).isdigit():
+            # Primary rate limit: wait for the window to reset, usually past this flush
+            delay = max(delay, float(headers["x-ratelimit-reset"]) - time.time())
+        logger.warning(f"GitHub outbox: {operation.describe()} failed ({error}), retrying in {delay:.1f}s")
+        self._update(operation.keys, error=str(error), attempts=attempts, next_attempt_at=self.clock() + delay)
+
+    def _update(self, keys: List[str], **values) -> None:
+        values["updated_at"] = _now_text()
+        assignments = ", ".join(f"{name} = ?" for name in values)
+        with self._lock:
+            self._conn.executemany(
+                f"UPDATE mutations SET {assignments} WHERE key = ?", [list(values.values()) + [key] for key in keys]
+            )
+            self._conn.commit()
+
+    def _fail_orphans(self) -> None:
+        """Fail mutations whose dependency failed or does not exist"""
+        with self._lock:
+            while True:
+                cursor = self._conn.execute(
+                    "UPDATE mutations SET status = 'failed', error = 'dependency failed', updated_at = ? "
+                    "WHERE status = 'pending' AND after IS NOT NULL AND NOT EXISTS "
+                    "(SELECT 1 FROM mutations d WHERE d.key = mutations.after AND d.status != 'failed')",
+                    (_now_text(),),
+                )
+                if not cursor.rowcount:
+                    break
+            self._conn.commit()
+
+    def _next_retry(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(m.next_attempt_at) FROM mutations m LEFT JOIN mutations d ON d.key = m.after "
+                "WHERE m.status = 'pending' AND (m.after IS NULL OR d.status = 'done')"
+            ).fetchone()
+        return row[0] if row else None
+
+    def prune(self) -> int:
+        """Forget finished mutations older than retention_days, which frees their keys"""
+        cutoff = (datetime.utcnow() - timedelta(days=self.retention_days)).strftime("%Y-%m-%dT%H:%M:%S")
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM mutations WHERE status IN ('done', 'failed') AND updated_at < ? "
+                "AND key NOT IN (SELECT after FROM mutations WHERE after IS NOT NULL AND status = 'pending')",
+                (cutoff,),
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or flush queued GitHub mutations")
+    parser.add_argument("command", choices=["plan", "flush"])
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    outbox = MutationOutbox.from_config()
+    if args.command == "plan":
+        for operation in outbox.plan():
+            print(operation.describe())
+    else:
+        print(outbox.flush(dry_run=args.dry_run or None))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 import logging
 import sys
 
-from crewai import Crew
-
-from src.agents.project_agents import ProjectAgents
 from src.tools.devops_tools import DevOpsTools
 from src.tools.github_tools import GitHubTools
 from src.tools.technical_tools import TechnicalTools
 from src.utils.fallback_handler import FallbackHandler
+from src.utils.llm_cache import log_llm_cache_stats
+from src.utils.llm_metrics import export_llm_metrics, log_llm_metrics
+from src.utils.model_pool import log_model_stats
+from src.utils.prefix_cache import log_prefix_cache_stats
 from src.utils.version_checker import VersionChecker
 
 # Configure logging
@@ -36,25 +37,42 @@ class ProjectOrchestrator:
         return self.version_checker.verify_environment()
 
     def setup_components(self):
-        """Initialize all components with fallback handling"""
+        """Initialize all components; agents are created on first use"""
+        self._agents = None
+        self.github_tools = GitHubTools()
+        self.technical_tools = TechnicalTools()
+        self.devops_tools = DevOpsTools()
+
+    @property
+    def agents(self):
+        """ProjectAgents, created on first access so GitHub-only commands never import crewai"""
+        if self._agents is None:
+            self._agents = self.create_agents()
+        return self._agents
+
+    def create_agents(self):
+        """Create ProjectAgents with fallback handling"""
+        from src.agents.project_agents import ProjectAgents
+
         try:
-            self.agents = ProjectAgents()
+            agents = ProjectAgents()
         except Exception as e:
             logger.error(f"Failed to initialize ProjectAgents: {str(e)}")
             # Try fallback LLM
 # fallback_llm
             if fallback_llm:
                 logger.info("Using fallback LLM")
-                self.agents = ProjectAgents(llm=fallback_llm)
-            else:
-                raise
+                return ProjectAgents(llm=fallback_llm)
+            raise
 
-        self.github_tools = GitHubTools()
-        self.technical_tools = TechnicalTools()
-        self.devops_tools = DevOpsTools()
+        # Route every call, so the primary model's runtime failures and timeouts fail over too
+        agents.llm = self.fallback_handler.get_routed_llm("llama", agents.llm)
+        return agents
 
     def run_analysis(self):
         """Run complete project analysis using CrewAI"""
+        from crewai import Crew
+
         try:
             # Create the crew
 # crew
@@ -70,6 +88,10 @@ class ProjectOrchestrator:
             # Start the analysis
 # result
             logger.info("Analysis completed successfully")
+            log_llm_metrics(logger)
+            export_path = export_llm_metrics()
+            if export_path:
+                logger.info(f"LLM call metrics written to {export_path}")
             return result
 
         except Exception as e:
@@ -134,6 +156,9 @@ def main():
 # results
         logger.info("Analysis completed!")
         logger.info(results)
+        log_model_stats(logger)
+        log_llm_cache_stats(logger)
+        log_prefix_cache_stats(logger)
         return 0
     except Exception as e:
         logger.error(f"Failed to run orchestrator: {str(e)}")
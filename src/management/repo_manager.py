@@ -2,12 +2,12 @@ import json
 import os
 from datetime import datetime
 
-from github import Github
+from src.utils.github_client import get_github
 
 
 class RepositoryManager:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
         self.config_file = "config/tracked_repos.json"
         self.ensure_config_exists()
 
@@ -2,7 +2,10 @@
 import logging
 import os
 
-from github import Github
+from src.database.issue_mirror import IssueMirror
+from src.integrations.mutation_outbox import MutationOutbox
+from src.utils.github_client import get_github
+from src.utils.keyword_matcher import get_keyword_matcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -12,7 +15,9 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 class MasterProjectOrchestrator:
     def __init__(self, token):
         """Initialize comprehensive project management system"""
-        self.gh = Github(token)
+        self.gh = get_github(token)
+        self.issue_mirror = IssueMirror()
+        self.outbox = MutationOutbox.from_config(self.gh)
 
         # Define project groups with repositories
         self.project_groups = {
@@ -50,41 +55,34 @@ class MasterProjectOrchestrator:
 
         for repo_name, repo in self.repositories.items():
             try:
-                open_issues = repo.get_issues(state="open")
+                self.issue_mirror.sync(repo)
+                open_issues = self.issue_mirror.issues(repo.full_name, state="open")
 
                 for issue in open_issues:
                     # Determine if issue is suitable for AI development
                     if self._is_ai_development_candidate(issue):
-                        # Add AI development label
-                        issue.add_to_labels("ai-development")
+                        self.outbox.edit_issue(
+                            repo.full_name,
+                            issue.number,
+                            add_labels=["ai-development"],
+                            key=f"ai-development:{repo.full_name}#{issue.number}",
+                        )
                         ai_dev_candidates.append(issue)
 
             except Exception as e:
                 logger.error(f"Error processing issues in {repo_name}: {e}")
 
+        # Label every candidate in one batch of concurrent writes
+        self.outbox.flush()
         return ai_dev_candidates
 
     def _is_ai_development_candidate(self, issue):
         """Determine if an issue is suitable for AI development"""
-        # Check issue title and body for development-related keywords
-# development_keywords
-            "implement",
-            "create",
-            "develop",
-            "build",
-            "design",
-            "feature",
-            "module",
-            "function",
-            "service",
-            "component",
-        ]
-
         # Combine title and body for keyword matching
 # issue_text
 
-        # Check for development keywords
-# keyword_match
+        # Check for development keywords (config/keywords.json)
+        keyword_match = get_keyword_matcher("development").contains_any(issue_text)
 
         # Exclude issues that are already labeled or seem too vague
 # exclusion_labels
@@ -1,49 +1,73 @@
 #!/usr/bin/env python3
+import json
 import logging
 import os
+from collections import Counter
 
-from github import Github
+from src.assignment.capacity_solver import plan_assignments
+from src.database.issue_mirror import IssueMirror
+from src.database.skill_counts import SkillCountStore
+from src.integrations.mutation_outbox import MutationOutbox
+from src.utils.github_client import get_github
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 # logger
 
+TEAM_CONFIG_PATH = "config/devops_team.json"
+
+DEFAULT_WORKLOAD_LIMITS = {"max_open_issues": 5, "max_critical_issues": 2}
+
 
 class AITaskAllocator:
     def __init__(self, token):
         """Initialize the task allocation system with detailed logging"""
         try:
-            self.gh = Github(token)
+            self.gh = get_github(token)
             self.project_repo = self.gh.get_repo("ZubeidHendricks/project-orchestrator")
             self.dev_repo = self.gh.get_repo("ZubeidHendricks/ai-dev-orchestrator")
+            self.issue_mirror = IssueMirror()
+            self.skill_store = SkillCountStore.from_config()
+            self.outbox = MutationOutbox.from_config(self.gh)
 
             logger.info("Repositories initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize repositories: {e}")
             raise
 
-    def extract_developer_skills(self):
-        """Extract detailed developer skills with comprehensive logging"""
+    def extract_developer_skills(self, rebuild=False):
+        """Extract detailed developer skills with comprehensive logging.
+
+        Skill counts are persisted; each run only folds in issues closed
+        since the previous one. rebuild=True recounts every closed issue.
+        """
 # developer_skills
 
         try:
-            # Log total issues in dev repository
-            total_issues = self.dev_repo.get_issues(state="closed").totalCount
-            logger.info(f"Total closed issues in ai-dev-orchestrator: {total_issues}")
+            # Only issues updated since the last run are downloaded
+            self.issue_mirror.sync(self.dev_repo)
+            if rebuild:
+                self.skill_store.clear()
+            closed_issues = self.issue_mirror.issues(
+                self.dev_repo.full_name, state="closed", closed_since=self.skill_store.fetch_since()
+            )
 
-            # Analyze closed issues to build skill profiles
-            for issue in self.dev_repo.get_issues(state="closed"):
+            # Analyze newly closed issues to update skill profiles
+            contributions = []
+            for issue in closed_issues:
                 if issue.assignee:
 # dev_name
 
-                    # Initialize developer if not exists
-                    if dev_name not in developer_skills:
-                        developer_skills[dev_name] = {}
-
                     # Extract skills from issue labels
+                    issue_skills = []
                     for label in issue.labels:
 # skill
-                        developer_skills[dev_name][skill] = developer_skills[dev_name].get(skill, 0) + 1
+                        issue_skills.append(skill)
+                    contributions.append((issue.number, dev_name, issue_skills, issue.closed_at))
+
+            added = self.skill_store.fold(contributions)
+            logger.info(f"Folded {added} newly closed issues from ai-dev-orchestrator into developer skills")
+            developer_skills = self.skill_store.skills()
 
             # Log discovered developer skills
             logger.info("Discovered Developer Skills:")
@@ -57,10 +81,11 @@ class AITaskAllocator:
             return {}
 
     def create_dev_issue(self, recommended_dev, project_issue):
-        """Create a mirroring issue in ai-dev-orchestrator"""
+        """Queue a mirroring issue in ai-dev-orchestrator; it is created when the outbox is flushed"""
         try:
             # Create new issue in ai-dev-orchestrator
-# new_issue
+            self.outbox.create_issue(
+                self.dev_repo.full_name,
 # title
 # body
                     f"Assigned from project-orchestrator\n\n"
@@ -69,14 +94,21 @@ class AITaskAllocator:
                 ),
 # assignees
 # labels
+                # One dev issue per project issue, however often allocation is re-run
+                key=f"dev-issue:{project_issue.html_url}",
             )
 
-            logger.info(f"Created issue #{new_issue.number} in ai-dev-orchestrator for {recommended_dev}")
+            logger.info(f"Queued issue in ai-dev-orchestrator for {recommended_dev}")
         except Exception as e:
-            logger.error(f"Failed to create issue for {recommended_dev}: {e}")
+            logger.error(f"Failed to queue issue for {recommended_dev}: {e}")
 
-    def allocate_tasks(self):
+    def allocate_tasks(self, bulk=None):
         """Comprehensive task allocation with detailed logging"""
+        if bulk is None:
+            bulk = os.getenv("TASK_ALLOCATION_MODE", "").lower() == "bulk"
+        if bulk:
+            return self.allocate_tasks_bulk()
+
         # Extract developer skills
 # developer_skills
 
@@ -92,8 +124,8 @@ class AITaskAllocator:
 # recommended_dev
 
                     # Assign issue in project-orchestrator
-                    issue.edit(assignee=recommended_dev)
-                    logger.info(f"Assigned Issue #{issue.number} '{issue.title}' to {recommended_dev}")
+                    self._queue_assignment(issue.number, issue.html_url, recommended_dev)
+                    logger.info(f"Assigning Issue #{issue.number} '{issue.title}' to {recommended_dev}")
 
                     # Create mirroring issue in ai-dev-orchestrator
                     self.create_dev_issue(recommended_dev, issue)
@@ -101,6 +133,87 @@ class AITaskAllocator:
                 except Exception as e:
                     logger.error(f"Could not process issue #{issue.number}: {e}")
 
+        # Send the queued assignments and dev issues in one batch
+        self.outbox.flush()
+
+    def allocate_tasks_bulk(self, developers=None):
+        """Assign every unassigned open issue in one plan that respects developer workload limits"""
+        developer_skills = self.extract_developer_skills()
+        if not developer_skills:
+            logger.warning("No developer skills found, nothing to allocate")
+            return {}
+
+        self.issue_mirror.sync(self.project_repo)
+        open_issues = self.issue_mirror.issues(self.project_repo.full_name, state="open", pull_requests=False)
+        plan = self.plan_bulk_assignment(open_issues, developer_skills, developers)
+
+        for issue in open_issues:
+            recommended_dev = plan.get(issue.number)
+            if recommended_dev:
+                self._queue_assignment(issue.number, issue.html_url, recommended_dev)
+                logger.info(f"Assigning Issue #{issue.number} '{issue.title}' to {recommended_dev}")
+                self.create_dev_issue(recommended_dev, issue)
+
+        self.outbox.flush()
+        return plan
+
+    def _queue_assignment(self, number, html_url, developer):
+        self.outbox.edit_issue(
+            self.project_repo.full_name, number, assignees=[developer], key=f"assign:{html_url}:{developer}"
+        )
+
+    def plan_bulk_assignment(self, open_issues, developer_skills, developers=None):
+        """Plan {issue number: developer} for the unassigned issues among open_issues.
+
+        Each developer takes at most max_open_issues (or their
+        Developer.max_workload when given) open issues and max_critical_issues
+        critical ones, counting the issues they already hold. The issue x
+        developer score matrix is solved as one assignment problem instead of
+        picking the best developer issue by issue.
+        """
+        limits = self._workload_limits()
+        max_open = {dev: limits["max_open_issues"] for dev in developer_skills}
+        for developer in developers or []:
+            if developer.github_username in max_open:
+                max_open[developer.github_username] = developer.max_workload
+
+        load, critical_load = Counter(), Counter()
+        unassigned = []
+        for issue in open_issues:
+            assignees = {user.login for user in issue.assignees}
+            if issue.assignee:
+                assignees.add(issue.assignee.login)
+            if not assignees:
+                unassigned.append(issue)
+            for login in assignees:
+                load[login] += 1
+                critical_load[login] += self._is_critical(issue)
+
+        plan = plan_assignments(
+            [[label.name for label in issue.labels] for issue in unassigned],
+            developer_skills,
+            {dev: limit - load[dev] for dev, limit in max_open.items()},
+            critical=[self._is_critical(issue) for issue in unassigned],
+            critical_capacities={dev: limits["max_critical_issues"] - critical_load[dev] for dev in developer_skills},
+        )
+
+        planned = {issue.number: dev for issue, dev in zip(unassigned, plan) if dev is not None}
+        if len(planned) < len(unassigned):
+            logger.warning(f"{len(unassigned) - len(planned)} issues left unassigned: all developers at capacity")
+        return planned
+
+    @staticmethod
+    def _is_critical(issue):
+        return any("critical" in label.name.lower() for label in issue.labels)
+
+    @staticmethod
+    def _workload_limits():
+        limits = dict(DEFAULT_WORKLOAD_LIMITS)
+        if os.path.exists(TEAM_CONFIG_PATH):
+            with open(TEAM_CONFIG_PATH, "r") as f:
+                limits.update(json.load(f).get("workload_limits", {}))
+        return limits
+
     def recommend_developer(self, issue, developer_skills):
         """Recommend the best developer for an issue"""
 # issue_skills
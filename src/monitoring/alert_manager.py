@@ -2,12 +2,19 @@ import json
 import os
 from datetime import datetime
 
-from github import Github
+from src.integrations.mutation_outbox import MutationOutbox
+from src.monitoring.retention import add_to_index
+from src.utils.github_client import get_github
+from src.utils.repository_counts import RepositoryCountsFetcher
+
+ALERT_LABEL = "alert"
 
 
 class AlertManager:
     def __init__(self):
-        self.github = Github(os.getenv("GITHUB_TOKEN"))
+        self.github = get_github(os.getenv("GITHUB_TOKEN"))
+        self.counts_fetcher = RepositoryCountsFetcher(os.getenv("GITHUB_TOKEN"))
+        self.outbox = MutationOutbox.from_config(self.github)
         self.thresholds = {
             "open_issues": 10,
             "open_prs": 5,
@@ -17,6 +24,7 @@ class AlertManager:
     def check_alerts(self):
 # alerts
 # repositories
+        self.counts_fetcher.fetch(repo.full_name for repo in repositories)
 
         for repo in repositories:
 # repo_alerts
@@ -28,18 +36,44 @@ class AlertManager:
     def check_repository(self, repo):
 # alerts
 
+        counts = self.counts_fetcher.cached(repo.full_name)
+
         # Check open issues
-        open_issues = repo.get_issues(state="open").totalCount
+        open_issues = counts["open_issues"] if counts else repo.get_issues(state="open").totalCount
         if open_issues > self.thresholds["open_issues"]:
             alerts.append({"type": "high_issues", "repo": repo.name, "count": open_issues})
 
         # Check open PRs
-        open_prs = repo.get_pulls(state="open").totalCount
+        open_prs = counts["open_prs"] if counts else repo.get_pulls(state="open").totalCount
         if open_prs > self.thresholds["open_prs"]:
             alerts.append({"type": "high_prs", "repo": repo.name, "count": open_prs})
 
         return alerts
 
+    def check_changed_repositories(self, mirror, since):
+        """Re-check repositories that received webhook events since `since` using mirrored counts only.
+
+        The manager's own `alert` issues are left out of the issue counts, so
+        filing an alert never pushes a repository over its threshold.
+        """
+        alerts = []
+        for full_name in mirror.changed_repositories(since):
+            # Counts are only trustworthy once the repository has had a full sync
+            if not mirror.is_synced(full_name):
+                continue
+
+            repo_name = full_name.split("/")[-1]
+            open_issues = mirror.count(full_name, state="open", pull_requests=False, exclude_labels=[ALERT_LABEL])
+            if open_issues > self.thresholds["open_issues"]:
+                alerts.append({"type": "high_issues", "repo": repo_name, "count": open_issues})
+
+            open_prs = mirror.count(full_name, state="open", pull_requests=True)
+            if open_prs > self.thresholds["open_prs"]:
+                alerts.append({"type": "high_prs", "repo": repo_name, "count": open_prs})
+
+        self.process_alerts(alerts)
+        return alerts
+
     def process_alerts(self, alerts):
         if not alerts:
             return
@@ -58,6 +92,7 @@ class AlertManager:
 # filename
         with open(filename, "w") as f:
             json.dump(alerts, f, indent=2)
+        add_to_index(alerts_path, filename)
 
     def create_alert_issues(self, alerts):
         for alert in alerts:
@@ -68,7 +103,15 @@ class AlertManager:
 
             # Create issue in the project-orchestrator repo
 # orchestrator_repo
-            orchestrator_repo.create_issue(title=title, body=body, labels=["alert"])
+            self.outbox.create_issue(
+                orchestrator_repo.full_name,
+                title=title,
+                body=body,
+                labels=[ALERT_LABEL],
+                # At most one issue per repository, alert type and day, however often the checks run
+                key=f"alert:{alert['repo']}:{alert['type']}:{datetime.now():%Y-%m-%d}",
+            )
+        self.outbox.flush()
 
 
 if __name__ == "__main__":
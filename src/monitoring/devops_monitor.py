@@ -1,12 +1,12 @@
 import json
 import os
 
-from github import Github
+from src.utils.github_client import get_github
 
 
 class DevOpsMonitor:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
         self.data_dir = "data/devops"
         os.makedirs(self.data_dir, exist_ok=True)
         self.load_config()
@@ -1,12 +1,11 @@
-import os
 from datetime import datetime
 
-from github import Github
+from src.utils.github_client import get_github
 
 
 class IssueHandler:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
         self.load_team_config()
 
     def load_team_config(self):
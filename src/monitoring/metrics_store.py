@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = "data/metrics/repository_metrics.npz"
+
+# Numeric columns kept per (repo, timestamp); NaN marks a value the source report did not carry
+METRIC_COLUMNS = [
+    "stars",
+    "forks",
+    "open_issues",
+    "open_prs",
+    "workflow_success",
+    "workflow_failure",
+    "workflow_other",
+]
+
+AGGREGATES = {"mean", "sum", "min", "max", "first", "last", "count"}
+
+_EPOCH = datetime(1970, 1, 1)
+
+_INTERVALS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_interval(interval) -> int:
+    """Bucket width in seconds from an int or a string like "15m", "1h", "1d" """
+    if isinstance(interval, (int, np.integer)):
+        return int(interval)
+    match = re.fullmatch(r"(\d+)\s*([smhdw])", str(interval).strip().lower())
+    if not match:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(match.group(1)) * _INTERVALS[match.group(2)]
+
+
+def _epoch(when) -> int:
+    """Seconds since the epoch; naive datetimes are taken as-is so they round-trip through datetime64"""
+    if isinstance(when, np.datetime64):
+        return int(when.astype("datetime64[s]").astype(np.int64))
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((when - _EPOCH).total_seconds())
+
+
+class MetricsStore:
+    """Columnar time series of repository metrics backed by NumPy arrays.
+
+    Rows are keyed by (repo, timestamp) and kept sorted by timestamp, so range
+    scans are two binary searches. Repository names are dictionary-encoded
+    into an int32 column. The store persists as a single compressed .npz file.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.repos: List[str] = []
+        self._repo_codes: Dict[str, int] = {}
+        self.repo = np.empty(0, dtype=np.int32)
+        self.timestamp = np.empty(0, dtype=np.int64)
+        self.columns = {name: np.empty(0, dtype=np.float64) for name in METRIC_COLUMNS}
+        self._pending: List[Tuple[int, int, List[float]]] = []
+
+        if os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.timestamp) + len(self._pending)
+
+    def _load(self) -> None:
+        with np.load(self.path, allow_pickle=False) as data:
+            self.repos = [str(name) for name in data["repos"]]
+            self.repo = data["repo"]
+            self.timestamp = data["timestamp"]
+            for name in METRIC_COLUMNS:
+                self.columns[name] = data[name] if name in data else np.full(len(self.timestamp), np.nan)
+        self._repo_codes = {name: code for code, name in enumerate(self.repos)}
+
+    def _code(self, repo: str) -> int:
+        if repo not in self._repo_codes:
+            self._repo_codes[repo] = len(self.repos)
+            self.repos.append(repo)
+        return self._repo_codes[repo]
+
+    def append(self, repo: str, when, **metrics: Optional[float]) -> None:
+        """Buffer one row; unknown metric names raise, missing ones are stored as NaN"""
+        unknown = set(metrics) - set(METRIC_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown metric columns: {sorted(unknown)}")
+        values = [np.nan if metrics.get(name) is None else float(metrics[name]) for name in METRIC_COLUMNS]
+        with self._lock:
+            self._pending.append((self._code(repo), _epoch(when), values))
+
+    def record_report(self, report: dict, when=None) -> int:
+        """Append one row per repository of a RepositoryMonitor report"""
+        when = when or report.get("repository_status", {}).get("timestamp") or datetime.now()
+        rows = 0
+        for repo, metrics in report_rows(report):
+            self.append(repo, when, **metrics)
+            rows += 1
+        return rows
+
+    def flush(self) -> None:
+        """Merge buffered rows into the sorted columns; a later row for the same (repo, timestamp) wins"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+
+            repo = np.concatenate([self.repo, np.array([row[0] for row in pending], dtype=np.int32)])
+            timestamp = np.concatenate([self.timestamp, np.array([row[1] for row in pending], dtype=np.int64)])
+            values = np.array([row[2] for row in pending], dtype=np.float64).reshape(len(pending), len(METRIC_COLUMNS))
+            columns = {
+                name: np.concatenate([self.columns[name], values[:, i]]) for i, name in enumerate(METRIC_COLUMNS)
+            }
+
+            # Stable sort keeps insertion order among duplicates, so the last one is the newest write
+            order = np.lexsort((repo, timestamp))
+            repo, timestamp = repo[order], timestamp[order]
+            keep = np.ones(len(order), dtype=bool)
+            keep[:-1] = (repo[1:] != repo[:-1]) | (timestamp[1:] != timestamp[:-1])
+
+            self.repo, self.timestamp = repo[keep], timestamp[keep]
+            self.columns = {name: column[order][keep] for name, column in columns.items()}
+
+    def prune(self, before) -> int:
+        """Drop rows older than `before`; returns the number removed"""
+        self.flush()
+        with self._lock:
+            cut = int(np.searchsorted(self.timestamp, _epoch(before), side="left"))
+            if cut:
+                self.repo, self.timestamp = self.repo[cut:], self.timestamp[cut:]
+                self.columns = {name: column[cut:] for name, column in self.columns.items()}
+        return cut
+
+    def save(self) -> None:
+        self.flush()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + ".tmp.npz"
+        with self._lock:
+            np.savez_compressed(
+                tmp_path,
+                repos=np.array(self.repos, dtype=str),
+                repo=self.repo,
+                timestamp=self.timestamp,
+                **self.columns,
+            )
+        os.replace(tmp_path, self.path)
+
+    def _mask(self, start=None, end=None, repos: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Row indices for a time range (inclusive) and optional repository filter"""
+        self.flush()
+        lo = 0 if start is None else np.searchsorted(self.timestamp, _epoch(start), side="left")
+        hi = len(self.timestamp) if end is None else np.searchsorted(self.timestamp, _epoch(end), side="right")
+        rows = np.arange(lo, hi)
+        if repos is not None:
+            codes = [self._repo_codes[name] for name in repos if name in self._repo_codes]
+            rows = rows[np.isin(self.repo[rows], codes)]
+        return rows
+
+    def query(self, start=None, end=None, repos=None, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Range scan returning column arrays: repo names, datetime64 timestamps and the requested metrics"""
+        rows = self._mask(start, end, repos)
+        result = {
+            "repo": np.array(self.repos, dtype=object)[self.repo[rows]] if self.repos else np.empty(0, dtype=object),
+            "timestamp": self.timestamp[rows].astype("datetime64[s]"),
+        }
+        for name in columns or METRIC_COLUMNS:
+            result[name] = self.columns[name][rows]
+        return result
+
+    def series(self, repo: str, column: str, start=None, end=None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values) of one metric for one repository, e.g. open issues over the last 30 days"""
+        rows = self._mask(start, end, [repo])
+        return self.timestamp[rows].astype("datetime64[s]"), self.columns[column][rows]
+
+    def group_by_repo(self, column: str, agg: str = "last", start=None, end=None) -> Dict[str, float]:
+        """Aggregate one metric per repository over a time range"""
+        rows = self._mask(start, end)
+        keys, values = self._aggregate(self.repo[rows], self.timestamp[rows], self.columns[column][rows], agg)
+        return {self.repos[code]: value for code, value in zip(keys.tolist(), values.tolist())}
+
+    def downsample(
+        self, column: str, interval="1d", agg: str = "mean", start=None, end=None, repos=None
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Per-repository series bucketed into fixed intervals: {repo: (bucket_starts, values)}"""
+        step = parse_interval(interval)
+        rows = self._mask(start, end, repos)
+        repo, timestamp = self.repo[rows], self.timestamp[rows]
+        bucket = timestamp // step
+        width = int(bucket.max()) + 1 if len(bucket) else 1
+
+        # Combine (repo, bucket) into one sortable key so a single pass aggregates every group
+        keys, values = self._aggregate(
+            repo.astype(np.int64) * width + bucket, timestamp, self.columns[column][rows], agg
+        )
+
+        result: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for code in np.unique(keys // width):
+            selected = keys // width == code
+            starts = ((keys[selected] % width) * step).astype("datetime64[s]")
+            result[self.repos[int(code)]] = (starts, values[selected])
+        return result
+
+    @staticmethod
+    def _aggregate(group: np.ndarray, timestamp: np.ndarray, values: np.ndarray, agg: str):
+        """Aggregate values per group key, ignoring NaN; returns (sorted unique keys, aggregates)"""
+        if agg not in AGGREGATES:
+            raise ValueError(f"Unsupported aggregate {agg!r}; expected one of {sorted(AGGREGATES)}")
+        if not len(group):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        order = np.lexsort((timestamp, group))
+        group, values = group[order], values[order]
+        keys, starts = np.unique(group, return_index=True)
+        valid = ~np.isnan(values)
+        counts = np.add.reduceat(valid.astype(np.int64), starts)
+
+        if agg == "count":
+            return keys, counts.astype(np.float64)
+        if agg in ("sum", "mean"):
+            sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+            if agg == "sum":
+                return keys, sums
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return keys, np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        if agg in ("min", "max"):
+            fill = np.inf if agg == "min" else -np.inf
+            reduce = np.minimum if agg == "min" else np.maximum
+            result = reduce.reduceat(np.where(valid, values, fill), starts)
+            return keys, np.where(counts > 0, result, np.nan)
+
+        # first/last: the earliest/latest non-NaN value in each group
+        ends = np.append(starts[1:], len(values))
+        positions = np.arange(len(values))
+        if agg == "first":
+            picked = np.minimum.reduceat(np.where(valid, positions, len(values)), starts)
+        else:
+            picked = np.maximum.reduceat(np.where(valid, positions, -1), starts)
+        found = (picked >= starts) & (picked < ends)
+        return keys, np.where(found, values[np.clip(picked, 0, len(values) - 1)], np.nan)
+
+
+def report_rows(report: dict) -> Iterator[Tuple[str, Dict[str, Optional[float]]]]:
+    """(full_name, metrics) per repository of a RepositoryMonitor report"""
+    conclusions: Dict[str, Dict[str, int]] = {}
+    for run in report.get("workflow_runs", {}).get("workflow_runs", []):
+        counts = conclusions.setdefault(run["repository"], {"success": 0, "failure": 0, "other": 0})
+        bucket = run.get("conclusion") if run.get("conclusion") in ("success", "failure") else "other"
+        counts[bucket] += 1
+
+    for repo in report.get("repository_status", {}).get("repositories", []):
+        counts = conclusions.get(repo["full_name"], {})
+        yield repo["full_name"], {
+            "stars": repo.get("stars"),
+            "forks": repo.get("forks"),
+            "open_issues": repo.get("open_issues"),
+            "workflow_success": counts.get("success", 0),
+            "workflow_failure": counts.get("failure", 0),
+            "workflow_other": counts.get("other", 0),
+        }
+
+
+def status_rows(report: dict) -> Iterator[Tuple[str, Dict[str, Optional[float]]]]:
+    """(repo, metrics) per repository of a StatusUpdater status report"""
+    for repo, status in report.items():
+        if isinstance(status, dict):
+            yield repo, {"open_issues": status.get("open_issues"), "open_prs": status.get("open_prs")}
+
+
+def _timestamp_from_name(path: str) -> Optional[datetime]:
+    match = re.search(r"(\d{8})(?:_(\d{6}))?", os.path.basename(path))
+    if not match:
+        return None
+    return datetime.strptime(match.group(1) + (match.group(2) or "000000"), "%Y%m%d%H%M%S")
+
+
+def import_monitoring_reports(store: MetricsStore, directory: str = "data/monitoring") -> int:
+    """Load RepositoryMonitor report_*.json snapshots and, if present, the delta-encoded history"""
+    from src.monitoring.report_history import ReportHistory
+
+    rows = 0
+    for path in sorted(glob.glob(os.path.join(directory, "report_*.json"))):
+        with open(path, "r") as f:
+            report = json.load(f)
+        rows += store.record_report(report, _timestamp_from_name(path))
+
+    history_dir = os.path.join(directory, "history")
+    if os.path.isdir(history_dir):
+        for when, report in ReportHistory(history_dir).iter_snapshots():
+            rows += store.record_report(report, when)
+    return rows
+
+
+def full_names(short_names: Iterable[str], known: Iterable[str], owner: Optional[str] = None) -> Dict[str, str]:
+    """Map the short repository names of status reports to owner/name.
+
+    A name resolves to the one known full name ending in it; otherwise to
+    owner/name when an owner is given. Names that resolve to nothing, or to
+    several known repositories, are kept as they are.
+    """
+    candidates: Dict[str, List[str]] = {}
+    for full_name in known:
+        if "/" in full_name:
+            candidates.setdefault(full_name.split("/", 1)[1], []).append(full_name)
+
+    mapping = {}
+    for name in short_names:
+        matches = candidates.get(name, [])
+        if "/" in name:
+            mapping[name] = name
+        elif len(matches) == 1:
+            mapping[name] = matches[0]
+        elif owner:
+            mapping[name] = f"{owner}/{name}"
+        else:
+            if matches:
+                logger.warning(f"Status report repository {name!r} matches {sorted(matches)}; keeping the short name")
+            else:
+                logger.warning(f"No owner/name known for status report repository {name!r}; keeping the short name")
+            mapping[name] = name
+    return mapping
+
+
+def import_status_reports(store: MetricsStore, directory: str = "status", owner: Optional[str] = None) -> int:
+    """Load StatusUpdater status_*.json files ({repo_name: {open_issues, open_prs, ...}}).
+
+    Status reports name repositories by their short name while monitoring
+    rows use owner/name, so names are mapped through `full_names` against
+    the repositories already in the store (import monitoring reports first)
+    and `owner`.
+    """
+    rows = 0
+    mapping: Dict[str, str] = {}
+    for path in sorted(glob.glob(os.path.join(directory, "status_*.json"))):
+        when = _timestamp_from_name(path) or datetime.fromtimestamp(os.path.getmtime(path))
+        with open(path, "r") as f:
+            report = json.load(f)
+        unmapped = [name for name in report if name not in mapping]
+        if unmapped:
+            mapping.update(full_names(unmapped, store.repos, owner))
+        for repo, metrics in status_rows(report):
+            store.append(mapping[repo], when, **metrics)
+            rows += 1
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar repository metrics store")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    importer = subparsers.add_parser("import", help="Import existing monitoring and status reports")
+    importer.add_argument("--monitoring", default="data/monitoring")
+    importer.add_argument("--status", default="status")
+    importer.add_argument("--owner", help="Owner of status-report repositories not found in the monitoring reports")
+
+    show = subparsers.add_parser("series", help="Print one metric of one repository")
+    show.add_argument("repo")
+    show.add_argument("column", choices=METRIC_COLUMNS)
+    show.add_argument("--days", type=int, default=30)
+    show.add_argument("--interval", default="1d")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    store = MetricsStore(args.store)
+
+    if args.command == "import":
+        rows = import_monitoring_reports(store, args.monitoring) + import_status_reports(store, args.status, args.owner)
+        store.save()
+        logger.info(f"Imported {rows} rows; store holds {len(store)} rows for {len(store.repos)} repositories")
+    else:
+        store.flush()
+        end = _EPOCH + timedelta(seconds=int(store.timestamp.max())) if len(store) else datetime.now()
+        start = end - timedelta(days=args.days)
+        buckets = store.downsample(args.column, args.interval, "last", start, end, [args.repo])
+        for when, value in zip(*buckets.get(args.repo, ([], []))):
+            print(f"{when}  {value:g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,43 @@ import logging
 import os
 from datetime import datetime
 
-from github import Github
+from src.monitoring.metrics_store import MetricsStore
+from src.monitoring.report_history import DEFAULT_HISTORY_DIR, ReportHistory
+from src.monitoring.repository_pool import RepositoryPool, default_max_workers
+from src.monitoring.retention import add_to_index, indexed_files
+from src.utils.github_client import get_github, log_cache_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 # logger
 
 
+def _load_monitoring_config(config_path="config/monitoring.json"):
+    try:
+        with open(config_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
 class RepositoryMonitor:
-    def __init__(self, token):
-        """Initialize repository monitoring system"""
-        self.gh = Github(token)
+    def __init__(self, token, max_workers=None, repositories=None):
+        """Initialize repository monitoring system.
+
+        repositories (owner/name) narrows a run to those repositories; the
+        report keeps the previous report's entries for the others.
+        """
+        self.gh = get_github(token)
         self.username = "ZubeidHendricks"
-        self.repositories = self._get_repositories()
+        self.config = _load_monitoring_config()
+        self.pool = RepositoryPool(max_workers or default_max_workers(self.config))
+        self.narrowed = repositories is not None
+        self.all_repositories = self._get_repositories()
+        if self.narrowed:
+            wanted = set(repositories)
+            self.repositories = [repo for repo in self.all_repositories if repo.full_name in wanted]
+        else:
+            self.repositories = self.all_repositories
 
     def _get_repositories(self):
         """Fetch all repositories for the user"""
@@ -26,6 +50,13 @@ class RepositoryMonitor:
             logger.error(f"Failed to fetch repositories: {e}")
             return []
 
+    def _map_repositories(self, phase, fetch):
+        """Run fetch(repo) for every monitored repository on the worker pool"""
+        return self.pool.map(phase, self.repositories, fetch)
+
+    def print_latency_summary(self):
+        self.pool.print_latency_summary()
+
     def generate_repository_status(self):
         """Generate comprehensive status for all repositories"""
 # repository_status
@@ -34,21 +65,22 @@ class RepositoryMonitor:
             "repositories": [],
         }
 
-        for repo in self.repositories:
-            try:
+        def fetch(repo):
 # repo_info
-                    "name": repo.name,
-                    "full_name": repo.full_name,
-                    "description": repo.description,
-                    "stars": repo.stargazers_count,
-                    "forks": repo.forks_count,
-                    "open_issues": repo.open_issues_count,
-                    "last_updated": repo.updated_at.isoformat(),
-                    "is_private": repo.private,
-                }
+                "name": repo.name,
+                "full_name": repo.full_name,
+                "description": repo.description,
+                "stars": repo.stargazers_count,
+                "forks": repo.forks_count,
+                "open_issues": repo.open_issues_count,
+                "last_updated": repo.updated_at.isoformat(),
+                "is_private": repo.private,
+            }
+            return repo_info
+
+        for repo_info in self._map_repositories("repository_status", fetch):
+            if repo_info is not None:
                 repository_status["repositories"].append(repo_info)
-            except Exception as e:
-                logger.error(f"Error processing repository {repo.name}: {e}")
 
         return repository_status
 
@@ -56,39 +88,108 @@ class RepositoryMonitor:
         """Track recent workflow runs across repositories"""
 # workflow_runs
 
-        for repo in self.repositories:
-            try:
-                # Fetch recent workflow runs
-                runs = repo.get_workflow_runs(status="completed")
+        def fetch(repo):
+            # Fetch recent workflow runs
+            runs = repo.get_workflow_runs(status="completed")
+            repo_runs = []
 
-                for run in runs[:10]:  # Last 10 runs
+            for run in runs[:10]:  # Last 10 runs
 # run_info
-                        "repository": repo.full_name,
-                        "workflow_name": run.name,
-                        "conclusion": run.conclusion,
-                        "created_at": run.created_at.isoformat(),
-                        "updated_at": run.updated_at.isoformat(),
-                    }
-                    workflow_runs["workflow_runs"].append(run_info)
-            except Exception as e:
-                logger.error(f"Error tracking workflows for {repo.name}: {e}")
+                    "repository": repo.full_name,
+                    "workflow_name": run.name,
+                    "conclusion": run.conclusion,
+                    "created_at": run.created_at.isoformat(),
+                    "updated_at": run.updated_at.isoformat(),
+                }
+                repo_runs.append(run_info)
+            return repo_runs
+
+        for repo_runs in self._map_repositories("workflow_runs", fetch):
+            workflow_runs["workflow_runs"].extend(repo_runs or [])
 
         return workflow_runs
 
-    def generate_comprehensive_report(self):
-        """Generate a comprehensive monitoring report"""
+    def record_metrics(self, report):
+        """Append the report to the columnar metrics store configured under metrics.store_path"""
+        store_path = self.config.get("metrics", {}).get("store_path")
+        if not store_path:
+            return
+        try:
+            store = MetricsStore(store_path)
+            store.record_report(report)
+            store.save()
+        except Exception as e:
+            logger.error(f"Failed to record metrics: {e}")
+
+    def _history(self):
+        storage_config = self.config.get("storage", {})
+        return ReportHistory(
+            storage_config.get("history_dir", DEFAULT_HISTORY_DIR), storage_config.get("keyframe_interval", 24)
+        )
+
+    def _previous_report(self, storage):
+        """The last stored report, in the given storage mode"""
+        try:
+            if storage == "delta":
+                return self._history().latest()
+            names = indexed_files("data/monitoring", prefix="report_")
+            if names:
+                with open(os.path.join("data/monitoring", names[-1]), "r") as f:
+                    return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read the previous monitoring report: {e}")
+        return None
+
+    def _carry_over(self, report, previous):
+        """Fill in the repositories a narrowed run did not fetch from the previous report"""
+        refreshed = {repo.full_name for repo in self.repositories}
+        # Repositories that no longer exist are not carried over
+        kept = {repo.full_name for repo in self.all_repositories} - refreshed
+
+        repository_status = report["repository_status"]
+        repository_status["repositories"].extend(
+            info
+            for info in previous.get("repository_status", {}).get("repositories", [])
+            if info.get("full_name") in kept
+        )
+        repository_status["total_repositories"] = len(repository_status["repositories"])
+        report["workflow_runs"]["workflow_runs"].extend(
+            run for run in previous.get("workflow_runs", {}).get("workflow_runs", []) if run.get("repository") in kept
+        )
+
+    def generate_comprehensive_report(self, storage=None):
+        """Generate a comprehensive monitoring report.
+
+        storage is "snapshot" (one full report file per run) or "delta"
+        (keyframes plus per-run deltas, see ReportHistory); it defaults to
+        storage.mode in config/monitoring.json.
+        """
+        storage_config = self.config.get("storage", {})
+        storage = storage or os.getenv("MONITOR_STORAGE") or storage_config.get("mode", "snapshot")
 # report
             "repository_status": self.generate_repository_status(),
             "workflow_runs": self.track_workflow_runs(),
         }
 
+        if self.narrowed:
+            previous = self._previous_report(storage)
+            if previous:
+                self._carry_over(report, previous)
+
         # Ensure data directory exists
         os.makedirs("data/monitoring", exist_ok=True)
+        self.record_metrics(report)
+
+        if storage == "delta":
+            report_path = self._history().append(report)
+            logger.info(f"Monitoring report stored: {report_path}")
+            return report
 
         # Save report
 # report_path
         with open(report_path, "w") as f:
             json.dump(report, f, indent=2)
+        add_to_index("data/monitoring", report_path)
 
         logger.info(f"Monitoring report generated: {report_path}")
         return report
@@ -109,6 +210,8 @@ def main():
         # Print summary
         print(f"Monitored {len(report['repository_status']['repositories'])} repositories")
         print(f"Tracked {len(report['workflow_runs']['workflow_runs'])} workflow runs")
+        monitor.print_latency_summary()
+        log_cache_stats(logger)
 
     except Exception as e:
         logger.error(f"Monitoring failed: {e}")
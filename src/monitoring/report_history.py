@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_DIR = "data/monitoring/history"
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Report sections holding a list of entries, and how to identify an entry across runs
+SECTION_KEYS: Dict[str, Tuple[str, Callable[[dict], str]]] = {
+    "repository_status": ("repositories", lambda repo: repo["full_name"]),
+    "workflow_runs": (
+        "workflow_runs",
+        lambda run: f"{run['repository']}|{run['workflow_name']}|{run['created_at']}",
+    ),
+}
+
+_FILE_PATTERN = re.compile(r"^(keyframe|delta)_(\d{8}_\d{6})\.json$")
+
+
+def _diff_entries(previous: List[dict], current: List[dict], key: Callable[[dict], str]) -> dict:
+    """Encode `current` as changes against `previous`"""
+    current_keys = [key(entry) for entry in current]
+    if len(set(current_keys)) != len(current_keys):
+        return {"full": current}
+
+    previous_by_key = OrderedDict((key(entry), entry) for entry in previous)
+    delta = {
+        "changed": {k: entry for k, entry in zip(current_keys, current) if previous_by_key.get(k) != entry},
+        "removed": [k for k in previous_by_key if k not in set(current_keys)],
+    }
+    # Only spell out the ordering when replaying the changes would not reproduce it
+    if [key(entry) for entry in _apply_entries(previous, delta, key)] != current_keys:
+        delta["order"] = current_keys
+    return delta
+
+
+def _apply_entries(previous: List[dict], delta: dict, key: Callable[[dict], str]) -> List[dict]:
+    if "full" in delta:
+        return delta["full"]
+
+    entries = OrderedDict((key(entry), entry) for entry in previous)
+    for k in delta["removed"]:
+        entries.pop(k, None)
+    entries.update(delta["changed"])
+    if "order" in delta:
+        return [entries[k] for k in delta["order"]]
+    return list(entries.values())
+
+
+def diff_reports(previous: dict, current: dict) -> dict:
+    """Build a delta that turns `previous` into `current`"""
+    delta = {}
+    for section, value in current.items():
+        if section in SECTION_KEYS and section in previous:
+            field, key = SECTION_KEYS[section]
+            delta[section] = {name: v for name, v in value.items() if name != field}
+            delta[section][field] = _diff_entries(previous[section].get(field, []), value.get(field, []), key)
+        else:
+            delta[section] = {"full": value}
+    return delta
+
+
+def apply_delta(previous: dict, delta: dict) -> dict:
+    """Reconstruct the report a delta was built from"""
+    report = {}
+    for section, value in delta.items():
+        if "full" in value:
+            report[section] = value["full"]
+            continue
+        field, key = SECTION_KEYS[section]
+        report[section] = {name: v for name, v in value.items() if name != field}
+        report[section][field] = _apply_entries(previous[section].get(field, []), value[field], key)
+    return report
+
+
+class ReportHistory:
+    """Monitoring report history stored as periodic keyframes plus per-run deltas.
+
+    Every `keyframe_interval` runs a full report is written; the runs in
+    between only store the repositories and workflow runs that changed since
+    the previous run. `snapshot_at` replays the deltas on top of the nearest
+    earlier keyframe to reconstruct the report as it was at any point in time.
+    """
+
+    def __init__(self, directory: str = DEFAULT_HISTORY_DIR, keyframe_interval: int = 24):
+        self.directory = directory
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._latest: Optional[dict] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def entries(self) -> List[Tuple[datetime, str, str]]:
+        """(timestamp, kind, path) for every stored run, oldest first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            match = _FILE_PATTERN.match(name)
+            if match:
+                when = datetime.strptime(match.group(2), TIMESTAMP_FORMAT)
+                entries.append((when, match.group(1), os.path.join(self.directory, name)))
+        return sorted(entries)
+
+    def timestamps(self) -> List[datetime]:
+        return [when for when, _, _ in self.entries()]
+
+    def append(self, report: dict, when: Optional[datetime] = None) -> str:
+        """Store a report as a keyframe or a delta against the previous run; returns the file path"""
+        when = when or datetime.now()
+        entries = self.entries()
+        if entries and when <= entries[-1][0]:
+            raise ValueError(f"Report at {when} is not newer than the latest stored run {entries[-1][0]}")
+
+        runs_since_keyframe = 0
+        for _, kind, _ in reversed(entries):
+            if kind == "keyframe":
+                break
+            runs_since_keyframe += 1
+
+        if not entries or runs_since_keyframe + 1 >= self.keyframe_interval:
+            kind, body = "keyframe", report
+        else:
+            previous = self._latest if self._latest is not None else self.snapshot_at(entries[-1][0])
+            kind, body = "delta", diff_reports(previous, report)
+
+        path = os.path.join(self.directory, f"{kind}_{when.strftime(TIMESTAMP_FORMAT)}.json")
+        with open(path, "w") as f:
+            json.dump(body, f, separators=(",", ":"))
+
+        self._latest = report
+        return path
+
+    def snapshot_at(self, when: datetime) -> Optional[dict]:
+        """Reconstruct the latest report stored at or before `when`"""
+        entries = [entry for entry in self.entries() if entry[0] <= when]
+        if not entries:
+            return None
+
+        keyframes = [i for i, (_, kind, _) in enumerate(entries) if kind == "keyframe"]
+        if not keyframes:
+            raise ValueError(f"No keyframe stored before {when}")
+        start = keyframes[-1]
+
+        with open(entries[start][2], "r") as f:
+            report = json.load(f)
+        for _, _, path in entries[start + 1 :]:
+            with open(path, "r") as f:
+                report = apply_delta(report, json.load(f))
+        return report
+
+    def iter_snapshots(self) -> Iterator[Tuple[datetime, dict]]:
+        """Yield (timestamp, report) for every stored run in order, replaying each delta once"""
+        report = None
+        for when, kind, path in self.entries():
+            with open(path, "r") as f:
+                body = json.load(f)
+            if kind == "keyframe":
+                report = body
+            elif report is None:
+                raise ValueError(f"Delta {path} has no preceding keyframe")
+            else:
+                report = apply_delta(report, body)
+            yield when, report
+
+    def latest(self) -> Optional[dict]:
+        entries = self.entries()
+        return self.snapshot_at(entries[-1][0]) if entries else None
+
+
+def report_timestamp(path: str, report: dict) -> datetime:
+    """Timestamp of a full report, from its file name or its repository_status section"""
+    match = re.search(r"(\d{8}_\d{6})", os.path.basename(path))
+    if match:
+        return datetime.strptime(match.group(1), TIMESTAMP_FORMAT)
+    return datetime.fromisoformat(report["repository_status"]["timestamp"])
+
+
+def convert_directory(source: str, history: ReportHistory, remove: bool = False) -> int:
+    """Import existing full report_*.json snapshots into a ReportHistory"""
+    converted = 0
+    for path in sorted(glob.glob(os.path.join(source, "report_*.json"))):
+        with open(path, "r") as f:
+            report = json.load(f)
+        history.append(report, when=report_timestamp(path, report))
+        if history.latest() != report:
+            raise ValueError(f"Round trip mismatch for {path}; aborting conversion")
+        if remove:
+            os.remove(path)
+        converted += 1
+    return converted
+
+
+def _directory_size(paths: List[str]) -> int:
+    return sum(os.path.getsize(path) for path in paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delta-encoded monitoring report history")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="Import existing report_*.json snapshots")
+    convert.add_argument("source", nargs="?", default="data/monitoring")
+    convert.add_argument("--output", default=DEFAULT_HISTORY_DIR)
+    convert.add_argument("--keyframe-interval", type=int, default=24)
+    convert.add_argument("--remove", action="store_true", help="Delete snapshots once verified")
+
+    show = subparsers.add_parser("show", help="Print the report as of a point in time")
+    show.add_argument("--at", help="ISO timestamp (defaults to the latest run)")
+    show.add_argument("--history", default=DEFAULT_HISTORY_DIR)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "convert":
+        sources = glob.glob(os.path.join(args.source, "report_*.json"))
+        before = _directory_size(sources)
+        history = ReportHistory(args.output, args.keyframe_interval)
+        count = convert_directory(args.source, history, remove=args.remove)
+        after = _directory_size([path for _, _, path in history.entries()])
+        logger.info(f"Converted {count} reports: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
+    else:
+        history = ReportHistory(args.history)
+        report = history.snapshot_at(datetime.fromisoformat(args.at)) if args.at else history.latest()
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
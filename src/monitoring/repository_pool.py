@@ -0,0 +1,75 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+
+def default_max_workers(config):
+    """Worker pool size from MONITOR_MAX_WORKERS or the monitoring config's concurrency.max_workers"""
+    if os.getenv("MONITOR_MAX_WORKERS"):
+        return int(os.getenv("MONITOR_MAX_WORKERS"))
+    return config.get("concurrency", {}).get("max_workers", DEFAULT_MAX_WORKERS)
+
+
+class RepositoryPool:
+    """Runs per-repository GitHub fetches on a bounded worker pool and times each one.
+
+    Results come back in repository order. A failing repository is logged
+    and yields None without affecting the others. Per-repository wall time
+    is kept per phase for latency_summary().
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self.latencies = {}
+        self._lock = threading.Lock()
+
+    def map(self, phase, repositories, fetch):
+        """fetch(repo) for every repository, in order; None where it raised"""
+
+        def timed(repo):
+            start = time.perf_counter()
+            try:
+                return fetch(repo)
+            except Exception as e:
+                logger.error(f"Error in {phase} for {repo.name}: {e}")
+                return None
+            finally:
+                with self._lock:
+                    self.latencies.setdefault(phase, {})[repo.full_name] = time.perf_counter() - start
+
+        if self.max_workers == 1:
+            return [timed(repo) for repo in repositories]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(timed, repositories))
+
+    def latency_summary(self):
+        """Per-phase latency statistics (seconds) and the slowest repositories"""
+        summary = {}
+        for phase, timings in self.latencies.items():
+            ordered = sorted(timings.values())
+            if not ordered:
+                continue
+            summary[phase] = {
+                "repositories": len(ordered),
+                "total": round(sum(ordered), 3),
+                "p50": round(ordered[len(ordered) // 2], 3),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                "max": round(ordered[-1], 3),
+                "slowest": sorted(timings, key=timings.get, reverse=True)[:5],
+            }
+        return summary
+
+    def print_latency_summary(self):
+        for phase, stats in self.latency_summary().items():
+            print(
+                f"{phase}: {stats['repositories']} repositories, p50 {stats['p50']:.2f}s, "
+                f"p95 {stats['p95']:.2f}s, max {stats['max']:.2f}s "
+                f"({self.max_workers} workers, slowest: {', '.join(stats['slowest'])})"
+            )
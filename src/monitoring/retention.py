@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/monitoring.json"
+INDEX_NAME = "index.json"
+
+# Directories the job manages, and which retention setting applies to each.
+# Snapshot directories ("compact") are thinned to one file per day, then per week, before expiring.
+DEFAULT_TARGETS = [
+    {"directory": "alerts", "category": "alerts", "compact": False},
+    {"directory": "status", "category": "metrics", "prefix": "status_", "compact": True},
+    {
+        "directory": "data/monitoring",
+        "category": "metrics",
+        "prefix": "report_",
+        "compact": True,
+        "archive_metrics": True,
+    },
+    {"directory": "reports", "category": "reports", "compact": False, "recursive": True},
+    # Keyframes plus deltas written by ReportHistory; compacted by rewriting the chain
+    {
+        "directory": "data/monitoring/history",
+        "category": "metrics",
+        "compact": True,
+        "history": True,
+        "archive_metrics": True,
+    },
+]
+
+DEFAULT_COMPACTION = {"daily_after_days": 7, "weekly_after_days": 30}
+
+_TIMESTAMP = re.compile(r"(\d{8})(?:_(\d{6}|\d{4}))?")
+
+
+def file_timestamp(name: str) -> Optional[datetime]:
+    """Timestamp embedded in a file name such as report_20241227_061045.json; None if there is none"""
+    match = _TIMESTAMP.search(os.path.basename(name))
+    if not match:
+        return None
+    clock = (match.group(2) or "").ljust(6, "0")
+    try:
+        return datetime.strptime(match.group(1) + clock, "%Y%m%d%H%M%S")
+    except ValueError:
+        return None
+
+
+def _scan(directory: str, recursive: bool = False) -> List[dict]:
+    entries = []
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            when = file_timestamp(name)
+            if name == INDEX_NAME or not name.endswith(".json") or when is None:
+                continue
+            path = os.path.relpath(os.path.join(root, name), directory)
+            entries.append({"name": path, "timestamp": when.isoformat(), "period": "raw", "covers": 1})
+        if not recursive:
+            break
+    return sorted(entries, key=lambda entry: entry["timestamp"])
+
+
+def _write_index(directory: str, entries: List[dict]) -> None:
+    tmp_path = os.path.join(directory, INDEX_NAME + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"updated_at": datetime.now().isoformat(), "files": entries}, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, INDEX_NAME))
+
+
+def load_index(directory: str, recursive: bool = False) -> List[dict]:
+    """Index entries for a directory, building the index from a scan the first time"""
+    try:
+        with open(os.path.join(directory, INDEX_NAME), "r") as f:
+            return json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        if not os.path.isdir(directory):
+            return []
+        entries = _scan(directory, recursive)
+        _write_index(directory, entries)
+        return entries
+
+
+def add_to_index(directory: str, path: str) -> None:
+    """Record a newly written snapshot so readers can find it without listing the directory"""
+    when = file_timestamp(path) or datetime.now()
+    entries = [entry for entry in load_index(directory) if entry["name"] != os.path.relpath(path, directory)]
+    entries.append(
+        {"name": os.path.relpath(path, directory), "timestamp": when.isoformat(), "period": "raw", "covers": 1}
+    )
+    entries.sort(key=lambda entry: entry["timestamp"])
+    _write_index(directory, entries)
+
+
+def snapshot_aggregate(report: dict) -> Dict[str, Dict[str, dict]]:
+    """{repo: {metric: {min, max, mean, sum, count}}} of one monitoring or status snapshot"""
+    from src.monitoring.metrics_store import report_rows, status_rows
+
+    rows = report_rows(report) if "repository_status" in report else status_rows(report)
+    return {
+        repo: {
+            name: {"min": value, "max": value, "mean": value, "sum": value, "count": 1}
+            for name, value in metrics.items()
+            if value is not None
+        }
+        for repo, metrics in rows
+    }
+
+
+def merge_aggregates(aggregates: Iterable[Dict[str, Dict[str, dict]]]) -> Dict[str, Dict[str, dict]]:
+    """Combine per-snapshot (or already merged) aggregates into one"""
+    merged: Dict[str, Dict[str, dict]] = {}
+    for aggregate in aggregates:
+        for repo, metrics in aggregate.items():
+            for name, stats in metrics.items():
+                current = merged.setdefault(repo, {}).get(name)
+                if current is None:
+                    merged[repo][name] = dict(stats)
+                    continue
+                current["min"] = min(current["min"], stats["min"])
+                current["max"] = max(current["max"], stats["max"])
+                current["sum"] += stats["sum"]
+                current["count"] += stats["count"]
+                current["mean"] = current["sum"] / current["count"]
+    return merged
+
+
+def indexed_files(directory: str, prefix: str = "", since: Optional[datetime] = None) -> List[str]:
+    """Names (relative to directory) of indexed files with the given prefix, oldest first"""
+    return [
+        entry["name"]
+        for entry in load_index(directory)
+        if os.path.basename(entry["name"]).startswith(prefix)
+        and (since is None or datetime.fromisoformat(entry["timestamp"]) >= since)
+    ]
+
+
+class RetentionJob:
+    """Applies the `retention` settings of config/monitoring.json to the history directories.
+
+    Files older than their category's retention (in days) are deleted. In
+    snapshot directories, files older than `daily_after_days` are thinned to
+    the latest snapshot of each day and files older than `weekly_after_days`
+    to the latest of each ISO week; the kept file records how many snapshots
+    it stands for and, under `aggregate`, the min/max/mean/sum/count of each
+    repository metric over all of them. Each directory keeps an index.json
+    of what remains, which readers use instead of listing the directory. The
+    ReportHistory directory is thinned the same way by replaying its deltas
+    and rewriting the kept runs as a new keyframe/delta chain. Monitoring
+    reports are copied into the metrics store before they are thinned, so
+    full-resolution metrics stay queryable for the metrics retention period.
+    """
+
+    def __init__(self, config_path: str = DEFAULT_CONFIG_PATH, root: str = ".", dry_run: bool = False):
+        with open(config_path, "r") as f:
+            config = json.load(f)
+        self.root = root
+        self.dry_run = dry_run
+        self.retention = config.get("retention", {})
+        self.compaction = dict(DEFAULT_COMPACTION, **config.get("compaction", {}))
+        self.targets = config.get("retention_targets", DEFAULT_TARGETS)
+        self.keyframe_interval = config.get("storage", {}).get("keyframe_interval", 24)
+        self.metrics_store_path = config.get("metrics", {}).get("store_path")
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        now = now or datetime.now()
+        summary = {}
+        for target in self.targets:
+            directory = os.path.join(self.root, target["directory"])
+            if not os.path.isdir(directory):
+                continue
+            summary[target["directory"]] = self.apply(directory, target, now)
+        self._prune_metrics(now)
+        return summary
+
+    def apply(self, directory: str, target: dict, now: datetime) -> Dict[str, int]:
+        if target.get("history"):
+            return self._apply_history(directory, target, now)
+        days = self.retention.get(target["category"])
+        entries = _scan(directory, target.get("recursive", False))
+        previous = {entry["name"]: entry for entry in load_index(directory, target.get("recursive", False))}
+        for entry in entries:
+            if entry["name"] in previous:
+                entry.update({k: v for k, v in previous[entry["name"]].items() if k != "timestamp"})
+        # Files without a timestamp in their name are known only through add_to_index
+        scanned = {entry["name"] for entry in entries}
+        entries += [
+            entry
+            for name, entry in previous.items()
+            if name not in scanned and os.path.exists(os.path.join(directory, name))
+        ]
+        entries.sort(key=lambda entry: entry["timestamp"])
+
+        cutoff = now - timedelta(days=days) if days is not None else None
+        expired = [entry for entry in entries if cutoff and datetime.fromisoformat(entry["timestamp"]) < cutoff]
+        expired_names = {entry["name"] for entry in expired}
+        remaining = [entry for entry in entries if entry["name"] not in expired_names]
+
+        compacted = []
+        if target.get("compact"):
+            prefix = target.get("prefix", "")
+            snapshots = [entry for entry in remaining if os.path.basename(entry["name"]).startswith(prefix)]
+            others = [entry for entry in remaining if not os.path.basename(entry["name"]).startswith(prefix)]
+            snapshots, compacted = self._compact(snapshots, now, lambda entry: self._read(directory, entry))
+            remaining = sorted(snapshots + others, key=lambda entry: entry["timestamp"])
+
+        if target.get("archive_metrics"):
+            self._archive_metrics(directory, compacted)
+
+        for entry in expired + compacted:
+            if not self.dry_run:
+                os.remove(os.path.join(directory, entry["name"]))
+        if not self.dry_run:
+            _write_index(directory, remaining)
+
+        return {"kept": len(remaining), "compacted": len(compacted), "deleted": len(expired)}
+
+    def _buckets(self, entries: List[dict], now: datetime) -> Tuple[List[dict], Dict[tuple, List[dict]]]:
+        """Entries newer than the daily threshold, and the older ones grouped per day or ISO week"""
+        daily_before = now - timedelta(days=self.compaction["daily_after_days"])
+        weekly_before = now - timedelta(days=self.compaction["weekly_after_days"])
+
+        recent = []
+        buckets: Dict[tuple, List[dict]] = {}
+        for entry in entries:
+            when = datetime.fromisoformat(entry["timestamp"])
+            if when >= daily_before:
+                recent.append(entry)
+            elif when >= weekly_before:
+                buckets.setdefault(("daily", when.date()), []).append(entry)
+            else:
+                buckets.setdefault(("weekly", tuple(when.isocalendar()[:2])), []).append(entry)
+        for group in buckets.values():
+            group.sort(key=lambda entry: entry["timestamp"])
+        return recent, buckets
+
+    def _compact(self, entries: List[dict], now: datetime, load: Callable[[dict], Optional[dict]]):
+        """Keep the latest snapshot per day (then per week) past the compaction thresholds.
+
+        The kept entry aggregates the metrics of every snapshot of its bucket;
+        load(entry) returns the snapshot of an entry that has no aggregate yet.
+        """
+        kept, buckets = self._buckets(entries, now)
+        dropped = []
+        for (period, _), group in buckets.items():
+            latest = dict(group[-1], period=period, covers=sum(entry.get("covers", 1) for entry in group))
+            if len(group) > 1:
+                latest["aggregate"] = merge_aggregates(self._aggregate(entry, load) for entry in group)
+            kept.append(latest)
+            dropped.extend(group[:-1])
+        return kept, dropped
+
+    @staticmethod
+    def _aggregate(entry: dict, load: Callable[[dict], Optional[dict]]) -> Dict[str, Dict[str, dict]]:
+        if "aggregate" in entry:
+            return entry["aggregate"]
+        snapshot = load(entry)
+        return snapshot_aggregate(snapshot) if snapshot else {}
+
+    @staticmethod
+    def _read(directory: str, entry: dict) -> Optional[dict]:
+        try:
+            with open(os.path.join(directory, entry["name"]), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable snapshot {entry['name']} in {directory}: {e}")
+            return None
+
+    def _apply_history(self, directory: str, target: dict, now: datetime) -> Dict[str, int]:
+        """Expire and compact a ReportHistory by rewriting the runs that remain as a new chain"""
+        from src.monitoring.report_history import ReportHistory
+
+        history = ReportHistory(directory, self.keyframe_interval)
+        # Runs are renamed when rewritten, so earlier compaction results are matched by timestamp
+        previous = {entry["timestamp"]: entry for entry in load_index(directory)}
+        runs = []
+        for when, _, path in history.entries():
+            run = {"name": os.path.basename(path), "timestamp": when.isoformat(), "period": "raw", "covers": 1}
+            run.update({k: v for k, v in previous.get(run["timestamp"], {}).items() if k != "name"})
+            runs.append(run)
+        by_time = {run["timestamp"]: run for run in runs}
+
+        days = self.retention.get(target["category"])
+        cutoff = (now - timedelta(days=days)).isoformat() if days is not None else None
+        expired = [run for run in runs if cutoff and run["timestamp"] < cutoff]
+        recent, buckets = self._buckets(runs[len(expired) :], now)
+
+        kept = {run["timestamp"]: run for run in recent}
+        bucket_of, dropped = {}, []
+        for (period, _), group in buckets.items():
+            for run in group:
+                bucket_of[run["timestamp"]] = group
+            kept[group[-1]["timestamp"]] = dict(
+                group[-1], period=period, covers=sum(run.get("covers", 1) for run in group)
+            )
+            dropped.extend(group[:-1])
+
+        summary = {"kept": len(kept), "compacted": len(dropped), "deleted": len(expired)}
+        if self.dry_run or not (expired or dropped):
+            return summary
+
+        store = None
+        if target.get("archive_metrics") and self.metrics_store_path and dropped:
+            from src.monitoring.metrics_store import MetricsStore
+
+            store = MetricsStore(os.path.join(self.root, self.metrics_store_path))
+        dropped_times = {run["timestamp"] for run in dropped}
+
+        staging = directory.rstrip(os.sep) + ".compacting"
+        shutil.rmtree(staging, ignore_errors=True)
+        rewritten = ReportHistory(staging, self.keyframe_interval)
+        aggregates: Dict[str, list] = {}
+        # Snapshots are replayed one at a time, so only the kept runs are held in the new chain
+        for when, report in history.iter_snapshots():
+            timestamp = when.isoformat()
+            if timestamp in dropped_times and store is not None:
+                store.record_report(report, when)
+            group = bucket_of.get(timestamp)
+            if group is not None and len(group) > 1:
+                run = by_time[timestamp]
+                aggregates.setdefault(group[-1]["timestamp"], []).append(
+                    run["aggregate"] if "aggregate" in run else snapshot_aggregate(report)
+                )
+            if timestamp in kept:
+                rewritten.append(report, when)
+        if store is not None:
+            store.save()
+
+        for timestamp, parts in aggregates.items():
+            kept[timestamp]["aggregate"] = merge_aggregates(parts)
+        index = [dict(kept[when.isoformat()], name=os.path.basename(path)) for when, _, path in rewritten.entries()]
+
+        backup = directory.rstrip(os.sep) + ".old"
+        shutil.rmtree(backup, ignore_errors=True)
+        os.replace(directory, backup)
+        os.replace(staging, directory)
+        shutil.rmtree(backup)
+        _write_index(directory, index)
+        return summary
+
+    def _archive_metrics(self, directory: str, entries: List[dict]) -> None:
+        if not entries or not self.metrics_store_path or self.dry_run:
+            return
+        from src.monitoring.metrics_store import MetricsStore
+
+        store = MetricsStore(os.path.join(self.root, self.metrics_store_path))
+        for entry in entries:
+            with open(os.path.join(directory, entry["name"]), "r") as f:
+                store.record_report(json.load(f), datetime.fromisoformat(entry["timestamp"]))
+        store.save()
+
+    def _prune_metrics(self, now: datetime) -> None:
+        days = self.retention.get("metrics")
+        path = os.path.join(self.root, self.metrics_store_path) if self.metrics_store_path else None
+        if days is None or not path or not os.path.exists(path) or self.dry_run:
+            return
+        from src.monitoring.metrics_store import MetricsStore
+
+        store = MetricsStore(path)
+        if store.prune(now - timedelta(days=days)):
+            store.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact and expire monitoring history per config retention")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without deleting")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    job = RetentionJob(args.config, dry_run=args.dry_run)
+    for directory, counts in job.run().items():
+        logger.info(f"{directory}: kept {counts['kept']}, compacted {counts['compacted']}, deleted {counts['deleted']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from src.utils.repository_counts import RepositoryCountsFetcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/monitoring.json"
+DEFAULT_STATE_PATH = "data/scheduler_state.json"
+
+TIERS = ("basic", "detailed", "deep")
+DEFAULT_INTERVALS = {"basic": 300, "detailed": 3600, "deep": 86400}
+
+
+@dataclass
+class ScheduledCheck:
+    name: str
+    tier: str
+    func: Callable
+    # func(repos) receives only the repositories that need the check; otherwise func() runs once
+    per_repository: bool = False
+    # Skip (or narrow to) repositories whose pushed_at has not moved since this check last ran
+    skip_unchanged: bool = False
+
+
+class CheckScheduler:
+    """Runs registered checks at the cadence of their tier in config/monitoring.json.
+
+    Cheap checks belong in the "basic" tier; expensive ones (workflow logs,
+    content trees, model training) in "detailed" or "deep". Last-run times and
+    the pushed_at each check last saw per repository are persisted to a state
+    file, so restarts keep the cadence. pushed_at comes from the batched
+    GraphQL counts query, one request per 25 repositories.
+    """
+
+    def __init__(
+        self,
+        intervals: Optional[Dict[str, int]] = None,
+        state_path: str = DEFAULT_STATE_PATH,
+        counts_fetcher: Optional[RepositoryCountsFetcher] = None,
+        repositories: Optional[List[str]] = None,
+    ):
+        self.intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+        self.state_path = state_path
+        self.counts_fetcher = counts_fetcher or RepositoryCountsFetcher()
+        self.repositories = repositories
+        self.checks: Dict[str, ScheduledCheck] = {}
+        self.state = self._load_state()
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH, **kwargs) -> "CheckScheduler":
+        with open(config_path, "r") as f:
+            config = json.load(f)
+        kwargs.setdefault("state_path", config.get("scheduler", {}).get("state_path", DEFAULT_STATE_PATH))
+        return cls(config.get("check_intervals", {}), **kwargs)
+
+    def register(
+        self, name: str, tier: str, func: Callable, per_repository: bool = False, skip_unchanged: bool = False
+    ) -> None:
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier {tier!r}; expected one of {TIERS}")
+        self.checks[name] = ScheduledCheck(name, tier, func, per_repository, skip_unchanged)
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault("last_run", {})
+        state.setdefault("pushed_at", {})
+        return state
+
+    def _save_state(self) -> None:
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def list_repositories(self) -> List[str]:
+        if self.repositories is None:
+            from src.utils.github_client import get_github
+
+            self.repositories = [repo.full_name for repo in get_github().get_user().get_repos()]
+        return self.repositories
+
+    def due(self, now: Optional[datetime] = None) -> List[ScheduledCheck]:
+        now = now or datetime.now()
+        due = []
+        for check in self.checks.values():
+            last_run = self.state["last_run"].get(check.name)
+            interval = timedelta(seconds=self.intervals[check.tier])
+            if last_run is None or datetime.fromisoformat(last_run) + interval <= now:
+                due.append(check)
+        return due
+
+    def next_run(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """When the earliest registered check becomes due"""
+        now = now or datetime.now()
+        times = []
+        for check in self.checks.values():
+            last_run = self.state["last_run"].get(check.name)
+            if last_run is None:
+                return now
+            times.append(datetime.fromisoformat(last_run) + timedelta(seconds=self.intervals[check.tier]))
+        return min(times) if times else None
+
+    def run_pending(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """Run every due check once; returns {check name: "ran" | "skipped" | "failed"}"""
+        now = now or datetime.now()
+        due = self.due(now)
+        if not due:
+            return {}
+
+        pushed_at = {}
+        if any(check.skip_unchanged for check in due):
+            counts = self.counts_fetcher.fetch(self.list_repositories(), refresh=True)
+            pushed_at = {
+                name: c["pushed_at"].isoformat() if c and c.get("pushed_at") else None for name, c in counts.items()
+            }
+
+        results = {}
+        for check in due:
+            results[check.name] = self._run_check(check, pushed_at, now)
+        self._save_state()
+        return results
+
+    def _run_check(self, check: ScheduledCheck, pushed_at: Dict[str, Optional[str]], now: datetime) -> str:
+        seen = self.state["pushed_at"].setdefault(check.name, {})
+        repos = None
+        if check.skip_unchanged:
+            # Repositories GraphQL could not resolve have no pushed_at and are always treated as changed
+            repos = [name for name, pushed in pushed_at.items() if pushed is None or seen.get(name) != pushed]
+
+        self.state["last_run"][check.name] = now.isoformat()
+        if repos is not None and not repos:
+            logger.info(f"{check.name}: no repository pushed since the last run, skipping")
+            return "skipped"
+
+        start = time.perf_counter()
+        try:
+            if check.per_repository:
+                check.func(repos if repos is not None else self.list_repositories())
+            else:
+                check.func()
+        except Exception as e:
+            logger.error(f"{check.name} ({check.tier}) failed: {e}")
+            return "failed"
+
+        for name in repos or []:
+            seen[name] = pushed_at[name]
+        logger.info(f"{check.name} ({check.tier}) finished in {time.perf_counter() - start:.1f}s")
+        return "ran"
+
+    def run_forever(self, poll_seconds: float = 30) -> None:
+        while True:
+            self.run_pending()
+            wait = (self.next_run() - datetime.now()).total_seconds() if self.checks else poll_seconds
+            time.sleep(min(max(wait, 1), poll_seconds))
+
+
+def _check_alerts():
+    from src.monitoring.alert_manager import AlertManager
+
+    AlertManager().check_alerts()
+
+
+def _update_status():
+    from src.workflows.status_updater import StatusUpdater
+
+    StatusUpdater().update_project_status()
+
+
+def _monitoring_report(repos):
+    from src.monitoring.monitor import RepositoryMonitor
+
+    # Repositories left out keep their entries from the previous report
+    RepositoryMonitor(os.getenv("GHUB_TOKEN"), repositories=repos).generate_comprehensive_report()
+
+
+def _project_health():
+    from src.project_risk_predictor import ProjectRiskPredictor
+
+    ProjectRiskPredictor(os.getenv("GHUB_TOKEN")).generate_project_health_report()
+
+
+def _apply_retention():
+    from src.monitoring.retention import RetentionJob
+
+    RetentionJob().run()
+
+
+def build_default_scheduler(config_path: str = DEFAULT_CONFIG_PATH, **kwargs) -> CheckScheduler:
+    """Scheduler with the repository's standard checks, grouped by cost"""
+    scheduler = CheckScheduler.from_config(config_path, **kwargs)
+    # Count-based checks go through the batched GraphQL query and stay cheap
+    scheduler.register("alerts", "basic", _check_alerts)
+    scheduler.register("status", "basic", _update_status)
+    # Workflow runs only change when something was pushed
+    scheduler.register("monitoring_report", "detailed", _monitoring_report, per_repository=True, skip_unchanged=True)
+    # Retrains the risk model once enough issues closed since the last fit
+    scheduler.register("project_health", "deep", _project_health)
+    scheduler.register("retention", "deep", _apply_retention)
+    return scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run monitoring checks at their configured cadence")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--once", action="store_true", help="Run due checks once and exit")
+    parser.add_argument(
+        "--repos",
+        nargs="*",
+        help="Limit pushed_at tracking and per-repository checks to these owner/name repositories",
+    )
+    parser.add_argument("--poll", type=float, default=30, help="Maximum seconds between due-check polls")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    scheduler = build_default_scheduler(args.config, repositories=args.repos or None)
+
+    if args.once:
+        for name, status in scheduler.run_pending().items():
+            print(f"{name}: {status}")
+    else:
+        scheduler.run_forever(args.poll)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,13 @@ import os
 from datetime import datetime
 
 import requests
-from github import Github
+
+from src.utils.github_client import get_github
 
 
 class ProjectNotificationSystem:
     def __init__(self, tokens):
-        self.gh = Github(tokens["github"])
+        self.gh = get_github(tokens["github"])
         self.slack_token = tokens["slack"]
         self.repositories = [
             "ZubeidHendricks/project-orchestrator",
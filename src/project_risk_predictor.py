@@ -1,25 +1,36 @@
 #!/usr/bin/env python3
 import json
+import logging
 import os
 from datetime import datetime
 
 import numpy as np
-from github import Github
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 
+from src.database.issue_mirror import IssueMirror
+from src.database.risk_model_store import RiskModelStore
+from src.utils.github_client import get_github
+
+logger = logging.getLogger(__name__)
+
 
 class ProjectRiskPredictor:
     def __init__(self, token):
-        self.gh = Github(token)
+        self.gh = get_github(token)
         self.project_repo = self.gh.get_repo("ZubeidHendricks/project-orchestrator")
+        self.issue_mirror = IssueMirror()
+        self.risk_store = RiskModelStore.from_config()
 
-    def extract_project_features(self):
-        """Extract comprehensive project risk features"""
+    def extract_project_features(self, issues=None):
+        """Extract comprehensive project risk features of closed issues, all mirrored ones by default"""
 # features
 # risk_labels
 
-        for issue in self.project_repo.get_issues(state="closed"):
+        if issues is None:
+            self.issue_mirror.sync(self.project_repo)
+            issues = self.issue_mirror.issues(self.project_repo.full_name, state="closed")
+        for issue in issues:
 # feature_vector
                 len(issue.labels),
                 issue.comments,
@@ -41,23 +52,51 @@ class ProjectRiskPredictor:
 
         return features, risk_labels
 
-    def predict_project_risks(self):
-        """Predict risks for ongoing projects"""
-        features, labels = self.extract_project_features()
+    def update_risk_model(self, retrain=False):
+        """Add newly closed issues to the stored features and retrain once enough have arrived.
+
+        Returns the fitted model, or None while there is nothing to train on.
+        """
+        self.issue_mirror.sync(self.project_repo)
+        since = None if retrain else self.risk_store.fetch_since()
+        # Closed issues relabelled or commented on since also change their features
+        issues = self.issue_mirror.issues(self.project_repo.full_name, state="closed", updated_since=since)
+        if issues:
+            features, labels = self.extract_project_features(issues)
+            added = self.risk_store.add(
+                [issue.number for issue in issues], [issue.updated_at for issue in issues], features, labels
+            )
+            if added:
+                logger.info(f"Added {added} closed issues to the risk features ({len(self.risk_store)} total)")
+                self.risk_store.save()
+
+        if not (retrain or self.risk_store.needs_training()) or len(self.risk_store) < 2:
+            return self.risk_store.model
 
         # Prepare data
-# X
-# y
+        X = self.risk_store.features
+        y = self.risk_store.labels
 
         # Split and train risk classification model
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
 
         risk_model = RandomForestClassifier(n_estimators=100)
         risk_model.fit(X_train, y_train)
-
-        # Predict risks for open issues
-# open_issues_risks
-        for issue in self.project_repo.get_issues(state="open"):
+        accuracy = risk_model.score(X_test, y_test)
+        self.risk_store.save_model(risk_model, accuracy=accuracy)
+        logger.info(f"Retrained risk model on {len(y)} closed issues (holdout accuracy {accuracy:.2f})")
+        return risk_model
+
+    def predict_project_risks(self, retrain=False):
+        """Predict risks for ongoing projects with the stored model"""
+        risk_model = self.update_risk_model(retrain)
+        if risk_model is None:
+            return []
+
+        # Score every open issue in one batch
+        open_issues = self.issue_mirror.issues(self.project_repo.full_name, state="open")
+        open_features = []
+        for issue in open_issues:
 # issue_features
                 len(issue.labels),
                 issue.comments,
@@ -65,13 +104,19 @@ class ProjectRiskPredictor:
                 (datetime.now() - issue.created_at).days,
                 1 if any("bug" in label.name.lower() for label in issue.labels) else 0,
             ]
+            open_features.append(issue_features)
+
+# open_issues_risks
+        if not open_issues:
+            return open_issues_risks
+        predictions = risk_model.predict(np.array(open_features, dtype=np.float64))
 
-# predicted_risk
+        for issue, predicted_risk in zip(open_issues, predictions):
             open_issues_risks.append(
                 {
                     "issue_number": issue.number,
                     "title": issue.title,
-                    "predicted_risk": predicted_risk,
+                    "predicted_risk": str(predicted_risk),
                 }
             )
 
@@ -0,0 +1,173 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.monitoring.retention import file_timestamp, indexed_files
+
+WEEK_SECONDS = 7 * 86400
+
+METRICS = ("velocity", "completion_rate", "bug_rate")
+
+
+def load_status_history(directory: str = "status", since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """StatusUpdater snapshots since a date as {"timestamp", "repositories"} dicts, oldest first"""
+    reports = []
+    for name in indexed_files(directory, prefix="status_", since=since):
+        when = file_timestamp(name)
+        with open(os.path.join(directory, name), "r") as f:
+            report = json.load(f)
+        if "timestamp" not in report:
+            report = {"timestamp": when.isoformat() if when else None, "repositories": report}
+        reports.append(report)
+    return reports
+
+
+def _columns(reports: List[Dict[str, Any]]):
+    """Flatten reports into parallel arrays: repo code, epoch seconds, open issues, open PRs, commits"""
+    repos: Dict[str, int] = {}
+    rows = []
+    for report in reports:
+        if not report.get("timestamp"):
+            continue
+        when = datetime.fromisoformat(report["timestamp"]).timestamp()
+        for repo, status in report.get("repositories", {}).items():
+            if not isinstance(status, dict):
+                continue
+            code = repos.setdefault(repo, len(repos))
+            values = [status.get(key) for key in ("open_issues", "open_prs", "last_commit")]
+            rows.append([code, when] + [np.nan if value is None else value for value in values])
+    table = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    return list(repos), table[:, 0].astype(np.int64), table[:, 1], table[:, 2], table[:, 3], table[:, 4]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+
+def _round(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else round(value, 3)
+
+
+def compute_weekly_metrics(reports: List[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Velocity, completion rate and bug rate per repository for this week and the week before.
+
+    Status snapshots only carry open counts, so work is estimated from the
+    changes between consecutive snapshots of a repository:
+
+    - velocity: issues and pull requests closed (sum of decreases in open counts)
+    - completion_rate: closed / (open at the start of the week + opened during it)
+    - bug_rate: issues opened per commit
+
+    Each change is attributed to the week of the later snapshot. Pass at
+    least 14 days of reports to get week-over-week deltas.
+    """
+    now = now or datetime.now()
+    names, repo, when, issues, prs, commits = _columns(reports)
+    # 0 = the 7 days up to now, 1 = the 7 days before; older snapshots only provide starting values
+    week = np.floor((now.timestamp() - when) / WEEK_SECONDS).astype(np.int64)
+    order = np.lexsort((when, repo))
+    repo, week, issues, prs, commits = repo[order], week[order], issues[order], prs[order], commits[order]
+
+    same_repo = np.append(False, repo[1:] == repo[:-1])
+    open_items = np.nan_to_num(issues) + np.nan_to_num(prs)
+    item_change = np.where(same_repo, open_items - np.roll(open_items, 1), 0.0)
+    issue_change = np.where(same_repo, np.nan_to_num(issues - np.roll(issues, 1)), 0.0)
+    commit_change = np.where(same_repo, np.nan_to_num(commits - np.roll(commits, 1)), 0.0)
+    # Value before each snapshot: the previous snapshot of the repository, or its own value if it is the first
+    open_before = np.where(same_repo, np.roll(open_items, 1), open_items)
+
+    result: Dict[str, Any] = {"period": {"start": (now - timedelta(days=7)).isoformat(), "end": now.isoformat()}}
+    weeks = {}
+    for offset, label in ((0, "current"), (1, "previous")):
+        selected = (week == offset) & (week >= 0)
+        n = len(names)
+        closed = np.bincount(repo[selected], np.maximum(-item_change[selected], 0), minlength=n)
+        opened = np.bincount(repo[selected], np.maximum(item_change[selected], 0), minlength=n)
+        issues_opened = np.bincount(repo[selected], np.maximum(issue_change[selected], 0), minlength=n)
+        commit_count = np.bincount(repo[selected], np.maximum(commit_change[selected], 0), minlength=n)
+
+        # Open items before the first snapshot of the week, per repository
+        first = np.flatnonzero(selected & ~np.append(False, selected[:-1] & same_repo[1:]))
+        start_open = np.zeros(n)
+        start_open[repo[first]] = open_before[first]
+        present = np.bincount(repo[selected], minlength=n) > 0
+
+        weeks[label] = {
+            "present": present,
+            "velocity": closed,
+            "completion_rate": _ratio(closed, start_open + opened),
+            "bug_rate": _ratio(issues_opened, commit_count),
+            "commits": commit_count,
+            "issues_opened": issues_opened,
+            "opened": opened,
+            "closed": closed,
+            "start_open": start_open,
+        }
+
+    current, previous = weeks["current"], weeks["previous"]
+    totals = {}
+    for label, data in weeks.items():
+        closed, opened, start_open = data["closed"].sum(), data["opened"].sum(), data["start_open"].sum()
+        totals[label] = {
+            "velocity": _round(closed),
+            "completion_rate": _round(_ratio(np.array([closed]), np.array([start_open + opened]))[0]),
+            "bug_rate": _round(_ratio(np.array([data["issues_opened"].sum()]), np.array([data["commits"].sum()]))[0]),
+            "commits": _round(data["commits"].sum()),
+        }
+
+    result["metrics"] = {name: totals["current"][name] for name in METRICS}
+    result["previous"] = {name: totals["previous"][name] for name in METRICS}
+    result["deltas"] = {
+        name: (
+            None
+            if totals["current"][name] is None or totals["previous"][name] is None
+            else round(totals["current"][name] - totals["previous"][name], 3)
+        )
+        for name in METRICS
+    }
+
+    repositories = {}
+    for code in np.flatnonzero(current["present"]):
+        entry = {name: _round(current[name][code]) for name in METRICS + ("commits",)}
+        entry["deltas"] = {
+            name: (
+                None
+                if not previous["present"][code] or np.isnan(current[name][code]) or np.isnan(previous[name][code])
+                else round(float(current[name][code] - previous[name][code]), 3)
+            )
+            for name in METRICS
+        }
+        repositories[names[code]] = entry
+    result["repositories"] = repositories
+    return result
+
+
+def format_for_prompt(metrics: Dict[str, Any], top: int = 15) -> str:
+    """Compact text of the weekly numbers: totals plus the repositories that moved most"""
+
+    def fmt(value) -> str:
+        return "n/a" if value is None else f"{value:g}"
+
+    lines = [
+        "Totals (this week / change vs last week): "
+        + ", ".join(f"{name} {fmt(metrics['metrics'][name])} / {fmt(metrics['deltas'][name])}" for name in METRICS)
+    ]
+    ranked = sorted(
+        metrics["repositories"].items(),
+        key=lambda item: -sum(abs(delta) for delta in item[1]["deltas"].values() if delta is not None)
+        - (item[1]["velocity"] or 0),
+    )
+    lines.append("repo: velocity, completion_rate, bug_rate, commits (velocity change)")
+    for name, entry in ranked[:top]:
+        lines.append(
+            f"{name}: {fmt(entry['velocity'])}, {fmt(entry['completion_rate'])}, {fmt(entry['bug_rate'])}, "
+            f"{fmt(entry['commits'])} ({fmt(entry['deltas']['velocity'])})"
+        )
+    if len(ranked) > top:
+        lines.append(f"... {len(ranked) - top} more repositories with smaller changes")
+    return "\n".join(lines)
@@ -3,12 +3,13 @@ import os
 from datetime import datetime
 
 from cryptography.fernet import Fernet
-from github import Github
+
+from src.utils.github_client import get_github
 
 
 class SecurityManager:
     def __init__(self, token):
-        self.gh = Github(token)
+        self.gh = get_github(token)
         self.project_repo = self.gh.get_repo("ZubeidHendricks/project-orchestrator")
         self.encryption_key = Fernet.generate_key()
         self.cipher_suite = Fernet(self.encryption_key)
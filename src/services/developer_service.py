@@ -1,11 +1,12 @@
 from typing import List, Optional
 
 from src.models.project_models import Developer, DeveloperExpertise
+from src.utils.github_client import get_github
 
 
 class DeveloperService:
     def __init__(self, github_token: str):
-        self.github = Github(github_token)
+        self.github = get_github(github_token)
 
     async def create_developer(self, dev_data: dict) -> Developer:
         """Create a new developer profile with validation"""
@@ -1,14 +1,15 @@
 from datetime import datetime
 from typing import List, Optional
 
-from github import Github
-
 from src.models.project_models import Project, ProjectMetrics
+from src.utils.github_client import get_github
+from src.utils.repository_counts import RepositoryCountsFetcher
 
 
 class ProjectService:
     def __init__(self, github_token: str):
-        self.github = Github(github_token)
+        self.github = get_github(github_token)
+        self.counts_fetcher = RepositoryCountsFetcher(github_token)
 
     async def create_project(self, project_data: dict) -> Project:
         """Create a new project with validation"""
@@ -22,13 +23,21 @@ class ProjectService:
     async def update_project_metrics(self, project: Project) -> ProjectMetrics:
         """Update project metrics from GitHub"""
         try:
+            counts = self.counts_fetcher.get(self._repository_full_name(project.repository_url))
+            if counts:
+                metrics = ProjectMetrics(
+                    open_issues=counts["open_issues"],
+                    completed_issues=counts["closed_issues"],
+                    last_deployment=counts["last_deployment"],
+                )
+            else:
 # repo
 
 # metrics
-                open_issues=repo.get_issues(state="open").totalCount,
-                completed_issues=repo.get_issues(state="closed").totalCount,
+                    open_issues=repo.get_issues(state="open").totalCount,
+                    completed_issues=repo.get_issues(state="closed").totalCount,
 # last_deployment
-            )
+                )
 
             # Update project with new metrics
             project.metrics = metrics
@@ -38,6 +47,17 @@ class ProjectService:
         except Exception as e:
             raise ValueError(f"Failed to update metrics: {str(e)}")
 
+    async def update_projects_metrics(self, projects: List[Project]) -> List[ProjectMetrics]:
+        """Update metrics for many projects with one batched GitHub query"""
+        self.counts_fetcher.fetch(self._repository_full_name(project.repository_url) for project in projects)
+        return [await self.update_project_metrics(project) for project in projects]
+
+    @staticmethod
+    def _repository_full_name(repository_url: str) -> str:
+        """Turn https://github.com/owner/name(.git) into owner/name"""
+        path = repository_url.rstrip("/").split("github.com/")[-1]
+        return path[: -len(".git")] if path.endswith(".git") else path
+
     def _validate_team_members(self, team_members: List[str]) -> None:
         """Validate that team members exist"""
         for member in team_members:
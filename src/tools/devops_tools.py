@@ -1,11 +1,9 @@
-import os
-
-from github import Github
+from src.utils.github_client import get_github
 
 
 class DevOpsTools:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
 
     def infrastructure_check(self, repo_name):
         """Check infrastructure configuration and status"""
@@ -1,12 +1,11 @@
-import os
 from datetime import datetime, timedelta
 
-from github import Github
+from src.utils.github_client import get_github
 
 
 class TechnicalTools:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
 
     def code_review(self, pull_request_url):
         """Analyze a pull request for code quality and issues"""
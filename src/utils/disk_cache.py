@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class DiskCache:
+    """Persistent key/value store backed by SQLite with size-bounded LRU eviction"""
+
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB, meta TEXT, size INTEGER, "
+            "stored_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Tuple[Any, Optional[str], float]]:
+        """Return (value, meta, stored_at) for a key and mark it as recently used"""
+        with self._lock:
+            row = self._conn.execute("SELECT value, meta, stored_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0], row[1], row[2]
+
+    def set(self, key: str, value: Any, meta: Optional[str] = None) -> None:
+        """Store a value, evicting least recently used entries if over budget"""
+        size = len(value) + len(meta or "")
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if previous:
+                self._total_bytes -= previous[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, meta, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, meta, size, now, now),
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def update_meta(self, key: str, meta: str) -> None:
+        """Replace the metadata of an entry and reset its stored_at timestamp"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET meta = ?, stored_at = ?, accessed_at = ? WHERE key = ?",
+                (meta, time.time(), time.time(), key),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= row[0]
+                self._conn.commit()
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Delete every entry whose key starts with prefix"""
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE key LIKE ? ESCAPE '\\'", (pattern,)
+            ).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE key LIKE ? ESCAPE '\\'", (pattern,))
+            self._total_bytes -= row[1]
+            self._conn.commit()
+            return row[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store fits in max_bytes"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC LIMIT 32").fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
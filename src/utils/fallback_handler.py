@@ -4,6 +4,10 @@ from typing import Any, Optional
 
 from langchain.llms import Anthropic, OpenAI
 
+from src.utils.llm_cache import install_llm_cache
+from src.utils.llm_metrics import metrics_callback
+from src.utils.llm_router import LLMRouter, tcp_check
+
 
 class FallbackHandler:
     def __init__(self):
@@ -13,10 +17,49 @@ class FallbackHandler:
             "openai": self._setup_openai,
             "anthropic": self._setup_anthropic,
         }
+        # Cheap liveness checks for router probes; llama is live once its model can be set up
+        self.llm_checks = {
+            "openai": tcp_check("api.openai.com"),
+            "anthropic": tcp_check("api.anthropic.com"),
+        }
+
+    def get_router(self, primary_llm: Optional[str] = None, primary: Any = None) -> Optional[LLMRouter]:
+        """Router over the configured LLM options with primary_llm first, or None if routing is disabled.
+
+        An already created primary client is used as-is instead of setting it up again.
+        """
+        factories = dict(self.llm_options)
+        if primary is not None:
+            factories[primary_llm] = lambda: primary
+        return LLMRouter.from_config(factories, primary=primary_llm, checks=self.llm_checks)
+
+    def get_routed_llm(self, primary_llm: str, primary: Any = None) -> Optional[Any]:
+        """LLM that sends every call through the router, so runtime failures of the primary fail over.
+
+        Returns `primary` unchanged if routing is disabled.
+        """
+        router = self.get_router(primary_llm, primary)
+        if router is None:
+            return primary
+        router.start()
+        return router.as_llm()
 
     def get_fallback_llm(self, primary_llm: str) -> Optional[Any]:
         """Get fallback LLM if primary fails"""
         self.logger.info(f"Primary LLM {primary_llm} failed, attempting fallback...")
+        install_llm_cache()
+
+        router = self.get_router(primary_llm)
+        if router is not None:
+            # Check all options in parallel; the primary stays routed behind its own breaker and
+            # takes calls again once it recovers
+            healthy = [name for name, ok in router.probe().items() if ok]
+            if healthy:
+                self.logger.info(f"Routing fallback LLM calls across {', '.join(router.healthy())}")
+                router.start()
+                return router.as_llm()
+            self.logger.error("All fallback options failed")
+            return None
 
         # Try each LLM option in order
         for llm_name, setup_func in self.llm_options.items():
@@ -35,7 +78,7 @@ class FallbackHandler:
     def _setup_llama(self):
         """Set up Llama model"""
         try:
-            from langchain.llms import LlamaCpp
+            from src.utils.model_pool import get_llm
 
 # model_path
 
@@ -43,7 +86,8 @@ class FallbackHandler:
                 self.logger.error(f"Llama model not found at {model_path}")
                 return None
 
-            return LlamaCpp(model_path=model_path, temperature=0.7, max_tokens=2000)
+            # Reuses the weights if an agent already loaded this model
+            return get_llm(model_path=model_path, temperature=0.7, max_tokens=2000)
         except Exception as e:
             self.logger.error(f"Failed to initialize Llama: {str(e)}")
             return None
@@ -56,7 +100,7 @@ class FallbackHandler:
             return None
 
         try:
-            return OpenAI(openai_api_key=api_key, temperature=0.7)
+            return OpenAI(openai_api_key=api_key, temperature=0.7, callbacks=[metrics_callback()])
         except Exception as e:
             self.logger.error(f"Failed to initialize OpenAI: {str(e)}")
             return None
@@ -69,7 +113,7 @@ class FallbackHandler:
             return None
 
         try:
-            return Anthropic(anthropic_api_key=api_key, temperature=0.7)
+            return Anthropic(anthropic_api_key=api_key, temperature=0.7, callbacks=[metrics_callback()])
         except Exception as e:
             self.logger.error(f"Failed to initialize Anthropic: {str(e)}")
             return None
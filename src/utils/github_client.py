@@ -0,0 +1,151 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from github import Github
+from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass, Requester
+
+from src.utils.response_cache import CachedResponse, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_clients: Dict[Any, Github] = {}
+_sessions: Dict[Any, requests.Session] = {}
+_response_cache: Optional[ResponseCache] = None
+_installed = False
+_local = threading.local()
+
+
+def _shared_session(protocol, host, port, retry, pool_size) -> requests.Session:
+    """Reuse one keep-alive session per host; injected connection classes are rebuilt per request"""
+    key = (protocol, host, port)
+    with _lock:
+        if key not in _sessions:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=requests.adapters.DEFAULT_RETRIES if retry is None else retry,
+                pool_connections=pool_size or requests.adapters.DEFAULT_POOLSIZE,
+                pool_maxsize=pool_size or requests.adapters.DEFAULT_POOLSIZE,
+            )
+            session.mount(f"{protocol}://", adapter)
+            _sessions[key] = session
+        return _sessions[key]
+
+
+class CachingHTTPSConnection(HTTPSRequestsConnectionClass):
+    """PyGithub connection class that answers GETs from the shared ResponseCache"""
+
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self.host = host
+        self.port = port if port else 443
+        self.protocol = "https"
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.session = _shared_session(self.protocol, host, self.port, retry, pool_size)
+
+    def getresponse(self):
+        cache = _response_cache
+        if cache is None:
+            return super().getresponse()
+
+        if self.verb != "GET":
+            response = super().getresponse()
+            if response.status < 400:
+                cache.invalidate(self.url, self.headers)
+            return response
+
+        if getattr(_local, "uncached", False):
+            response = super().getresponse()
+            cache.bypassed += 1
+            if response.status == 200:
+                cache.store_response(self.url, self.headers, response.status, response.getheaders(), response.text)
+            return response
+
+        entry = cache.lookup(self.url, self.headers)
+        if entry and entry["fresh"]:
+            cache.fresh_hits += 1
+            return CachedResponse(entry["status"], entry["headers"], entry["body"])
+
+        request_headers = self.headers
+        if entry:
+            self.headers = dict(self.headers, **cache.conditional_headers(entry))
+
+        response = super().getresponse()
+        self.headers = request_headers
+
+        if response.status == 304 and entry:
+            cache.revalidated += 1
+            cache.refresh(self.url, self.headers, entry, response.getheaders())
+            return CachedResponse(entry["status"], entry["headers"], entry["body"])
+
+        cache.misses += 1
+        if response.status == 200:
+            cache.store_response(self.url, self.headers, response.status, response.getheaders(), response.text)
+        return response
+
+
+def _install_cache() -> None:
+    global _installed, _response_cache
+    if _installed:
+        return
+    _installed = True
+
+    _response_cache = ResponseCache.from_config()
+    if _response_cache is not None:
+        Requester.injectConnectionClasses(HTTPRequestsConnectionClass, CachingHTTPSConnection)
+        logger.debug(f"GitHub response cache enabled at {_response_cache.store.path}")
+
+
+@contextmanager
+def uncached() -> Iterator[None]:
+    """Send GETs made by this thread inside the block straight to GitHub.
+
+    For reads that must see GitHub's current state, such as checking whether
+    a write whose response was lost went through. Fresh responses still
+    replace the cached ones. Paginated lists must be iterated inside the block.
+    """
+    previous = getattr(_local, "uncached", False)
+    _local.uncached = True
+    try:
+        yield
+    finally:
+        _local.uncached = previous
+
+
+def get_github(token: Optional[str] = None, **kwargs) -> Github:
+    """Return the process-wide Github client for a token, creating it on first use.
+
+    Defaults to the GHUB_TOKEN environment variable. Every client shares the
+    on-disk conditional-request cache configured in config/github_cache.json.
+    """
+    if token is None:
+        token = os.getenv("GHUB_TOKEN")
+
+    with _lock:
+        _install_cache()
+        key = (token, tuple(sorted(kwargs.items())))
+        if key not in _clients:
+            _clients[key] = Github(token, **kwargs)
+        return _clients[key]
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters of the shared response cache"""
+    if _response_cache is None:
+        return {"enabled": False}
+    return dict(_response_cache.stats(), enabled=True)
+
+
+def log_cache_stats(log: logging.Logger = logger) -> None:
+    stats = cache_stats()
+    if not stats["enabled"]:
+        return
+    log.info(
+        f"GitHub cache: {stats['fresh_hits']} fresh, {stats['revalidated_304']} revalidated (304), "
+        f"{stats['misses']} misses, hit rate {stats['hit_rate']:.0%}, "
+        f"{stats['entries']} entries / {stats['bytes'] / 1024:.0f} KiB"
+    )
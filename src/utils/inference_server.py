@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+import argparse
+import http.client
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/llm_server.json"
+
+DEFAULT_CONFIG = {
+    "url": None,
+    "socket": "data/llm_server.sock",
+    "max_batch": 8,
+    "max_queue": 256,
+    "timeout_seconds": 600,
+}
+
+# llama_cpp.Llama.__call__ samples at this temperature unless told otherwise
+DEFAULT_TEMPERATURE = 0.8
+# Seeds llama.cpp treats as "pick a random seed"
+RANDOM_SEEDS = (-1, 0xFFFFFFFF)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the server already holds max_queue pending requests"""
+
+
+class InferenceRequest:
+    def __init__(self, prompt: str, params: Dict[str, Any], stream: bool = False):
+        self.prompt = prompt
+        self.params = params
+        self.stream = stream
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+        self.error: Optional[Exception] = None
+        # Streaming requests receive chunks here, terminated by None
+        self.chunks: "queue.Queue[Optional[dict]]" = queue.Queue()
+
+    @property
+    def key(self) -> str:
+        return json.dumps([self.prompt, self.params], sort_keys=True)
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether the same prompt and params always decode to the same text: greedy or a fixed seed"""
+        temperature = self.params.get("temperature")
+        if (DEFAULT_TEMPERATURE if temperature is None else temperature) <= 0:
+            return True
+        return self.params.get("seed") is not None and self.params["seed"] not in RANDOM_SEEDS
+
+    def wait(self, timeout: Optional[float] = None) -> dict:
+        if not self.done.wait(timeout):
+            raise TimeoutError("Inference request timed out")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def iter_chunks(self) -> Iterator[dict]:
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                break
+            yield chunk
+        if self.error is not None:
+            raise self.error
+
+
+class RequestBatcher:
+    """Queues requests for one loaded model and runs them in batches on a single worker.
+
+    llama.cpp evaluates one sequence at a time, so a batch is processed in
+    prompt order: identical non-streaming requests are generated once and
+    fanned out when decoding is deterministic (temperature 0 or a fixed
+    seed), since sampled requests each expect their own draw, and prompts that share a prefix (agent role preambles) run
+    back to back, letting llama.cpp reuse the evaluated prefix instead of
+    re-reading it. Tokenization shares the model lock with generation.
+    """
+
+    def __init__(self, model, max_batch: int = 8, max_queue: int = 256):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.model_lock = threading.Lock()
+        self._queue: "queue.Queue[InferenceRequest]" = queue.Queue()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._started_at = time.monotonic()
+        self._counters = {
+            "requests": 0,
+            "completed": 0,
+            "failed": 0,
+            "deduplicated": 0,
+            "batches": 0,
+            "tokens": 0,
+            "busy_seconds": 0.0,
+            "queue_wait_seconds": 0.0,
+        }
+        self._counter_lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+            self._worker.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
+            self._worker = None
+
+    def submit(self, prompt: str, stream: bool = False, **params) -> InferenceRequest:
+        if self._queue.qsize() >= self.max_queue:
+            raise QueueFullError(f"{self.max_queue} requests already queued")
+        request = InferenceRequest(prompt, params, stream)
+        self._count(requests=1)
+        self._queue.put(request)
+        return request
+
+    def complete(self, prompt: str, timeout: Optional[float] = None, **params) -> dict:
+        return self.submit(prompt, **params).wait(timeout)
+
+    def tokenize(self, text: bytes) -> List[int]:
+        with self.model_lock:
+            return self.model.tokenize(text)
+
+    def _count(self, **increments) -> None:
+        with self._counter_lock:
+            for name, value in increments.items():
+                self._counters[name] += value
+
+    def _next_batch(self) -> List[InferenceRequest]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if batch:
+                self.process(batch)
+
+    def process(self, batch: List[InferenceRequest]) -> None:
+        start = time.monotonic()
+        self._count(batches=1, queue_wait_seconds=sum(start - request.enqueued_at for request in batch))
+
+        groups: Dict[str, List[InferenceRequest]] = {}
+        for request in batch:
+            # Streams each need their own token feed, and sampled requests their own draw
+            key = request.key if request.deterministic and not request.stream else f"single:{id(request)}"
+            groups.setdefault(key, []).append(request)
+
+        for requests in sorted(groups.values(), key=lambda group: group[0].prompt):
+            if requests[0].stream:
+                self._run_stream(requests[0])
+            else:
+                self._run_completion(requests)
+        self._count(busy_seconds=time.monotonic() - start)
+
+    def _run_completion(self, requests: List[InferenceRequest]) -> None:
+        first = requests[0]
+        try:
+            with self.model_lock:
+                result = self.model(first.prompt, **first.params)
+            tokens = result.get("usage", {}).get("completion_tokens", 0)
+            self._count(completed=len(requests), deduplicated=len(requests) - 1, tokens=tokens)
+        except Exception as e:
+            logger.error(f"Inference failed: {e}")
+            result = None
+            self._count(failed=len(requests))
+            for request in requests:
+                request.error = e
+        for request in requests:
+            request.result = result
+            request.done.set()
+
+    def _run_stream(self, request: InferenceRequest) -> None:
+        tokens = 0
+        try:
+            with self.model_lock:
+                for chunk in self.model(request.prompt, stream=True, **request.params):
+                    tokens += 1
+                    request.chunks.put(chunk)
+            self._count(completed=1, tokens=tokens)
+        except Exception as e:
+            logger.error(f"Streaming inference failed: {e}")
+            request.error = e
+            self._count(failed=1, tokens=tokens)
+        request.chunks.put(None)
+        request.done.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            counters = dict(self._counters)
+        uptime = time.monotonic() - self._started_at
+        finished = counters["completed"] + counters["failed"]
+        return {
+            "queue_depth": self._queue.qsize(),
+            "requests": counters["requests"],
+            "completed": counters["completed"],
+            "failed": counters["failed"],
+            "deduplicated": counters["deduplicated"],
+            "batches": counters["batches"],
+            "mean_batch_size": round(finished / counters["batches"], 2) if counters["batches"] else 0.0,
+            "mean_queue_wait_ms": round(counters["queue_wait_seconds"] * 1000 / finished, 1) if finished else 0.0,
+            "tokens": counters["tokens"],
+            "tokens_per_second": (
+                round(counters["tokens"] / counters["busy_seconds"], 1) if counters["busy_seconds"] else 0.0
+            ),
+            "requests_per_minute": round(counters["completed"] * 60 / uptime, 1) if uptime else 0.0,
+            "utilization": round(counters["busy_seconds"] / uptime, 3) if uptime else 0.0,
+        }
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    """HTTP API: POST /v1/completions, POST /v1/tokenize, GET /metrics, GET /health"""
+
+    server_version = "InferenceServer/1.0"
+
+    @property
+    def batcher(self) -> RequestBatcher:
+        return self.server.batcher
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send_json(self, status: int, body: Any) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send_json(200, self.batcher.metrics())
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        if self.path == "/v1/tokenize":
+            self._send_json(200, {"tokens": self.batcher.tokenize(body.get("text", "").encode("utf-8"))})
+            return
+        if self.path != "/v1/completions":
+            self._send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        if "prompt" not in body:
+            self._send_json(400, {"error": "Missing prompt"})
+            return
+
+        prompt = body.pop("prompt")
+        stream = bool(body.pop("stream", False))
+        try:
+            request = self.batcher.submit(prompt, stream=stream, **body)
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)})
+            return
+
+        if stream:
+            self._stream(request)
+            return
+        try:
+            self._send_json(200, request.wait())
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+
+    def _stream(self, request: InferenceRequest) -> None:
+        # Newline-delimited JSON chunks; the body ends when the connection closes (HTTP/1.0)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for chunk in request.iter_chunks():
+                self.wfile.write(json.dumps(chunk).encode() + b"\n")
+                self.wfile.flush()
+        except Exception as e:
+            self.wfile.write(json.dumps({"error": str(e)}).encode() + b"\n")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(batcher: RequestBatcher, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: int = 0):
+    """HTTP server for the batcher on a Unix socket if socket_path is given, otherwise on host:port"""
+    if socket_path:
+        directory = os.path.dirname(socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, InferenceHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), InferenceHandler)
+        server.daemon_threads = True
+    server.batcher = batcher
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class InferenceClient:
+    """Client for the inference server that stands in for llama_cpp.Llama.
+
+    Called like Llama (prompt, stream=False, **generation params), so
+    LangChain's LlamaCpp can use it as its client. The URL is either
+    http://host:port or unix:///path/to/socket.
+    """
+
+    def __init__(self, url: str, timeout: float = 600):
+        self.url = url
+        self.timeout = timeout
+
+    def _connection(self) -> http.client.HTTPConnection:
+        parsed = urlparse(self.url)
+        if parsed.scheme == "unix":
+            return _UnixHTTPConnection(parsed.path, timeout=self.timeout)
+        return http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.timeout)
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None):
+        connection = self._connection()
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        if response.status != 200:
+            detail = response.read().decode(errors="replace")
+            connection.close()
+            raise RuntimeError(f"Inference server returned {response.status}: {detail}")
+        return connection, response
+
+    def _json(self, method: str, path: str, body: Optional[dict] = None) -> Any:
+        connection, response = self._request(method, path, body)
+        try:
+            return json.loads(response.read())
+        finally:
+            connection.close()
+
+    def __call__(self, prompt: str, stream: bool = False, **params):
+        if stream:
+            return self._stream(dict(params, prompt=prompt, stream=True))
+        return self._json("POST", "/v1/completions", dict(params, prompt=prompt))
+
+    def _stream(self, body: dict) -> Iterator[dict]:
+        connection, response = self._request("POST", "/v1/completions", body)
+        try:
+            for line in response:
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Inference server stream failed: {chunk['error']}")
+                yield chunk
+        finally:
+            connection.close()
+
+    def tokenize(self, text: bytes) -> List[int]:
+        return self._json("POST", "/v1/tokenize", {"text": text.decode("utf-8")})["tokens"]
+
+    def metrics(self) -> Dict[str, Any]:
+        return self._json("GET", "/metrics")
+
+
+def load_server_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(config_path):
+        with open(config_path, "r") as f:
+            config.update(json.load(f))
+    if os.getenv("LLM_SERVER_URL") is not None:
+        config["url"] = os.getenv("LLM_SERVER_URL") or None
+    return config
+
+
+def server_client(config_path: str = DEFAULT_CONFIG_PATH) -> Optional[InferenceClient]:
+    """Client for the configured inference server, or None when agents should load models in-process"""
+    config = load_server_config(config_path)
+    if not config["url"]:
+        return None
+    return InferenceClient(config["url"], timeout=config["timeout_seconds"])
+
+
+def main():
+    from src.utils.model_pool import DEFAULT_MODEL_PATH, _load_llama
+
+    config = load_server_config()
+    parser = argparse.ArgumentParser(description="Serve one llama.cpp model to all agents with request batching")
+    parser.add_argument("--model", default=os.getenv("LLAMA_MODEL_PATH", DEFAULT_MODEL_PATH))
+    parser.add_argument("--n-ctx", type=int, default=4096)
+    parser.add_argument("--n-gpu-layers", type=int, default=0)
+    parser.add_argument("--socket", default=config["socket"], help="Unix socket path (ignored with --port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="Serve over TCP instead of the Unix socket")
+    parser.add_argument("--max-batch", type=int, default=config["max_batch"])
+    parser.add_argument("--max-queue", type=int, default=config["max_queue"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    model = _load_llama(args.model, n_ctx=args.n_ctx, n_gpu_layers=args.n_gpu_layers, use_mmap=True)
+    batcher = RequestBatcher(model, max_batch=args.max_batch, max_queue=args.max_queue)
+    batcher.start()
+
+    if args.port is not None:
+        server = make_server(batcher, host=args.host, port=args.port)
+        logger.info(f"Serving {args.model} on http://{args.host}:{server.server_address[1]}")
+    else:
+        server = make_server(batcher, socket_path=args.socket)
+        logger.info(f"Serving {args.model} on unix://{os.path.abspath(args.socket)}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_CONFIG_PATH = "config/keywords.json"
+
+# Distinct matched strings remembered per matcher
+MAX_MEMO = 10000
+
+# Keywords match whole words: the characters around a match must not be letters or digits
+_BEFORE = r"(?<![^\W_])"
+_AFTER = r"(?![^\W_])"
+# Exact keywords (repository names) must not be part of a longer name: "repo-a" is not in "repo-a-b" or "repo-a.js"
+_EXACT_BEFORE = r"(?<![\w.-])"
+_EXACT_AFTER = r"(?![\w-]|\.\w)"
+# Spaces, hyphens, underscores and slashes inside a keyword match any run of those ("ci-cd" ~ "CI/CD")
+_SEPARATORS = re.compile(r"[\s_/-]+")
+_SEPARATOR_PATTERN = r"[\s_/-]+"
+
+
+def _normalize(keyword: str) -> str:
+    return _SEPARATORS.sub(" ", keyword.lower()).strip()
+
+
+def _normalize_exact(keyword: str) -> str:
+    return keyword.lower().strip()
+
+
+def _trie_pattern(keywords: Iterable[str], separators: bool = True) -> str:
+    """One regex for all keywords, factored on shared prefixes.
+
+    A keyword ending in * matches any word ending ("implement*" ~
+    "implementation"). Factoring keeps the regex engine from trying every
+    keyword at every position, so matching costs about the same for ten
+    keywords or a thousand. With separators=False a space is matched
+    literally like any other character.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword.rstrip("*"):
+            node = node.setdefault(char, {})
+        node["*" if keyword.endswith("*") else ""] = True
+
+    def build(node: dict) -> str:
+        alternatives = [
+            (_SEPARATOR_PATTERN if char == " " and separators else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char not in ("", "*")
+        ]
+        if "*" in node:
+            alternatives.append(r"[^\W_]*")
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds the keywords of a {category: [keywords]} table in text with one compiled regex.
+
+    All keywords are compiled into a single alternation factored like a
+    trie, so a text is scanned once whatever the number of keywords
+    instead of once per keyword. Matching ignores case, is on word
+    boundaries ("ui" does not match "build") and prefers the longest
+    keyword at a position. With exact=True, for identifiers such as
+    repository names, separators are matched as written ("repo-a" does not
+    match "repo a" or "repo_a") and a match may not continue into a longer
+    name.
+    """
+
+    def __init__(self, table: Dict[str, Iterable[str]], exact: bool = False):
+        self._normalize = _normalize_exact if exact else _normalize
+        self.categories: List[str] = list(table)
+        self.keywords: List[str] = []
+        self._keyword_categories: List[List[int]] = []
+        self._exact: Dict[str, int] = {}
+        stems: Dict[str, int] = {}
+        for category_index, keywords in enumerate(table.values()):
+            for keyword in keywords:
+                lookup = stems if keyword.endswith("*") else self._exact
+                normalized = self._normalize(keyword.rstrip("*"))
+                if normalized not in lookup:
+                    lookup[normalized] = len(self.keywords)
+                    self.keywords.append(keyword.rstrip("*"))
+                    self._keyword_categories.append([])
+                self._keyword_categories[lookup[normalized]].append(category_index)
+        # Longest stem first, so "implementation" is credited to "implement*" rather than "imp*"
+        self._prefixes = sorted(stems.items(), key=lambda item: -len(item[0]))
+        # Matched text -> keyword index; matches repeat, so most lookups skip normalisation
+        self._memo: Dict[str, int] = {}
+
+        patterns = list(self._exact) + [f"{stem}*" for stem, _ in self._prefixes]
+        before, after = (_EXACT_BEFORE, _EXACT_AFTER) if exact else (_BEFORE, _AFTER)
+        pattern = _trie_pattern(patterns, separators=not exact)
+        self._regex = re.compile(f"{before}{pattern}{after}") if patterns else None
+
+    def _index(self, matched: str) -> int:
+        index = self._memo.get(matched)
+        if index is None:
+            normalized = self._normalize(matched)
+            index = self._exact.get(normalized)
+            if index is None:
+                index = next(index for stem, index in self._prefixes if normalized.startswith(stem))
+            if len(self._memo) >= MAX_MEMO:
+                self._memo.clear()
+            self._memo[matched] = index
+        return index
+
+    def _indices(self, text: Optional[str]) -> Iterable[int]:
+        if not text or self._regex is None:
+            return
+        for matched in self._regex.findall(text.lower()):
+            yield self._index(matched)
+
+    def counts(self, text: Optional[str]) -> Dict[str, int]:
+        """Occurrences of each keyword found in the text"""
+        counts: Dict[str, int] = {}
+        for index in self._indices(text):
+            counts[self.keywords[index]] = counts.get(self.keywords[index], 0) + 1
+        return counts
+
+    def find(self, text: Optional[str]) -> List[str]:
+        """Keywords found in the text, once each, in table order"""
+        return [self.keywords[index] for index in sorted(set(self._indices(text)))]
+
+    def matched_categories(self, text: Optional[str]) -> List[str]:
+        """Categories with at least one keyword in the text, in table order"""
+        found = {category for index in set(self._indices(text)) for category in self._keyword_categories[index]}
+        return [self.categories[category] for category in sorted(found)]
+
+    def first_category(self, text: Optional[str]) -> Optional[str]:
+        """First category of the table with a keyword in the text"""
+        categories = self.matched_categories(text)
+        return categories[0] if categories else None
+
+    def contains_any(self, text: Optional[str]) -> bool:
+        return bool(text) and self._regex is not None and self._regex.search(text.lower()) is not None
+
+
+def load_keyword_tables(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Dict[str, List[str]]]:
+    """The keyword tables of config/keywords.json, their only source"""
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Keyword tables not found at {config_path}")
+    with open(config_path, "r") as f:
+        return json.load(f)
+
+
+_lock = threading.Lock()
+_matchers: Dict[tuple, KeywordMatcher] = {}
+
+
+def get_keyword_matcher(name: str, config_path: str = DEFAULT_CONFIG_PATH) -> KeywordMatcher:
+    """Process-wide matcher for a table of config/keywords.json, compiled on first use"""
+    key = (name, config_path)
+    with _lock:
+        if key not in _matchers:
+            tables = load_keyword_tables(config_path)
+            if name not in tables:
+                raise KeyError(f"No {name!r} keyword table in {config_path}")
+            _matchers[key] = KeywordMatcher(tables[name])
+        return _matchers[key]
+
+
+def _naive_find(table: Dict[str, Iterable[str]], text: str) -> List[str]:
+    # The substring loops the matcher replaced: one scan of the text per keyword
+    text = text.lower()
+    return [keyword for keywords in table.values() for keyword in keywords if keyword.rstrip("*") in text]
+
+
+def benchmark(texts: int = 10000, table: str = "skill_categories", extra_keywords: int = 0, seed: int = 0):
+    """Time the compiled matcher against the per-keyword substring loops on synthetic issue text.
+
+    extra_keywords adds random keywords to the table, to see how both
+    approaches scale with its size.
+    """
+    import random
+
+    rng = random.Random(seed)
+    keywords_table = {name: list(keywords) for name, keywords in load_keyword_tables()[table].items()}
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    keywords_table["extra"] = [
+        "".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(extra_keywords)
+    ]
+    keywords = [keyword.rstrip("*") for keywords in keywords_table.values() for keyword in keywords]
+    filler = "the of and to fix issue when user page error update data request add support for in on with".split()
+    # About one word in fifty is a keyword
+    corpus = [
+        " ".join(
+            rng.choice(keywords) if rng.random() < 0.02 else rng.choice(filler) for _ in range(rng.randint(20, 200))
+        )
+        for _ in range(texts)
+    ]
+
+    matcher = KeywordMatcher(keywords_table)
+    start = time.perf_counter()
+    for text in corpus:
+        _naive_find(keywords_table, text)
+    naive_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in corpus:
+        matcher.find(text)
+    compiled_seconds = time.perf_counter() - start
+
+    return {
+        "texts": texts,
+        "keywords": len(matcher.keywords),
+        "naive_seconds": round(naive_seconds, 4),
+        "compiled_seconds": round(compiled_seconds, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled keyword matcher against substring loops")
+    parser.add_argument("--texts", type=int, default=10000)
+    parser.add_argument("--table", default="skill_categories")
+    parser.add_argument("--extra-keywords", type=int, default=0)
+    args = parser.parse_args()
+
+    for key, value in benchmark(args.texts, args.table, args.extra_keywords).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.utils.disk_cache import DiskCache
+from src.utils.llm_metrics import get_llm_metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/llm_cache.json"
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "path": "data/cache/llm_responses.db",
+    "max_size_mb": 256,
+}
+
+_lock = threading.Lock()
+_llm_cache: Optional["LLMResponseCache"] = None
+_installed = False
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical form of a prompt: unified newlines, no trailing spaces, collapsed blank lines"""
+    lines = [line.rstrip() for line in prompt.replace("\r\n", "\n").replace("\r", "\n").split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+class LLMResponseCache:
+    """Disk-backed cache of LLM completions, installed as LangChain's global llm_cache.
+
+    LangChain looks up every generation by (prompt, llm_string), where
+    llm_string serialises the LLM's parameters: model path, temperature,
+    max_tokens, stop words and so on. Entries are keyed on a hash of the
+    normalised prompt plus that string and evicted least recently used once
+    the store exceeds its size budget. LLMs constructed with cache=False
+    (e.g. get_llm(..., cache=False) for sampling calls that should vary)
+    bypass it.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, generation_cls=None):
+        self.store = DiskCache(path, max_bytes=max_bytes)
+        self.generation_cls = generation_cls
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH) -> Optional["LLMResponseCache"]:
+        """Build a cache from config/llm_cache.json, or None if caching is disabled"""
+        config = dict(DEFAULT_CONFIG)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                config.update(json.load(f))
+
+        if not config["enabled"] or os.getenv("LLM_CACHE", "").lower() in ("0", "off", "false"):
+            return None
+
+        return cls(os.getenv("LLM_CACHE_PATH", config["path"]), max_bytes=int(config["max_size_mb"] * 1024 * 1024))
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(normalize_prompt(prompt).encode())
+        digest.update(b"\0")
+        digest.update(llm_string.encode())
+        return digest.hexdigest()
+
+    def _generation(self, text: str, info: Optional[dict]):
+        if self.generation_cls is None:
+            from langchain.schema import Generation
+
+            self.generation_cls = Generation
+        return self.generation_cls(text=text, generation_info=info)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[List[Any]]:
+        entry = self.store.get(self.key(prompt, llm_string))
+        if entry is None:
+            return None
+        generations = json.loads(entry[0])
+        # Cache hits never reach the model callbacks, so they are recorded here
+        get_llm_metrics().cache_hit(prompt, "".join(item["text"] for item in generations))
+        return [self._generation(item["text"], item.get("info")) for item in generations]
+
+    def update(self, prompt: str, llm_string: str, return_val: List[Any]) -> None:
+        generations = [{"text": g.text, "info": getattr(g, "generation_info", None)} for g in return_val]
+        self.store.set(self.key(prompt, llm_string), json.dumps(generations).encode(), meta=llm_string[:200])
+
+    def clear(self, **kwargs) -> None:
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+
+def install_llm_cache(config_path: str = DEFAULT_CONFIG_PATH) -> Optional[LLMResponseCache]:
+    """Install the shared response cache as langchain.llm_cache once per process"""
+    global _installed, _llm_cache
+    with _lock:
+        if _installed:
+            return _llm_cache
+        _installed = True
+
+        _llm_cache = LLMResponseCache.from_config(config_path)
+        if _llm_cache is not None:
+            import langchain
+
+            langchain.llm_cache = _llm_cache
+            logger.debug(f"LLM response cache enabled at {_llm_cache.store.path}")
+        return _llm_cache
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    if _llm_cache is None:
+        return {"enabled": False}
+    return dict(_llm_cache.stats(), enabled=True)
+
+
+def log_llm_cache_stats(log: logging.Logger = logger) -> None:
+    stats = llm_cache_stats()
+    if not stats["enabled"]:
+        return
+    log.info(
+        f"LLM cache: {stats['hits']} hits, {stats['misses']} misses, hit rate {stats['hit_rate']:.0%}, "
+        f"{stats['entries']} entries / {stats['bytes'] / 2**20:.1f} MiB"
+    )
@@ -0,0 +1,310 @@
+import contextlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_DIR = "data/llm_metrics"
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120)
+
+# crewai builds agent prompts as "You are {role}.\n{backstory}..." and ends them with "Current Task: {task}"
+_ROLE = re.compile(r"You are ([^.\n]+)\.")
+_TASK = re.compile(r"Current Task: ([^\n]+)")
+
+_scope: ContextVar[Dict[str, str]] = ContextVar("llm_metrics_scope", default={})
+
+
+@contextlib.contextmanager
+def scope(agent: Optional[str] = None, task: Optional[str] = None) -> Iterator[None]:
+    """Attribute LLM calls made inside the block to an agent and/or task"""
+    current = dict(_scope.get())
+    current.update({key: value for key, value in (("agent", agent), ("task", task)) if value})
+    token = _scope.set(current)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def attribute(prompt: str) -> Dict[str, str]:
+    """Agent and task for a prompt: the active scope first, then the crewai prompt layout"""
+    labels = dict(_scope.get())
+    if "agent" not in labels:
+        match = _ROLE.search(prompt)
+        labels["agent"] = match.group(1).strip() if match else "unknown"
+    if "task" not in labels:
+        match = _TASK.search(prompt)
+        labels["task"] = match.group(1).strip()[:80] if match else "unknown"
+    return labels
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for models that report no usage: about four characters per token"""
+    return max(len(text) // 4, 1) if text else 0
+
+
+class LLMMetrics:
+    """Records one entry per LLM call: agent, task, tokens, time to first token, latency, cache hits.
+
+    Token counts come from the LLM's reported usage when it has one
+    (OpenAI, Anthropic), otherwise from the tokenizer given for the model,
+    otherwise from an estimate. Time to first token is only known for
+    streaming LLMs. Responses served from the LLM response cache never
+    reach the model and are recorded with zero latency and cached=True.
+    """
+
+    def __init__(
+        self, tokenizer: Optional[Callable[[str], int]] = None, clock: Callable[[], float] = time.perf_counter
+    ):
+        self.tokenizer = tokenizer
+        self.clock = clock
+        self.records: List[Dict[str, Any]] = []
+        self._active: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def count_tokens(self, text: str, tokenizer: Optional[Callable[[str], int]] = None) -> int:
+        tokenizer = tokenizer or self.tokenizer
+        if tokenizer is not None:
+            try:
+                return tokenizer(text)
+            except Exception as e:
+                logger.debug(f"Tokenizer failed, estimating token count: {e}")
+        return estimate_tokens(text)
+
+    def start(
+        self, run_id: Any, prompt: str, model: Optional[str] = None, tokenizer: Optional[Callable[[str], int]] = None
+    ) -> None:
+        with self._lock:
+            self._active[run_id] = dict(
+                attribute(prompt),
+                model=model,
+                prompt=prompt,
+                tokenizer=tokenizer,
+                started_at=datetime.now().isoformat(),
+                start=self.clock(),
+                first_token=None,
+            )
+
+    def token(self, run_id: Any) -> None:
+        with self._lock:
+            call = self._active.get(run_id)
+            if call is not None and call["first_token"] is None:
+                call["first_token"] = self.clock()
+
+    def end(
+        self,
+        run_id: Any,
+        completion: str = "",
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        error: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            call = self._active.pop(run_id, None)
+        if call is None:
+            return None
+
+        latency = self.clock() - call["start"]
+        if completion_tokens is None:
+            completion_tokens = self.count_tokens(completion, call["tokenizer"]) if completion else 0
+        record = {
+            "timestamp": call["started_at"],
+            "agent": call["agent"],
+            "task": call["task"],
+            "model": call["model"],
+            "prompt_tokens": (
+                prompt_tokens if prompt_tokens is not None else self.count_tokens(call["prompt"], call["tokenizer"])
+            ),
+            "completion_tokens": completion_tokens,
+            "ttft_seconds": None if call["first_token"] is None else round(call["first_token"] - call["start"], 4),
+            "latency_seconds": round(latency, 4),
+            "tokens_per_second": round(completion_tokens / latency, 2) if latency > 0 else None,
+            "cached": False,
+            "error": error,
+        }
+        self._append(record)
+        return record
+
+    def cache_hit(self, prompt: str, completion: str = "") -> None:
+        labels = attribute(prompt)
+        self._append(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "agent": labels["agent"],
+                "task": labels["task"],
+                "model": None,
+                "prompt_tokens": self.count_tokens(prompt),
+                "completion_tokens": self.count_tokens(completion) if completion else 0,
+                "ttft_seconds": None,
+                "latency_seconds": 0.0,
+                "tokens_per_second": None,
+                "cached": True,
+                "error": None,
+            }
+        )
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records = []
+            self._active = {}
+
+    def summary(self, by: tuple = ("agent", "task")) -> List[Dict[str, Any]]:
+        """Aggregate records per group: calls, cache hits, tokens, latency percentiles and histogram"""
+        with self._lock:
+            records = list(self.records)
+
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for record in records:
+            groups.setdefault(tuple(record[key] for key in by), []).append(record)
+
+        rows = []
+        for key, group in sorted(groups.items()):
+            generated = [record for record in group if not record["cached"] and not record["error"]]
+            latencies = np.array([record["latency_seconds"] for record in generated], dtype=float)
+            ttfts = [record["ttft_seconds"] for record in generated if record["ttft_seconds"] is not None]
+            completion_tokens = sum(record["completion_tokens"] for record in generated)
+            busy = float(latencies.sum())
+            counts = np.bincount(np.searchsorted(LATENCY_BUCKETS, latencies), minlength=len(LATENCY_BUCKETS) + 1)
+            rows.append(
+                dict(
+                    zip(by, key),
+                    calls=len(group),
+                    cache_hits=sum(record["cached"] for record in group),
+                    errors=sum(bool(record["error"]) for record in group),
+                    prompt_tokens=sum(record["prompt_tokens"] for record in group),
+                    completion_tokens=sum(record["completion_tokens"] for record in group),
+                    latency_p50=round(float(np.percentile(latencies, 50)), 3) if latencies.size else None,
+                    latency_p95=round(float(np.percentile(latencies, 95)), 3) if latencies.size else None,
+                    latency_total=round(busy, 3),
+                    ttft_mean=round(sum(ttfts) / len(ttfts), 3) if ttfts else None,
+                    tokens_per_second=round(completion_tokens / busy, 2) if busy else None,
+                    latency_histogram={
+                        f"<={bound}s" if i < len(LATENCY_BUCKETS) else f">{LATENCY_BUCKETS[-1]}s": int(count)
+                        for i, (bound, count) in enumerate(zip(LATENCY_BUCKETS + (None,), counts))
+                    },
+                )
+            )
+        return rows
+
+    def format_summary(self, by: tuple = ("agent", "task")) -> str:
+        columns = list(by) + [
+            "calls",
+            "cache_hits",
+            "prompt_tokens",
+            "completion_tokens",
+            "latency_p50",
+            "latency_p95",
+            "latency_total",
+            "ttft_mean",
+            "tokens_per_second",
+        ]
+        rows = [
+            [str(row[column]) if row[column] is not None else "-" for column in columns] for row in self.summary(by)
+        ]
+        widths = [max([len(column)] + [len(row[i][:40]) for row in rows]) for i, column in enumerate(columns)]
+        lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths))]
+        lines.append("  ".join("-" * width for width in widths))
+        lines.extend("  ".join(value[:40].ljust(width) for value, width in zip(row, widths)) for row in rows)
+        return "\n".join(lines)
+
+    def export_jsonl(self, path: str) -> str:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            records = list(self.records)
+        with open(path, "a") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        return path
+
+
+_metrics = LLMMetrics()
+
+
+def get_llm_metrics() -> LLMMetrics:
+    return _metrics
+
+
+def metrics_callback(tokenizer: Optional[Callable[[str], int]] = None, metrics: Optional[LLMMetrics] = None):
+    """LangChain callback handler feeding the process-wide LLMMetrics.
+
+    tokenizer counts tokens for LLMs that report no usage (LlamaCpp).
+    """
+    return _callback_class()(metrics or _metrics, tokenizer)
+
+
+_callback = None
+
+
+def _callback_class():
+    # Defined on first use so importing the metrics module does not pull in langchain
+    global _callback
+    if _callback is None:
+        from langchain.callbacks.base import BaseCallbackHandler
+
+        class LLMMetricsCallback(BaseCallbackHandler):
+            def __init__(self, metrics: LLMMetrics, tokenizer: Optional[Callable[[str], int]] = None):
+                self.metrics = metrics
+                self.tokenizer = tokenizer
+                self._prompts: Dict[Any, int] = {}
+
+            def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+                params = kwargs.get("invocation_params") or {}
+                model = params.get("model_path") or params.get("model_name") or params.get("model")
+                self._prompts[run_id] = len(prompts)
+                for index, prompt in enumerate(prompts):
+                    self.metrics.start(
+                        (run_id, index), prompt, model or (serialized or {}).get("id", [None])[-1], self.tokenizer
+                    )
+
+            def on_llm_new_token(self, token, *, run_id, **kwargs):
+                self.metrics.token((run_id, 0))
+
+            def on_llm_end(self, response, *, run_id, **kwargs):
+                self._prompts.pop(run_id, None)
+                # Reported usage covers the whole batch, so it is only usable for single-prompt calls
+                usage = (response.llm_output or {}).get("token_usage") or {} if len(response.generations) == 1 else {}
+                for index, generations in enumerate(response.generations):
+                    self.metrics.end(
+                        (run_id, index),
+                        "".join(generation.text for generation in generations),
+                        prompt_tokens=usage.get("prompt_tokens"),
+                        completion_tokens=usage.get("completion_tokens"),
+                    )
+
+            def on_llm_error(self, error, *, run_id, **kwargs):
+                for index in range(self._prompts.pop(run_id, 1)):
+                    self.metrics.end((run_id, index), error=str(error))
+
+        _callback = LLMMetricsCallback
+    return _callback
+
+
+def export_llm_metrics(directory: str = None) -> Optional[str]:
+    """Write this run's LLM call records to <directory>/llm_calls_<timestamp>.jsonl"""
+    if not _metrics.records:
+        return None
+    directory = directory or os.getenv("LLM_METRICS_DIR", DEFAULT_EXPORT_DIR)
+    path = os.path.join(directory, f"llm_calls_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+    return _metrics.export_jsonl(path)
+
+
+def log_llm_metrics(log: logging.Logger = logger) -> None:
+    if _metrics.records:
+        log.info("LLM calls per agent and task:\n" + _metrics.format_summary())
@@ -0,0 +1,397 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/llm_router.json"
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "order": ["llama", "openai", "anthropic"],
+    "timeout_seconds": 120,
+    "hedge_after_seconds": None,
+    "probe_interval_seconds": 300,
+    "probe_timeout_seconds": 10,
+    "failure_threshold": 3,
+    "reset_seconds": 60,
+}
+
+# Weight of the newest sample in a backend's moving-average latency
+LATENCY_ALPHA = 0.3
+
+
+class NoBackendAvailableError(RuntimeError):
+    """Raised when every backend is tripped, failed or timed out for a request"""
+
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+        detail = "; ".join(f"{name}: {error}" for name, error in errors.items()) or "all circuits open"
+        super().__init__(f"No LLM backend available ({detail})")
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After failure_threshold failures in a row the circuit opens and the
+    backend is skipped. Once reset_seconds have passed it is half-open:
+    requests are let through again, one success closes it and one failure
+    opens it for another reset period.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 3, reset_seconds: float = 60, clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+
+
+def tcp_check(host: str, port: int = 443, timeout: float = 5.0) -> Callable[[], bool]:
+    """Liveness check that only opens a TCP connection, for API backends"""
+
+    def check() -> bool:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+
+    return check
+
+
+class Backend:
+    """One LLM option: a factory for its client plus health and latency bookkeeping.
+
+    The factory runs on first use and may return None (e.g. a missing API
+    key), which counts as a failure; it is retried once the breaker lets the
+    backend through again. The client is called as client(prompt, **kwargs),
+    which fits LangChain LLMs as well as plain callables. `check` is an
+    optional cheap liveness test used by probes instead of a generation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        breaker: Optional[CircuitBreaker] = None,
+        check: Optional[Callable[[], bool]] = None,
+    ):
+        self.name = name
+        self.factory = factory
+        self.breaker = breaker or CircuitBreaker()
+        self.check = check
+        self.latency: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                client = self.factory()
+                if client is None:
+                    raise RuntimeError(f"{self.name} backend could not be set up")
+                self._client = client
+            return self._client
+
+    def invoke(self, prompt: str, **kwargs) -> Any:
+        return self.client(prompt, **kwargs)
+
+    def alive(self) -> bool:
+        """Whether the client can be set up and the liveness check passes; never generates"""
+        self.client
+        return bool(self.check()) if self.check else True
+
+    def record_success(self, seconds: float) -> None:
+        self.successes += 1
+        self.latency = seconds if self.latency is None else (1 - LATENCY_ALPHA) * self.latency + LATENCY_ALPHA * seconds
+        self.breaker.record_success()
+
+    def record_failure(self, timed_out: bool = False) -> None:
+        self.failures += 1
+        self.timeouts += timed_out
+        self.breaker.record_failure()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+        }
+
+
+class LLMRouter:
+    """Sends each prompt to the best healthy backend, failing over on errors and timeouts.
+
+    The primary backend, if one is named, goes first whenever its breaker
+    lets it through. The others are ranked by their moving-average latency,
+    measured from real requests only; backends without a measurement yet
+    keep their configured order after the measured ones. A request that
+    errors or exceeds timeout_seconds trips the backend's breaker and moves
+    on to the next one. With hedge_after_seconds set, a slow request is
+    duplicated to the next backend after that delay and whichever answers
+    first wins.
+
+    Probes (once via probe(), or periodically after start()) only check
+    liveness: the client can be set up and the backend's check passes.
+    They never run a generation, so they cost no model time or API tokens.
+    """
+
+    def __init__(
+        self,
+        backends: List[Backend],
+        timeout_seconds: float = 120,
+        hedge_after_seconds: Optional[float] = None,
+        probe_interval_seconds: float = 300,
+        probe_timeout_seconds: float = 10,
+        primary: Optional[str] = None,
+    ):
+        self.backends = backends
+        self.timeout_seconds = timeout_seconds
+        self.hedge_after_seconds = hedge_after_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self.primary = primary
+        # Timed-out calls cannot be cancelled, so leave room for a few to linger
+        self._executor = ThreadPoolExecutor(max_workers=4 * max(len(backends), 1), thread_name_prefix="llm-router")
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        factories: Dict[str, Callable[[], Any]],
+        config_path: str = DEFAULT_CONFIG_PATH,
+        primary: Optional[str] = None,
+        checks: Optional[Dict[str, Callable[[], bool]]] = None,
+    ) -> Optional["LLMRouter"]:
+        """Build a router over the named factories from config/llm_router.json, or None if disabled"""
+        config = load_router_config(config_path)
+        if not config["enabled"]:
+            return None
+
+        names = [name for name in config["order"] if name in factories]
+        names += [name for name in factories if name not in names]
+        if primary in names:
+            names.remove(primary)
+            names.insert(0, primary)
+        backends = [
+            Backend(
+                name,
+                factories[name],
+                CircuitBreaker(config["failure_threshold"], config["reset_seconds"]),
+                (checks or {}).get(name),
+            )
+            for name in names
+        ]
+        return cls(
+            backends,
+            timeout_seconds=config["timeout_seconds"],
+            hedge_after_seconds=config["hedge_after_seconds"],
+            probe_interval_seconds=config["probe_interval_seconds"],
+            probe_timeout_seconds=config["probe_timeout_seconds"],
+            primary=primary,
+        )
+
+    def ranked(self) -> List[Backend]:
+        """Healthy backends: the primary first, then the others fastest first"""
+        healthy = [backend for backend in self.backends if backend.breaker.allow()]
+        order = {backend.name: index for index, backend in enumerate(self.backends)}
+        return sorted(
+            healthy,
+            key=lambda backend: (
+                backend.name != self.primary,
+                backend.latency is None,
+                backend.latency or 0,
+                order[backend.name],
+            ),
+        )
+
+    def healthy(self) -> List[str]:
+        return [backend.name for backend in self.ranked()]
+
+    def generate(
+        self,
+        prompt: str,
+        timeout: Optional[float] = None,
+        hedge_after: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        timeout = self.timeout_seconds if timeout is None else timeout
+        hedge_after = self.hedge_after_seconds if hedge_after is None else hedge_after
+        queue = self.ranked()
+        errors: Dict[str, str] = {}
+        pending = {}
+        last_launch = 0.0
+
+        def launch():
+            nonlocal last_launch
+            backend = queue.pop(0)
+            last_launch = time.monotonic()
+            future = self._executor.submit(_timed, backend, prompt, **kwargs)
+            pending[future] = (backend, last_launch)
+
+        if queue:
+            launch()
+        while pending:
+            wake = min(started + timeout for _, started in pending.values())
+            if hedge_after is not None and queue:
+                wake = min(wake, last_launch + hedge_after)
+            done, _ = wait(list(pending), timeout=max(wake - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for future in done:
+                backend, started = pending.pop(future)
+                try:
+                    result, seconds = future.result()
+                except Exception as e:
+                    backend.record_failure()
+                    errors[backend.name] = str(e)
+                    logger.warning(f"LLM backend {backend.name} failed: {e}")
+                    continue
+                backend.record_success(seconds)
+                return result
+
+            for future, (backend, started) in list(pending.items()):
+                if now - started >= timeout:
+                    del pending[future]
+                    backend.record_failure(timed_out=True)
+                    errors[backend.name] = f"timed out after {timeout}s"
+                    logger.warning(f"LLM backend {backend.name} timed out after {timeout}s")
+
+            hedge_due = hedge_after is not None and now - last_launch >= hedge_after
+            if queue and (not pending or hedge_due):
+                launch()
+
+        raise NoBackendAvailableError(errors)
+
+    def probe(self) -> Dict[str, bool]:
+        """Check every backend's liveness at once; returns {name: healthy}"""
+        futures = {backend.name: (backend, self._executor.submit(backend.alive)) for backend in self.backends}
+        wait([future for _, future in futures.values()], timeout=self.probe_timeout_seconds)
+
+        results = {}
+        for name, (backend, future) in futures.items():
+            if not future.done():
+                backend.record_failure(timed_out=True)
+                results[name] = False
+            elif future.exception() is not None or not future.result():
+                backend.record_failure()
+                logger.debug(f"Probe of {name} failed: {future.exception() or 'check returned False'}")
+                results[name] = False
+            else:
+                # Liveness only closes the breaker; latency comes from real requests
+                backend.breaker.record_success()
+                results[name] = True
+        return results
+
+    def start(self) -> None:
+        """Probe in a background thread every probe_interval_seconds"""
+        if self._prober is not None:
+            return
+        self._stop.clear()
+        self._prober = threading.Thread(target=self._probe_loop, name="llm-router-probe", daemon=True)
+        self._prober.start()
+
+    def _probe_loop(self) -> None:
+        while not self._stop.wait(self.probe_interval_seconds):
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error(f"LLM backend probe failed: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join(timeout=1)
+            self._prober = None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {backend.name: backend.stats() for backend in self.backends}
+
+    def as_llm(self):
+        """LangChain LLM that routes every call through this router.
+
+        It carries no metrics callback and bypasses the response cache: each
+        backend records its own calls, with its own token counts, and caches
+        them under its own model and sampling parameters (or not at all when
+        it was built with cache=False).
+        """
+        return _routed_llm_class()(router=self, cache=False)
+
+
+def _timed(backend: Backend, prompt: str, **kwargs):
+    # Timed inside the worker so latency excludes the time spent waiting on other backends
+    start = time.monotonic()
+    result = backend.invoke(prompt, **kwargs)
+    return result, time.monotonic() - start
+
+
+def load_router_config(config_path: str = DEFAULT_CONFIG_PATH) -> Dict[str, Any]:
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(config_path):
+        with open(config_path, "r") as f:
+            config.update(json.load(f))
+    if os.getenv("LLM_ROUTER", "").lower() in ("0", "off", "false"):
+        config["enabled"] = False
+    return config
+
+
+_routed_llm = None
+
+
+def _routed_llm_class():
+    # Defined on first use so importing the router does not pull in langchain
+    global _routed_llm
+    if _routed_llm is None:
+        from langchain.llms.base import LLM
+
+        class RoutedLLM(LLM):
+            router: Any
+
+            @property
+            def _llm_type(self) -> str:
+                return "routed"
+
+            @property
+            def _identifying_params(self) -> Dict[str, Any]:
+                return {"backends": [backend.name for backend in self.router.backends]}
+
+            def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> str:
+                return self.router.generate(prompt, stop=stop, **kwargs)
+
+        _routed_llm = RoutedLLM
+    return _routed_llm
@@ -0,0 +1,261 @@
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.llm_cache import install_llm_cache
+from src.utils.llm_metrics import metrics_callback
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = "models/llama-2-70b-chat.gguf"
+
+# LlamaCpp fields that shape the loaded model; everything else is a per-call generation setting
+LOAD_PARAMS = {
+    "model_path",
+    "lora_base",
+    "lora_path",
+    "n_ctx",
+    "n_parts",
+    "seed",
+    "f16_kv",
+    "logits_all",
+    "vocab_only",
+    "use_mlock",
+    "use_mmap",
+    "n_threads",
+    "n_threads_batch",
+    "n_batch",
+    "n_gpu_layers",
+    "rope_freq_scale",
+    "rope_freq_base",
+    "verbose",
+}
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process; 0 where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class LockedClient:
+    """Wraps a llama_cpp.Llama so generations from different threads run one at a time.
+
+    llama.cpp contexts are not thread-safe. Streaming calls take the lock on
+    the first next() and hold it until the stream is exhausted, closed or
+    dropped, so a stream that is never iterated holds nothing. The weights
+    are loaded on first use, so constructing agents stays cheap for commands
+    that never generate.
+    """
+
+    def __init__(self, load: Callable[[], Any], model: "LoadedModel"):
+        self._load = load
+        self._model = model
+
+    @property
+    def _client(self):
+        if self._model.llama is None:
+            self._load()
+        return self._model.llama
+
+    def _acquire(self) -> None:
+        start = time.perf_counter()
+        self._model.lock.acquire()
+        self._model.wait_seconds += time.perf_counter() - start
+        self._model.generations += 1
+
+    def __call__(self, *args, **kwargs):
+        client = self._client
+        if kwargs.get("stream"):
+            return self._stream(client, args, kwargs)
+        self._acquire()
+        try:
+            return client(*args, **kwargs)
+        finally:
+            self._model.lock.release()
+
+    def _stream(self, client, args, kwargs):
+        # Runs on the first next(): a generator that never started has no finally to run
+        self._acquire()
+        try:
+            yield from client(*args, **kwargs)
+        finally:
+            self._model.lock.release()
+
+    def tokenize(self, *args, **kwargs):
+        client = self._client
+        with self._model.lock:
+            return client.tokenize(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Private lookups (copy, pickle, hasattr probes) must not trigger a model load
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+
+@dataclass
+class LoadedModel:
+    path: str
+    load_params: Dict[str, Any]
+    client: Any = None
+    llama: Any = None
+    load_seconds: float = 0.0
+    rss_delta_bytes: int = 0
+    file_bytes: int = 0
+    handles: int = 0
+    generations: int = 0
+    wait_seconds: float = 0.0
+    lock: threading.RLock = field(default_factory=threading.RLock)
+
+
+def _load_llama(model_path: str, **load_params):
+    from langchain.llms import LlamaCpp
+
+    from src.utils.prefix_cache import with_prefix_cache
+
+    # Saved states only fit a model loaded with the same context settings
+    namespace = json.dumps([os.path.realpath(model_path), load_params], sort_keys=True, default=str)
+    return with_prefix_cache(LlamaCpp(model_path=model_path, **load_params).client, namespace)
+
+
+def _wrap_llama(client, model_path: str, **generation_params):
+    from langchain.llms import LlamaCpp
+
+    # construct() skips the validator that would load the weights again
+    return LlamaCpp.construct(model_path=model_path, client=client, **generation_params)
+
+
+class ModelPool:
+    """Process-wide registry that loads each GGUF model once and hands out shared handles.
+
+    Every get() for the same file returns a LangChain LLM bound to one
+    llama.cpp instance, memory-mapped by default and loaded on the first
+    generation unless lazy=False. The first caller's load settings (n_ctx,
+    n_gpu_layers, ...) win; generation settings (temperature, max_tokens,
+    ...) stay per handle.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[..., Any] = _load_llama,
+        wrapper: Callable[..., Any] = _wrap_llama,
+    ):
+        self.loader = loader
+        self.wrapper = wrapper
+        self.models: Dict[str, LoadedModel] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def get(self, model_path: Optional[str] = None, lazy: bool = True, **kwargs):
+        model_path = model_path or os.getenv("LLAMA_MODEL_PATH", DEFAULT_MODEL_PATH)
+        load_params = {k: v for k, v in kwargs.items() if k in LOAD_PARAMS}
+        generation_params = {k: v for k, v in kwargs.items() if k not in LOAD_PARAMS}
+        load_params.setdefault("use_mmap", True)
+        # Fail at construction like an eager LlamaCpp would, so callers can still fall back
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Llama model not found at {model_path}")
+
+        model = self._register(model_path, load_params)
+        if not lazy:
+            self._load(model)
+        model.handles += 1
+        return self.wrapper(model.client, model_path, **dict(model.load_params, **generation_params))
+
+    def _register(self, model_path: str, load_params: Dict[str, Any]) -> LoadedModel:
+        key = os.path.realpath(model_path)
+        with self._lock:
+            model = self.models.get(key)
+            if model is None:
+                model = LoadedModel(path=model_path, load_params=load_params)
+                model.client = LockedClient(lambda: self._load(model), model)
+                self.models[key] = model
+                self._loading[key] = threading.Lock()
+                return model
+
+        differing = {k: v for k, v in load_params.items() if model.load_params.get(k, v) != v}
+        if differing:
+            logger.warning(f"{model_path} already registered with {model.load_params}; ignoring {differing}")
+        return model
+
+    def _load(self, model: LoadedModel) -> None:
+        # Other models can load meanwhile; callers of the same model wait for the first load
+        with self._loading[os.path.realpath(model.path)]:
+            if model.llama is not None:
+                return
+
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            llama = self.loader(model.path, **model.load_params)
+            model.load_seconds = time.perf_counter() - start
+            model.rss_delta_bytes = max(_rss_bytes() - rss_before, 0)
+            model.file_bytes = os.path.getsize(model.path) if os.path.exists(model.path) else 0
+            model.llama = llama
+
+            logger.info(
+                f"Loaded {model.path} in {model.load_seconds:.1f}s "
+                f"(file {model.file_bytes / 2**30:.1f} GiB, RSS +{model.rss_delta_bytes / 2**20:.0f} MiB)"
+            )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            model.path: {
+                "loaded": model.llama is not None,
+                "load_seconds": round(model.load_seconds, 2),
+                "file_mb": round(model.file_bytes / 2**20, 1),
+                "rss_delta_mb": round(model.rss_delta_bytes / 2**20, 1),
+                "handles": model.handles,
+                "generations": model.generations,
+                "wait_seconds": round(model.wait_seconds, 2),
+            }
+            for model in self.models.values()
+        }
+
+
+_pool = ModelPool()
+
+
+def get_llm(model_path: Optional[str] = None, **kwargs):
+    """Return a LlamaCpp LLM backed by the process-wide shared model for model_path.
+
+    Accepts the same keyword arguments as langchain's LlamaCpp; pass
+    cache=False to skip the shared response cache for sampling calls. When
+    an inference server is configured (config/llm_server.json or
+    LLM_SERVER_URL), generations go to that server instead and no weights
+    are loaded in this process.
+    """
+    install_llm_cache()
+    from src.utils.inference_server import server_client
+
+    client = server_client()
+    if client is not None:
+        model_path = model_path or os.getenv("LLAMA_MODEL_PATH", DEFAULT_MODEL_PATH)
+        generation_params = {k: v for k, v in kwargs.items() if k not in LOAD_PARAMS}
+        llm = _pool.wrapper(client, model_path, **generation_params)
+    else:
+        llm = _pool.get(model_path, **kwargs)
+
+    # LlamaCpp reports no token usage, so the metrics callback counts with the model's tokenizer
+    if not llm.callbacks:
+        llm.callbacks = [metrics_callback(tokenizer=lambda text: len(llm.client.tokenize(text.encode("utf-8"))))]
+    return llm
+
+
+def model_stats() -> Dict[str, Dict[str, Any]]:
+    return _pool.stats()
+
+
+def log_model_stats(log: logging.Logger = logger) -> None:
+    for path, stats in model_stats().items():
+        log.info(
+            f"Model {path}: loaded in {stats['load_seconds']}s, RSS +{stats['rss_delta_mb']} MiB, "
+            f"{stats['handles']} handles, {stats['generations']} generations, "
+            f"{stats['wait_seconds']}s waiting for the model lock"
+        )
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "config/prefix_cache.json"
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "block_tokens": 64,
+    "min_hits": 2,
+    "memory_mb": 2048,
+    "disk_path": "data/cache/llm_states.db",
+    "disk_mb": 8192,
+    "state_mb": 512,
+}
+
+# Prefix hashes remembered for deciding which prefixes recur
+MAX_SEEN = 4096
+
+
+class PrefixStateCache:
+    """Bounded store of llama.cpp states, looked up by the longest matching token prefix.
+
+    Prompts are hashed at every block_tokens boundary. A state is saved
+    only once one of its prefixes has been seen min_hits times, so the
+    shared agent preambles are snapshotted while one-off prompts are not.
+    A saved state covers exactly the recurring prefix; states larger than
+    max_state_bytes are skipped. States live in an LRU memory tier and, if
+    a DiskCache is given, spill to disk where they survive restarts.
+    """
+
+    def __init__(
+        self,
+        block_tokens: int = 64,
+        min_hits: int = 2,
+        max_memory_bytes: int = 2 * 1024**3,
+        disk: Optional[DiskCache] = None,
+        max_state_bytes: int = 512 * 1024**2,
+    ):
+        self.block_tokens = block_tokens
+        self.min_hits = min_hits
+        self.max_memory_bytes = max_memory_bytes
+        self.max_state_bytes = max_state_bytes
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+        self.reused_tokens = 0
+        self._states: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._prefixes: Dict[str, str] = {}
+        self._seen: "OrderedDict[str, int]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH) -> Optional["PrefixStateCache"]:
+        config = dict(DEFAULT_CONFIG)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                config.update(json.load(f))
+
+        if not config["enabled"] or os.getenv("LLM_PREFIX_CACHE", "").lower() in ("0", "off", "false"):
+            return None
+
+        disk = (
+            DiskCache(config["disk_path"], max_bytes=int(config["disk_mb"] * 1024**2)) if config["disk_path"] else None
+        )
+        return cls(
+            block_tokens=config["block_tokens"],
+            min_hits=config["min_hits"],
+            max_memory_bytes=int(config["memory_mb"] * 1024**2),
+            disk=disk,
+            max_state_bytes=int(config["state_mb"] * 1024**2),
+        )
+
+    def prefix_keys(self, namespace: str, tokens: Sequence[int]) -> List[Tuple[int, str]]:
+        """(length, hash) of each block-aligned prefix, longest first.
+
+        The last token is never part of a prefix: llama.cpp needs at least
+        one token to evaluate for fresh logits.
+        """
+        digest = hashlib.sha256(namespace.encode())
+        keys = []
+        for end in range(self.block_tokens, len(tokens), self.block_tokens):
+            digest.update(array("q", tokens[end - self.block_tokens : end]).tobytes())
+            keys.append((end, digest.hexdigest()))
+        return keys[::-1]
+
+    def lookup(self, keys: List[Tuple[int, str]], min_length: int = 0) -> Optional[Tuple[int, Any]]:
+        """Longest cached (prefix length, state) longer than min_length"""
+        candidates = [(length, key) for length, key in keys if length > min_length]
+        if not candidates:
+            return None
+        for length, key in candidates:
+            state = self._get(key)
+            if state is not None:
+                self.hits += 1
+                self.reused_tokens += length
+                return length, state
+        self.misses += 1
+        return None
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            state_id = self._prefixes.get(key)
+            if state_id in self._states:
+                self._states.move_to_end(state_id)
+                return self._states[state_id][0]
+        if self.disk is None:
+            return None
+
+        pointer = self.disk.get(f"prefix:{key}")
+        blob = self.disk.get(f"state:{pointer[0].decode()}") if pointer else None
+        if blob is None:
+            return None
+        state = pickle.loads(blob[0])
+        self._remember(pointer[0].decode(), state, len(blob[0]), [key])
+        return state
+
+    def should_save(self, keys: List[Tuple[int, str]]) -> List[str]:
+        """Count this prompt's prefixes; return the recurring ones that have no state yet"""
+        recurring = []
+        with self._lock:
+            for _, key in keys:
+                count = self._seen.pop(key, 0) + 1
+                self._seen[key] = count
+                if count >= self.min_hits and key not in self._prefixes:
+                    recurring.append(key)
+            while len(self._seen) > MAX_SEEN:
+                self._seen.popitem(last=False)
+        return recurring
+
+    def store(self, keys: List[str], state: Any) -> bool:
+        """Save a state for the given prefix hashes; False if it is over the per-state cap"""
+        blob = pickle.dumps(state)
+        if len(blob) > self.max_state_bytes:
+            logger.debug(f"Skipping prefix state of {len(blob)} bytes")
+            return False
+        state_id = hashlib.sha256(blob).hexdigest()
+        self._remember(state_id, state, len(blob), keys)
+        self.saved += 1
+        if self.disk is not None:
+            self.disk.set(f"state:{state_id}", blob)
+            for key in keys:
+                self.disk.set(f"prefix:{key}", state_id.encode())
+        return True
+
+    def _remember(self, state_id: str, state: Any, size: int, keys: List[str]) -> None:
+        with self._lock:
+            if state_id not in self._states:
+                self._states[state_id] = (state, size)
+                self._memory_bytes += size
+            for key in keys:
+                self._prefixes[key] = state_id
+            while self._memory_bytes > self.max_memory_bytes and len(self._states) > 1:
+                evicted, (_, evicted_size) = self._states.popitem(last=False)
+                self._memory_bytes -= evicted_size
+                self._prefixes = {key: kept for key, kept in self._prefixes.items() if kept != evicted}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "states": len(self._states),
+            "memory_bytes": self._memory_bytes,
+            "saved": self.saved,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "reused_tokens": self.reused_tokens,
+        }
+
+
+class PrefixCachingLlama:
+    """Wraps a llama_cpp.Llama so calls start from a cached state for their prompt prefix.
+
+    Not thread-safe on its own; ModelPool's LockedClient and the inference
+    server's batcher already serialize calls to one model.
+    """
+
+    def __init__(self, llama, cache: PrefixStateCache, namespace: str = ""):
+        self.llama = llama
+        self.cache = cache
+        self.namespace = namespace
+
+    def _loaded_prefix(self, tokens: Sequence[int]) -> int:
+        """How many leading tokens of the prompt the context already holds"""
+        loaded = list(getattr(self.llama, "input_ids", [])[: getattr(self.llama, "n_tokens", 0)])
+        length = 0
+        for current, wanted in zip(loaded, tokens):
+            if current != wanted:
+                break
+            length += 1
+        return length
+
+    def __call__(self, prompt: str, stream: bool = False, **kwargs):
+        tokens = self.llama.tokenize(prompt.encode("utf-8"))
+        keys = self.cache.prefix_keys(self.namespace, tokens)
+        hit = self.cache.lookup(keys, min_length=self._loaded_prefix(tokens))
+        if hit is not None:
+            self.llama.load_state(hit[1])
+
+        self._save(tokens, keys)
+        return self.llama(prompt, stream=stream, **kwargs)
+
+    def _save(self, tokens: Sequence[int], keys: List[Tuple[int, str]]) -> None:
+        """Snapshot the longest recurring prefix before generation, so the state holds no completion.
+
+        Only the prefix tokens are evaluated here; the model call that follows
+        finds them already in the context and evaluates just the suffix. A
+        failed snapshot is logged and never fails the call.
+        """
+        recurring = self.cache.should_save(keys)
+        if not recurring:
+            return
+        length = max(end for end, key in keys if key in recurring)
+        try:
+            loaded = self._loaded_prefix(tokens[:length])
+            self.llama.n_tokens = loaded
+            self.llama.eval(tokens[loaded:length])
+            self.cache.store(recurring, self.llama.save_state())
+        except Exception as e:
+            logger.warning(f"Could not save prefix state: {e}")
+
+    def __getattr__(self, name):
+        return getattr(self.llama, name)
+
+
+_lock = threading.Lock()
+_prefix_cache: Optional[PrefixStateCache] = None
+_configured = False
+
+
+def with_prefix_cache(llama, namespace: str, config_path: str = DEFAULT_CONFIG_PATH):
+    """Wrap a loaded model with the process-wide prefix state cache, if enabled and supported"""
+    global _configured, _prefix_cache
+    with _lock:
+        if not _configured:
+            _configured = True
+            _prefix_cache = PrefixStateCache.from_config(config_path)
+    if _prefix_cache is None or not all(hasattr(llama, name) for name in ("eval", "save_state")):
+        return llama
+    return PrefixCachingLlama(llama, _prefix_cache, namespace)
+
+
+def prefix_cache_stats() -> Dict[str, Any]:
+    if _prefix_cache is None:
+        return {"enabled": False}
+    return dict(_prefix_cache.stats(), enabled=True)
+
+
+def log_prefix_cache_stats(log: logging.Logger = logger) -> None:
+    stats = prefix_cache_stats()
+    if not stats["enabled"]:
+        return
+    log.info(
+        f"Prefix state cache: {stats['hits']} hits, {stats['misses']} misses, "
+        f"{stats['reused_tokens']} prompt tokens reused, {stats['states']} states / "
+        f"{stats['memory_bytes'] / 2**20:.0f} MiB in memory"
+    )
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from src.utils.disk_cache import DiskCache
+
+DEFAULT_CONFIG_PATH = "config/github_cache.json"
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "path": "data/cache/github_responses.db",
+    "max_size_mb": 64,
+    "default_ttl": 60,
+    "ttl_rules": [],
+}
+
+
+class CachedResponse:
+    """Mimics the httplib-style response object PyGithub's Requester expects"""
+
+    def __init__(self, status: int, headers: Dict[str, str], text: str):
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self) -> str:
+        return self.text
+
+
+class ResponseCache:
+    """Conditional-request cache for GitHub REST GET responses.
+
+    Entries younger than the TTL of their endpoint are served without touching
+    the network. Older entries are revalidated with If-None-Match /
+    If-Modified-Since, so unchanged resources come back as 304s, which GitHub
+    does not count against the rate limit. A TTL of -1 bypasses the cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: int = 60,
+        ttl_rules: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.store = DiskCache(path, max_bytes=max_bytes)
+        self.default_ttl = default_ttl
+        self.ttl_rules = [(re.compile(rule["pattern"]), rule["ttl"]) for rule in ttl_rules or []]
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @classmethod
+    def from_config(cls, config_path: str = DEFAULT_CONFIG_PATH) -> Optional["ResponseCache"]:
+        """Build a cache from config/github_cache.json, or None if caching is disabled"""
+        config = dict(DEFAULT_CONFIG)
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                config.update(json.load(f))
+
+        if not config["enabled"] or os.getenv("GITHUB_CACHE", "").lower() in ("0", "off", "false"):
+            return None
+
+        return cls(
+            os.getenv("GITHUB_CACHE_PATH", config["path"]),
+            max_bytes=int(config["max_size_mb"] * 1024 * 1024),
+            default_ttl=config["default_ttl"],
+            ttl_rules=config["ttl_rules"],
+        )
+
+    def ttl_for(self, url: str) -> int:
+        """Return the freshness window in seconds for a request path"""
+        path = url.split("?", 1)[0]
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key(url: str, headers: Dict[str, str]) -> str:
+        # Scope entries to the credentials used so tokens never see each other's data
+        auth = headers.get("Authorization", "")
+        fingerprint = hashlib.sha256(auth.encode()).hexdigest()[:12]
+        return f"{fingerprint}:{url}"
+
+    @staticmethod
+    def scope_prefix(url: str, headers: Dict[str, str]) -> Optional[str]:
+        """Return the key prefix covering every cached listing of the repository in url"""
+        match = re.match(r"(/api/v3)?/repos/[^/]+/[^/?]+", url)
+        if not match:
+            return None
+        return ResponseCache.key(match.group(0), headers)
+
+    def lookup(self, url: str, headers: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for url with a 'fresh' flag, or None"""
+        ttl = self.ttl_for(url)
+        if ttl < 0:
+            self.bypassed += 1
+            return None
+
+        cached = self.store.get(self.key(url, headers))
+        if cached is None:
+            return None
+
+        body, meta, stored_at = cached
+        entry = json.loads(meta)
+        entry["body"] = body
+        entry["fresh"] = time.time() - stored_at < ttl
+        return entry
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry["headers"].get("etag"):
+            headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return headers
+
+    def store_response(self, url: str, request_headers: Dict[str, str], status: int, headers, body: str) -> None:
+        response_headers = {k.lower(): v for k, v in headers}
+        if "etag" not in response_headers and "last-modified" not in response_headers and self.ttl_for(url) <= 0:
+            return
+        meta = json.dumps({"status": status, "headers": response_headers})
+        self.store.set(self.key(url, request_headers), body, meta)
+
+    def refresh(self, url: str, request_headers: Dict[str, str], entry: Dict[str, Any], headers) -> None:
+        """Record a 304 by merging the new headers (rate limit, date) and resetting the TTL"""
+        entry["headers"].update({k.lower(): v for k, v in headers})
+        meta = json.dumps({"status": entry["status"], "headers": entry["headers"]})
+        self.store.update_meta(self.key(url, request_headers), meta)
+
+    def invalidate(self, url: str, request_headers: Dict[str, str]) -> None:
+        """Drop cached listings of a repository after a write to it"""
+        prefix = self.scope_prefix(url, request_headers)
+        if prefix:
+            self.store.delete(prefix)
+            self.store.delete_prefix(prefix + "/")
+            self.store.delete_prefix(prefix + "?")
+
+    def stats(self) -> Dict[str, Any]:
+        served = self.fresh_hits + self.revalidated
+        lookups = served + self.misses
+        stats = self.store.stats()
+        stats.update(
+            {
+                "fresh_hits": self.fresh_hits,
+                "revalidated_304": self.revalidated,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+            }
+        )
+        del stats["hits"]
+        return stats
@@ -2,8 +2,6 @@ import logging
 import sys
 from typing import Dict, List
 
-import pkg_resources
-
 
 class VersionChecker:
     def __init__(self):
@@ -31,6 +29,9 @@ class VersionChecker:
 
     def check_package_versions(self) -> Dict[str, bool]:
         """Check if installed packages meet version requirements"""
+        # pkg_resources scans every installed distribution on import; only pay for it here
+        import pkg_resources
+
 # results
         for package, required_version in self.required_versions.items():
             if package == "python":
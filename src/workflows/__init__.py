@@ -1,7 +1,29 @@
 """Initialization for workflows module."""
 
-from .github_tracker import GitHubTracker
-from .status_updater import StatusUpdater
-from .weekly_reviewer import WeeklyReviewer
+import importlib
+from typing import TYPE_CHECKING
 
 # __all__
+
+# Exports are imported on first access, so `python -m src.workflows.status_updater`
+# does not pull in crewai and langchain through WeeklyReviewer
+_EXPORTS = {
+    "GitHubTracker": ".github_tracker",
+    "StatusUpdater": ".status_updater",
+    "WeeklyReviewer": ".weekly_reviewer",
+}
+
+if TYPE_CHECKING:
+    from .github_tracker import GitHubTracker
+    from .status_updater import StatusUpdater
+    from .weekly_reviewer import WeeklyReviewer
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
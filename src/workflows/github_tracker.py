@@ -1,13 +1,24 @@
-from github import Github
+from src.utils.github_client import get_github
+from src.utils.repository_counts import RepositoryCountsFetcher
 
 
 class GitHubTracker:
     def __init__(self, token):
-        self.github = Github(token)
+        self.github = get_github(token)
+        self.counts_fetcher = RepositoryCountsFetcher(token)
 
     def track_repository(self, repo_name):
+        counts = self.counts_fetcher.get(repo_name)
+        if counts:
+            return {"issues": counts["open_issues"], "prs": counts["open_prs"]}
+
 # repo
         return {
             "issues": repo.get_issues(state="open").totalCount,
             "prs": repo.get_pulls(state="open").totalCount,
         }
+
+    def track_repositories(self, repo_names):
+        """Track several repositories with one batched count query"""
+        self.counts_fetcher.fetch(repo_names)
+        return {repo_name: self.track_repository(repo_name) for repo_name in repo_names}
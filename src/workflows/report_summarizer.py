@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "data/cache/review_summaries.db"
+
+# About 1500 tokens: leaves room for the instructions and the answer in a 4096-token context
+MAX_CHUNK_CHARS = 6000
+
+# Bump when the prompts change so cached summaries are not reused across prompt versions
+PROMPT_VERSION = "1"
+
+CHUNK_PROMPT = (
+    "Summarize the activity of repository {repo} on {day} in 2-3 sentences. "
+    "Mention changes in open issues, open pull requests and commits, and anything unusual.\n\n"
+    "Snapshots (time: open issues / open PRs / commits / last updated):\n{body}\n\nSummary:"
+)
+
+REDUCE_PROMPT = (
+    "Combine these summaries of a week of repository activity into one concise summary. "
+    "Keep per-repository highlights, trends and risks; drop repetition.\n\n{body}\n\nCombined summary:"
+)
+
+
+@dataclass
+class ReportChunk:
+    repo: str
+    day: str
+    text: str
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(f"{PROMPT_VERSION}\0{self.repo}\0{self.day}\0{self.text}".encode()).hexdigest()
+
+
+def _repositories(report: Dict[str, Any]) -> Dict[str, dict]:
+    """Per-repository entries of a status report, in either the flat or the {"repositories": ...} layout"""
+    repositories = report.get("repositories", report)
+    return {name: status for name, status in repositories.items() if isinstance(status, dict)}
+
+
+def chunk_reports(reports: List[Dict[str, Any]], max_chars: int = MAX_CHUNK_CHARS) -> List[ReportChunk]:
+    """Group status snapshots into one chunk per repository and day.
+
+    Snapshots that repeat the previous one are dropped, so a repository costs
+    one line per change however often the status updater runs, and nothing
+    on days it did not change. Days with more lines than fit in max_chars
+    are split.
+    """
+    lines: Dict[tuple, List[str]] = {}
+    last: Dict[str, tuple] = {}
+    for report in sorted(reports, key=lambda report: report.get("timestamp", "")):
+        timestamp = report.get("timestamp")
+        when = datetime.fromisoformat(timestamp) if timestamp else None
+        for repo, status in sorted(_repositories(report).items()):
+            values = (
+                status.get("open_issues"),
+                status.get("open_prs"),
+                status.get("last_commit"),
+                status.get("last_updated"),
+            )
+            if last.get(repo) == values:
+                continue
+            last[repo] = values
+            day = when.date().isoformat() if when else "unknown"
+            clock = when.strftime("%H:%M") if when else "--:--"
+            lines.setdefault((repo, day), []).append(f"{clock}: {' / '.join(str(value) for value in values)}")
+
+    chunks = []
+    for (repo, day), day_lines in sorted(lines.items()):
+        text = ""
+        for line in day_lines:
+            if text and len(text) + len(line) + 1 > max_chars:
+                chunks.append(ReportChunk(repo, day, text))
+                text = ""
+            text = f"{text}\n{line}" if text else line
+        chunks.append(ReportChunk(repo, day, text))
+    return chunks
+
+
+def model_identity(llm) -> str:
+    """What a cached answer depends on besides the prompt: a LangChain LLM's model path and sampling params"""
+    params = getattr(llm, "_identifying_params", None)
+    if isinstance(params, dict):
+        return json.dumps(params, sort_keys=True, default=str)
+    return type(llm).__name__
+
+
+class ReportSummarizer:
+    """Map-reduce summary of a week of status reports that fits a small LLM context.
+
+    Chunks (one repository-day each) are summarized in parallel, then the
+    summaries are combined in rounds of prompts no longer than max_chars
+    until one remains. Every LLM answer is cached on disk by a hash of its
+    input and the model that produced it (model_identity(llm) unless model
+    is given), so re-running the weekly review only summarizes chunks whose
+    snapshots changed, plus the reduce steps above them.
+    """
+
+    def __init__(
+        self,
+        llm,
+        cache_path: str = DEFAULT_CACHE_PATH,
+        max_workers: Optional[int] = None,
+        max_chars: int = MAX_CHUNK_CHARS,
+        model: Optional[str] = None,
+    ):
+        self.llm = llm
+        self.model = hashlib.sha256((model or model_identity(llm)).encode()).hexdigest()[:16]
+        self.cache = DiskCache(cache_path, max_bytes=32 * 1024 * 1024)
+        self.max_workers = max_workers or int(os.getenv("REVIEW_MAX_WORKERS", "4"))
+        self.max_chars = max_chars
+        self.generated = 0
+
+    def _complete(self, key: str, prompt: str) -> str:
+        key = f"{key}:{self.model}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0].decode()
+        summary = str(self.llm(prompt)).strip()
+        self.generated += 1
+        self.cache.set(key, summary.encode())
+        return summary
+
+    def summarize_chunk(self, chunk: ReportChunk) -> str:
+        prompt = CHUNK_PROMPT.format(repo=chunk.repo, day=chunk.day, body=chunk.text)
+        return f"{chunk.repo} ({chunk.day}): {self._complete('chunk:' + chunk.key, prompt)}"
+
+    def map(self, chunks: List[ReportChunk]) -> List[str]:
+        if self.max_workers <= 1 or len(chunks) <= 1:
+            return [self.summarize_chunk(chunk) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.summarize_chunk, chunks))
+
+    def _groups(self, summaries: List[str]) -> List[List[str]]:
+        # Capping each input at half the budget puts at least two in every group, so each round shrinks
+        limit = self.max_chars // 2
+        groups, current, size = [], [], 0
+        for summary in summaries:
+            summary = summary[:limit]
+            if current and size + len(summary) > self.max_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(summary)
+            size += len(summary)
+        if current:
+            groups.append(current)
+        return groups
+
+    def _combine(self, group: List[str]) -> str:
+        body = "\n\n".join(group)
+        key = "reduce:" + hashlib.sha256(f"{PROMPT_VERSION}\0{body}".encode()).hexdigest()
+        return self._complete(key, REDUCE_PROMPT.format(body=body))
+
+    def reduce(self, summaries: List[str]) -> str:
+        while len(summaries) > 1:
+            groups = self._groups(summaries)
+            if len(groups) == 1:
+                return self._combine(groups[0])
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+                summaries = list(executor.map(self._combine, groups))
+        return summaries[0] if summaries else ""
+
+    def summarize(self, reports: List[Dict[str, Any]]) -> str:
+        chunks = chunk_reports(reports, self.max_chars)
+        if not chunks:
+            return "No status reports this week."
+        generated = self.generated
+        summary = self.reduce(self.map(chunks))
+        logger.info(f"Weekly summary from {len(chunks)} chunks, {self.generated - generated} LLM calls")
+        return summary
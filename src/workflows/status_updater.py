@@ -2,12 +2,15 @@ import json
 import os
 from datetime import datetime
 
-from github import Github
+from src.monitoring.retention import add_to_index
+from src.utils.github_client import get_github
+from src.utils.repository_counts import RepositoryCountsFetcher
 
 
 class StatusUpdater:
     def __init__(self):
-        self.github = Github(os.getenv("GHUB_TOKEN"))
+        self.github = get_github()
+        self.counts_fetcher = RepositoryCountsFetcher(os.getenv("GHUB_TOKEN"))
         self.base_path = "status"
 
     def update_project_status(self):
@@ -15,6 +18,9 @@ class StatusUpdater:
 # repositories
 # status_report
 
+        # One GraphQL query per batch of repositories instead of 3 REST calls each
+        self.counts_fetcher.fetch(repo.full_name for repo in repositories)
+
         for repo in repositories:
 # status
             status_report[repo.name] = status
@@ -23,9 +29,18 @@ class StatusUpdater:
 
     def get_active_repositories(self):
 # user
-        return user.get_repos()
+        return list(user.get_repos())
 
     def analyze_repository(self, repo):
+        counts = self.counts_fetcher.cached(repo.full_name)
+        if counts:
+            return {
+                "open_issues": counts["open_issues"],
+                "open_prs": counts["open_prs"],
+                "last_commit": counts["commits"],
+                "last_updated": counts["updated_at"].isoformat(),
+            }
+
         return {
             "open_issues": repo.get_issues(state="open").totalCount,
             "open_prs": repo.get_pulls(state="open").totalCount,
@@ -40,6 +55,7 @@ class StatusUpdater:
 # filename
         with open(filename, "w") as f:
             json.dump(report, f, indent=2)
+        add_to_index(self.base_path, filename)
 
 
 if __name__ == "__main__":
@@ -3,18 +3,23 @@ import os
 from datetime import datetime, timedelta
 
 from crewai import Agent
-from langchain.llms import LlamaCpp
+
+from src.monitoring.retention import indexed_files
+from src.reporting.weekly_metrics import compute_weekly_metrics, format_for_prompt, load_status_history
+from src.utils.model_pool import get_llm
+from src.workflows.report_summarizer import ReportSummarizer
 
 
 class WeeklyReviewer:
     def __init__(self):
 # model_path
-        self.llm = LlamaCpp(
+        self.llm = get_llm(
 # model_path
 # temperature
 # max_tokens
 # n_ctx
         )
+        self.summarizer = ReportSummarizer(self.llm)
         self.setup_agents()
 
     def setup_agents(self):
@@ -35,25 +40,61 @@ class WeeklyReviewer:
 # status_path
         week_ago = datetime.now() - timedelta(days=7)
 
-        for filename in os.listdir(status_path):
+        # The retention index lists what is left after compaction, so this stays bounded
+        for filename in indexed_files(status_path, prefix="status_", since=week_ago):
             if filename.startswith("status_"):
 # file_date
                 if file_date >= week_ago:
                     with open(os.path.join(status_path, filename)) as f:
-                        reports.append(json.load(f))
+                        report = json.load(f)
+                    # Status files are keyed by repository; the snapshot time is only in the file name
+                    if "timestamp" not in report:
+                        report = {"timestamp": file_date.isoformat(), "repositories": report}
+                    reports.append(report)
 
         return reports
 
     def analyze_reports(self, reports):
+        metrics = self.compute_metrics(reports)
         return {
             "period": {
                 "start": (datetime.now() - timedelta(days=7)).isoformat(),
                 "end": datetime.now().isoformat(),
             },
+            "metrics": metrics["metrics"],
+            "metric_deltas": metrics["deltas"],
+            "repository_metrics": metrics["repositories"],
             "summary": self.generate_summary(reports),
-            "recommendations": self.generate_recommendations(reports),
+            "recommendations": self.generate_recommendations(reports, metrics),
         }
 
+    def compute_metrics(self, reports):
+        """Velocity, completion and bug rates with week-over-week deltas, computed without the LLM"""
+        week_ago = datetime.now() - timedelta(days=7)
+        # The previous week only supplies the baseline for the deltas
+        previous = [
+            report
+            for report in load_status_history("status", since=week_ago - timedelta(days=7))
+            if report["timestamp"] and datetime.fromisoformat(report["timestamp"]) < week_ago
+        ]
+        return compute_weekly_metrics(previous + reports)
+
+    def generate_summary(self, reports):
+        """Map-reduce summary; only repository-days whose snapshots changed since the last run hit the LLM"""
+        return self.summarizer.summarize(reports)
+
+    def generate_recommendations(self, reports, metrics=None):
+        # The summary comes back from the summarizer's cache when analyze_reports already built it
+        summary = self.summarizer.summarize(reports)
+        numbers = format_for_prompt(metrics or self.compute_metrics(reports))
+        return str(
+            self.llm(
+                "Based on these weekly metrics and this summary of the past week across all repositories, list "
+                "the 3-5 most important recommendations for next week, one per line.\n\n"
+                f"Metrics:\n{numbers}\n\nSummary:\n{summary}\n\nRecommendations:"
+            )
+        ).strip()
+
     def save_weekly_review(self, review):
 # weekly_path
         if not os.path.exists(weekly_path):
@@ -0,0 +1,92 @@
+import itertools
+
+import numpy as np
+
+from src.assignment.capacity_solver import benchmark, plan_assignments, score_matrix, solve
+
+
+def brute_force(scores, capacities):
+    best = -1.0
+    issues, developers = scores.shape
+    for choice in itertools.product(range(-1, developers), repeat=issues):
+        counts = np.bincount([c for c in choice if c >= 0], minlength=developers)
+        if np.all(counts <= capacities):
+            best = max(best, sum(scores[i, c] for i, c in enumerate(choice) if c >= 0))
+    return best
+
+
+def total(scores, assignment):
+    return sum(scores[i, c] for i, c in enumerate(assignment) if c >= 0)
+
+
+def test_score_matrix_sums_developer_skill_counts():
+    scores = score_matrix(
+        [["python", "api"], ["react"], ["rust"]], {"ana": {"python": 3, "api": 1}, "bo": {"react": 2}}
+    )
+
+    assert scores.tolist() == [[4.0, 0.0], [0.0, 2.0], [0.0, 0.0]]
+
+
+def test_greedy_favourite_is_capped_by_capacity():
+    # ana is the best match for every issue but can only take two
+    scores = np.array([[5.0, 1.0], [4.0, 3.0], [3.0, 0.0]])
+
+    assignment = solve(scores, [2, 2])
+
+    assert np.bincount(assignment, minlength=2).tolist() == [2, 1]
+    assert total(scores, assignment) == 11.0
+
+
+def test_matches_brute_force_optimum():
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        scores = rng.integers(0, 6, size=(5, 3)).astype(float)
+        capacities = rng.integers(0, 3, size=3)
+
+        assignment = solve(scores, capacities)
+
+        assert np.all(np.bincount(assignment[assignment >= 0], minlength=3) <= capacities)
+        assert total(scores, assignment) == brute_force(scores, capacities)
+
+
+def test_more_issues_than_slots_keeps_best_issues():
+    scores = np.array([[1.0], [9.0], [2.0], [8.0]])
+
+    assignment = solve(scores, [2])
+
+    assert assignment.tolist() == [-1, 0, -1, 0]
+
+
+def test_equal_scores_spread_load():
+    assignment = solve(np.zeros((4, 2)), [4, 4])
+
+    assert np.bincount(assignment).tolist() == [2, 2]
+
+
+def test_plan_respects_critical_limits():
+    developer_skills = {"ana": {"backend": 5}, "bo": {"backend": 1}}
+    issue_skills = [["backend"], ["backend"], ["backend"]]
+
+    plan = plan_assignments(
+        issue_skills,
+        developer_skills,
+        capacities={"ana": 3, "bo": 3},
+        critical=[True, True, False],
+        critical_capacities={"ana": 1, "bo": 1},
+    )
+
+    assert sorted(plan[:2]) == ["ana", "bo"]
+    assert plan[2] == "ana"
+
+
+def test_plan_leaves_issues_unassigned_at_capacity():
+    plan = plan_assignments([["x"], ["x"]], {"ana": {"x": 1}}, capacities={"ana": 1})
+
+    assert plan.count("ana") == 1
+    assert plan.count(None) == 1
+
+
+def test_benchmark_assigns_every_slot():
+    result = benchmark(issues=500, developers=10, capacity=5)
+
+    assert result["assigned"] == 50
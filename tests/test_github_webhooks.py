@@ -0,0 +1,168 @@
+import copy
+import hashlib
+import hmac
+import json
+import os
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.database.issue_mirror import IssueMirror
+from src.integrations import github_webhooks
+from src.integrations.github_webhooks import WebhookProcessor, WebhookQueue, follow, verify_signature
+from src.monitoring.alert_manager import AlertManager
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "webhooks")
+REPO = "ZubeidHendricks/project-orchestrator"
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), "r") as f:
+        return json.load(f)
+
+
+def sign(secret, body):
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def test_verify_signature():
+    body = b'{"zen": "Keep it logically awesome."}'
+
+    assert verify_signature("s3cret", body, sign("s3cret", body))
+    assert not verify_signature("s3cret", body, sign("other", body))
+    assert not verify_signature("s3cret", body, None)
+    assert not verify_signature("", body, sign("", body))
+
+
+def test_queue_deduplicates_redeliveries(tmp_path):
+    queue = WebhookQueue(str(tmp_path / "queue.db"))
+
+    assert queue.append("delivery-1", "issues", {"action": "opened"})
+    assert not queue.append("delivery-1", "issues", {"action": "opened"})
+    assert queue.depth() == 1
+
+
+class TestWebhookProcessor:
+    @pytest.fixture
+    def mirror(self, tmp_path):
+        return IssueMirror(str(tmp_path / "mirror.db"))
+
+    @pytest.fixture
+    def processor(self, mirror):
+        return WebhookProcessor(mirror)
+
+    def test_issue_event_updates_mirror(self, processor, mirror):
+        assert processor.apply("issues", load_fixture("issues_opened.json")) == REPO
+
+        issue = mirror.get(REPO, 42)
+        assert issue.state == "open"
+        assert issue.assignee.login == "dev2_username"
+        assert issue.label_names == ["backend", "priority-high"]
+        assert issue.created_at == datetime(2024, 12, 27, 6, 10, 24)
+
+    def test_older_payload_does_not_overwrite_newer_state(self, processor, mirror):
+        opened = load_fixture("issues_opened.json")
+        closed = copy.deepcopy(opened)
+        closed["issue"].update(state="closed", updated_at="2024-12-28T09:00:00Z", closed_at="2024-12-28T09:00:00Z")
+
+        processor.apply("issues", closed)
+        # Redelivery of the earlier "opened" event arrives second
+        processor.apply("issues", opened)
+
+        issue = mirror.get(REPO, 42)
+        assert issue.state == "closed"
+        assert issue.updated_at == datetime(2024, 12, 28, 9, 0, 0)
+        assert mirror.count(REPO, state="open") == 0
+
+    def test_pull_request_event_is_flagged(self, processor, mirror):
+        processor.apply("pull_request", load_fixture("pull_request_closed.json"))
+
+        assert mirror.count(REPO, state="closed", pull_requests=True) == 1
+        assert mirror.count(REPO, state="closed", pull_requests=False) == 0
+
+    def test_workflow_and_deployment_events_recorded(self, processor, mirror):
+        processor.apply("workflow_run", load_fixture("workflow_run_completed.json"))
+        processor.apply("deployment_status", load_fixture("deployment_status_success.json"))
+
+        assert mirror.workflow_runs(REPO)[0]["conclusion"] == "failure"
+        assert mirror.latest_deployment(REPO)["state"] == "success"
+
+    def test_drain_applies_in_order_and_notifies(self, tmp_path, processor, mirror):
+        queue = WebhookQueue(str(tmp_path / "queue.db"))
+        queue.append("d1", "issues", load_fixture("issues_opened.json"))
+        queue.append("d2", "pull_request", {"repository": {"full_name": REPO}})
+        seen = []
+        processor.subscribe(lambda event, repo, payload: seen.append(event))
+        since = datetime.utcnow()
+
+        # The malformed pull_request delivery is recorded as failed without blocking the queue
+        assert processor.drain(queue) == 2
+        assert queue.depth() == 0
+        assert seen == ["issues"]
+        assert mirror.changed_repositories(since) == [REPO]
+
+    def test_follow_rechecks_changes_drained_elsewhere(self, tmp_path, processor, mirror, monkeypatch):
+        queue = WebhookQueue(str(tmp_path / "queue.db"))
+        alert_manager = Mock()
+        alert_manager.check_changed_repositories.side_effect = lambda mirror, since: rechecked.append(
+            mirror.changed_repositories(since)
+        )
+        rechecked = []
+        # The webhook endpoint applies a delivery inline during the follower's first sleep
+        deliveries = [load_fixture("issues_opened.json")]
+
+        def sleep(seconds):
+            while deliveries:
+                processor.apply("issues", deliveries.pop())
+
+        monkeypatch.setattr(github_webhooks.time, "sleep", sleep)
+
+        follow(queue, processor, alert_manager, iterations=3)
+
+        assert rechecked == [[], [REPO], []]
+
+    def test_alert_issues_do_not_count_towards_thresholds(self, processor, mirror):
+        mirror._set_watermark(REPO, None)
+        for number in range(1, 14):
+            payload = copy.deepcopy(load_fixture("issues_opened.json"))
+            labels = [{"name": "alert"}] if number > 10 else []
+            payload["issue"].update(number=number, labels=labels)
+            processor.apply("issues", payload)
+        manager = AlertManager.__new__(AlertManager)
+        manager.thresholds = {"open_issues": 10, "open_prs": 5}
+        manager.process_alerts = Mock()
+
+        # Ten open issues plus three alert issues filed by the manager itself
+        assert manager.check_changed_repositories(mirror, datetime(2024, 1, 1)) == []
+
+        payload = copy.deepcopy(load_fixture("issues_opened.json"))
+        payload["issue"].update(number=14, labels=[])
+        processor.apply("issues", payload)
+        [alert] = manager.check_changed_repositories(mirror, datetime(2024, 1, 1))
+        assert (alert["type"], alert["count"]) == ("high_issues", 11)
+
+
+def test_flask_endpoint(tmp_path, monkeypatch):
+    flask = pytest.importorskip("flask")
+    backend = os.path.join(os.path.dirname(__file__), "..", "project-management-interface", "backend")
+    monkeypatch.syspath_prepend(os.path.abspath(backend))
+    from webhooks import webhooks
+
+    app = flask.Flask(__name__)
+    app.config.update(
+        GITHUB_WEBHOOK_SECRET="s3cret",
+        WEBHOOK_QUEUE_PATH=str(tmp_path / "queue.db"),
+        ISSUE_MIRROR_PATH=str(tmp_path / "mirror.db"),
+    )
+    app.register_blueprint(webhooks)
+    client = app.test_client()
+    body = json.dumps(load_fixture("issues_opened.json")).encode()
+    headers = {"X-GitHub-Event": "issues", "X-GitHub-Delivery": "d1", "Content-Type": "application/json"}
+
+    assert client.post("/webhooks/github", data=body, headers=headers).status_code == 401
+
+    headers["X-Hub-Signature-256"] = sign("s3cret", body)
+    assert client.post("/webhooks/github", data=body, headers=headers).get_json()["status"] == "queued"
+    assert client.post("/webhooks/github", data=body, headers=headers).get_json()["status"] == "duplicate"
+    assert client.get("/webhooks/github/status").get_json() == {"pending": 0}
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("crewai", "langchain", "llama_cpp", "pkg_resources", "sklearn")
+
+# Cumulative import time budget in seconds, generous enough for slow CI machines
+BUDGET = 1.0
+
+
+def import_profile(module):
+    """Import a module in a fresh interpreter; return (cumulative seconds, heavy modules loaded)"""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1]) / 1e6
+    return cumulative, [name for name in result.stdout.strip().split(",") if name]
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["src.workflows.status_updater", "src.workflows", "src.agents", "src.monitoring.scheduler"],
+)
+def test_module_imports_without_llm_stack(module):
+    seconds, heavy = import_profile(module)
+
+    assert heavy == []
+    assert seconds < BUDGET
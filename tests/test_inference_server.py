@@ -0,0 +1,168 @@
+import threading
+
+import pytest
+
+from src.utils.inference_server import InferenceClient, QueueFullError, RequestBatcher, make_server
+
+
+class FakeLlama:
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, stream=False, **params):
+        self.prompts.append(prompt)
+        words = [f"{word} " for word in prompt.upper().split()]
+        if stream:
+            return iter({"choices": [{"text": word}]} for word in words)
+        return {"choices": [{"text": "".join(words)}], "usage": {"completion_tokens": len(words)}, "params": params}
+
+    def tokenize(self, text):
+        return list(text)
+
+
+class GatedLlama(FakeLlama):
+    """Holds the first generation until released, so the requests sent meanwhile queue up behind it"""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, prompt, stream=False, **params):
+        self.entered.set()
+        assert self.release.wait(5)
+        return super().__call__(prompt, stream=stream, **params)
+
+
+@pytest.fixture
+def serve(tmp_path):
+    servers = []
+
+    def start(model, unix=True, batcher=None, **kwargs):
+        batcher = batcher or RequestBatcher(model, **kwargs)
+        batcher.start()
+        if unix:
+            server = make_server(batcher, socket_path=str(tmp_path / "llm.sock"))
+            url = f"unix://{tmp_path / 'llm.sock'}"
+        else:
+            server = make_server(batcher, port=0)
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append((server, batcher))
+        return InferenceClient(url, timeout=5)
+
+    yield start
+    for server, batcher in servers:
+        server.shutdown()
+        server.server_close()
+        batcher.stop()
+
+
+def test_batch_deduplicates_and_orders_by_prompt():
+    model = FakeLlama()
+    batcher = RequestBatcher(model)
+    requests = [
+        batcher.submit("role b: task", temperature=0),
+        batcher.submit("role a: task", temperature=0),
+        batcher.submit("role b: task", temperature=0),
+    ]
+
+    batcher.process(batcher._next_batch())
+
+    assert model.prompts == ["role a: task", "role b: task"]
+    assert requests[0].wait(1) is requests[2].wait(1)
+    metrics = batcher.metrics()
+    assert metrics["completed"] == 3 and metrics["deduplicated"] == 1 and metrics["batches"] == 1
+    assert metrics["queue_depth"] == 0 and metrics["tokens"] == 6
+
+
+def test_only_deterministic_requests_are_merged():
+    model = FakeLlama()
+    batcher = RequestBatcher(model)
+    for params in ({"temperature": 0.7}, {}, {"temperature": 0.7, "seed": -1}, {"temperature": 0.7, "seed": 42}):
+        batcher.submit("p", **params)
+        batcher.submit("p", **params)
+
+    batcher.process(batcher._next_batch())
+
+    # Sampled requests each get their own draw; a fixed seed makes the draw repeatable
+    assert len(model.prompts) == 7
+    assert batcher.metrics()["deduplicated"] == 1
+
+
+def test_full_queue_rejects_requests():
+    batcher = RequestBatcher(FakeLlama(), max_queue=1)
+    batcher.submit("one")
+
+    with pytest.raises(QueueFullError):
+        batcher.submit("two")
+
+
+def test_model_error_reaches_every_waiter():
+    def broken(prompt, **params):
+        raise ValueError("context overflow")
+
+    batcher = RequestBatcher(broken)
+    first, second = batcher.submit("p"), batcher.submit("p")
+    batcher.process(batcher._next_batch())
+
+    for request in (first, second):
+        with pytest.raises(ValueError):
+            request.wait(1)
+    assert batcher.metrics()["failed"] == 2
+
+
+def test_completion_over_unix_socket(serve):
+    client = serve(FakeLlama())
+
+    result = client("hello world", temperature=0.2, max_tokens=16)
+
+    assert result["choices"][0]["text"] == "HELLO WORLD "
+    assert result["params"] == {"temperature": 0.2, "max_tokens": 16}
+    assert client.tokenize(b"abc") == [97, 98, 99]
+
+
+def test_streaming_over_tcp(serve):
+    client = serve(FakeLlama(), unix=False)
+
+    chunks = list(client("one two three", stream=True))
+
+    assert [chunk["choices"][0]["text"] for chunk in chunks] == ["ONE ", "TWO ", "THREE "]
+    assert client.metrics()["tokens"] == 3
+
+
+@pytest.mark.parametrize("temperature, generations", [(0, 2), (0.7, 6)])
+def test_concurrent_clients_share_batches(serve, temperature, generations):
+    model = GatedLlama()
+    batcher = RequestBatcher(model, max_batch=8)
+    queued = threading.Semaphore(0)
+    submit = batcher.submit
+
+    def counting_submit(*args, **kwargs):
+        request = submit(*args, **kwargs)
+        queued.release()
+        return request
+
+    batcher.submit = counting_submit
+    client = serve(model, batcher=batcher)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(client("same prompt", temperature=temperature)))
+        for _ in range(6)
+    ]
+
+    # The first request occupies the model; the other five arrive while it is busy
+    threads[0].start()
+    assert model.entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    for _ in threads:
+        assert queued.acquire(timeout=5)
+    model.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    metrics = client.metrics()
+    assert len(results) == 6 and metrics["completed"] == 6 and metrics["batches"] == 2
+    assert len(model.prompts) == generations
+    assert metrics["deduplicated"] == 6 - generations
@@ -0,0 +1,84 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.database.issue_mirror import IssueMirror
+
+
+def make_issue(number, state="open", labels=(), assignee=None, updated_at=datetime(2024, 12, 1), pull_request=None):
+    issue = Mock()
+    issue.number = number
+    issue.state = state
+    issue.title = f"Issue {number}"
+    issue.body = "body"
+    issue.user.login = "author"
+    issue.assignee = Mock(login=assignee) if assignee else None
+    issue.assignees = [issue.assignee] if assignee else []
+    issue.labels = [Mock() for _ in labels]
+    for label, name in zip(issue.labels, labels):
+        label.name = name
+    issue.comments = 2
+    issue.html_url = f"https://github.com/o/r/issues/{number}"
+    issue.created_at = datetime(2024, 11, 1)
+    issue.updated_at = updated_at
+    issue.closed_at = datetime(2024, 12, 1) if state == "closed" else None
+    issue.pull_request = pull_request
+    return issue
+
+
+class TestIssueMirror:
+    @pytest.fixture
+    def mirror(self, tmp_path):
+        return IssueMirror(str(tmp_path / "mirror.db"))
+
+    @pytest.fixture
+    def repository(self):
+        repository = Mock()
+        repository.full_name = "o/r"
+        repository.get_issues.return_value = [
+            make_issue(1, labels=["bug", "backend"], assignee="alice"),
+            make_issue(2, state="closed", labels=["frontend"], assignee="bob", updated_at=datetime(2024, 12, 5)),
+            make_issue(3, pull_request=Mock()),
+        ]
+        return repository
+
+    def test_initial_sync_scans_full_history(self, mirror, repository):
+        assert mirror.sync(repository) == 3
+
+        repository.get_issues.assert_called_once_with(state="all", sort="updated", direction="asc")
+        assert mirror.watermark("o/r") == datetime(2024, 12, 5)
+
+    def test_incremental_sync_uses_watermark(self, mirror, repository):
+        mirror.sync(repository)
+        repository.get_issues.return_value = [make_issue(1, state="closed", updated_at=datetime(2024, 12, 9))]
+
+        mirror.sync(repository)
+
+        repository.get_issues.assert_called_with(
+            state="all", sort="updated", direction="asc", since=datetime(2024, 12, 5)
+        )
+        assert mirror.get("o/r", 1).state == "closed"
+        assert mirror.watermark("o/r") == datetime(2024, 12, 9)
+
+    def test_query_filters(self, mirror, repository):
+        mirror.sync(repository)
+
+        assert [i.number for i in mirror.issues("o/r", state="all", labels=["bug"])] == [1]
+        assert [i.number for i in mirror.issues("o/r", state="all", assignee="bob")] == [2]
+        assert [i.number for i in mirror.issues("o/r", pull_requests=False)] == [1]
+        assert mirror.count("o/r", state="all") == 3
+
+    def test_mirrored_issue_matches_pygithub_shape(self, mirror, repository):
+        mirror.sync(repository)
+        issue = mirror.get("o/r", 1)
+
+        assert issue.assignee.login == "alice"
+        assert [label.name for label in issue.labels] == ["bug", "backend"]
+        assert (issue.updated_at - issue.created_at).days == 30
+
+    def test_rebuild_rescans(self, mirror, repository):
+        mirror.sync(repository)
+        mirror.sync(repository, rebuild=True)
+
+        repository.get_issues.assert_called_with(state="all", sort="updated", direction="asc")
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from src.utils.keyword_matcher import KeywordMatcher, get_keyword_matcher, load_keyword_tables
+
+TASK_TYPES = {
+    "frontend": ["ui", "frontend", "react", "vue"],
+    "backend": ["api", "backend", "server"],
+    "database": ["db", "database", "model*"],
+    "devops": ["deployment", "pipeline", "ci-cd"],
+}
+
+
+def test_matches_whole_words_only():
+    matcher = KeywordMatcher(TASK_TYPES)
+
+    assert matcher.find("Build the guide for the feedback form") == []
+    assert matcher.find("Fix the UI of the API server") == ["ui", "api", "server"]
+    assert matcher.find("react-native app, new_db layer") == ["react", "db"]
+
+
+def test_separators_and_prefix_keywords():
+    matcher = KeywordMatcher({"skills": ["machine learning", "ci-cd", "implement*", "implementation plan"]})
+
+    assert matcher.find("Machine-Learning pipeline with CI/CD") == ["machine learning", "ci-cd"]
+    assert matcher.counts("implemented it; implementing the rest") == {"implement": 2}
+    # The longest keyword at a position wins over a prefix keyword
+    assert matcher.counts("Implementation plan") == {"implementation plan": 1}
+    assert not matcher.contains_any("implant")
+
+
+def test_categories_follow_table_order():
+    matcher = KeywordMatcher(TASK_TYPES)
+
+    assert matcher.matched_categories("deployment of the data models via the api") == ["backend", "database", "devops"]
+    assert matcher.first_category("deployment of the data models via the api") == "backend"
+    assert matcher.first_category("refactor everything") is None
+
+
+def test_keyword_shared_by_categories():
+    matcher = KeywordMatcher({"frontend": ["javascript"], "backend": ["python", "javascript"]})
+
+    assert matcher.keywords == ["javascript", "python"]
+    assert matcher.matched_categories("JavaScript") == ["frontend", "backend"]
+
+
+def test_empty_inputs():
+    matcher = KeywordMatcher({})
+
+    assert matcher.find("anything") == []
+    assert not matcher.contains_any("anything")
+    assert KeywordMatcher(TASK_TYPES).find(None) == []
+
+
+def test_exact_matching_keeps_separators():
+    matcher = KeywordMatcher({"repositories": ["owner/repo-a", "repo-b"]}, exact=True)
+
+    assert matcher.find("Blocked by owner/repo-a and Repo-B.") == ["owner/repo-a", "repo-b"]
+    assert matcher.find("owner repo a, owner/repo_a, repo b") == []
+    # Longer names that merely start with a repository name are other repositories
+    assert matcher.find("repo-b-v2, repo-b.js, xrepo-b") == []
+
+
+def test_tables_load_from_config(tmp_path):
+    path = tmp_path / "keywords.json"
+    path.write_text(json.dumps({"task_types": {"docs": ["readme"]}}))
+
+    assert load_keyword_tables(str(path)) == {"task_types": {"docs": ["readme"]}}
+    assert get_keyword_matcher("task_types", str(path)).first_category("Update README") == "docs"
+    assert get_keyword_matcher("task_types", str(path)) is get_keyword_matcher("task_types", str(path))
+    # No built-in copy of the tables to fall back on
+    with pytest.raises(KeyError, match="development"):
+        get_keyword_matcher("development", str(path))
+
+
+def test_missing_config_fails_loudly(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        get_keyword_matcher("task_types", str(tmp_path / "missing.json"))
+
+
+def test_shipped_config_has_every_table():
+    tables = load_keyword_tables()
+
+    assert {"skill_categories", "description_skills", "development", "task_types"} <= set(tables)
+    assert tables["task_types"] == TASK_TYPES
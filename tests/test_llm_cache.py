@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from src.utils.llm_cache import LLMResponseCache, normalize_prompt
+
+LLAMA = "[('model_path', 'models/llama-2-70b-chat.gguf'), ('max_tokens', 2000), ('temperature', 0.7)]"
+
+
+@dataclass
+class Generation:
+    text: str
+    generation_info: Optional[dict] = None
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(str(tmp_path / "llm.db"), generation_cls=Generation)
+
+
+def test_normalize_prompt():
+    assert normalize_prompt("Role: PM  \r\n\r\n\r\n\r\nGoal: ship\n") == "Role: PM\n\nGoal: ship"
+
+
+def test_round_trip_and_stats(cache):
+    assert cache.lookup("Summarise the week", LLAMA) is None
+
+    cache.update("Summarise the week", LLAMA, [Generation("All green", {"finish_reason": "stop"})])
+
+    assert cache.lookup("Summarise the week  \n", LLAMA) == [Generation("All green", {"finish_reason": "stop"})]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_key_includes_model_and_sampling_params(cache):
+    cache.update("prompt", LLAMA, [Generation("a")])
+
+    assert cache.lookup("prompt", LLAMA.replace("0.7", "0.2")) is None
+    assert cache.lookup("prompt", LLAMA.replace("70b", "13b")) is None
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), max_bytes=500, generation_cls=Generation)
+    cache.update("first", LLAMA, [Generation("x" * 100)])
+    cache.update("second", LLAMA, [Generation("y" * 100)])
+    cache.lookup("first", LLAMA)
+    cache.update("third", LLAMA, [Generation("z" * 100)])
+
+    assert cache.lookup("second", LLAMA) is None
+    assert cache.lookup("first", LLAMA) is not None
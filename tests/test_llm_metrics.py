@@ -0,0 +1,84 @@
+import json
+
+from src.utils.llm_metrics import LLMMetrics, attribute, scope
+
+PROMPT = (
+    "You are Tech Lead.\nYou own the architecture.\n\nYour personal goal is: keep debt low\n"
+    "Begin!\n\nCurrent Task: Review technical debt"
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_attribution_from_crewai_prompt_and_scope():
+    assert attribute(PROMPT) == {"agent": "Tech Lead", "task": "Review technical debt"}
+
+    with scope(task="weekly review"):
+        assert attribute(PROMPT) == {"agent": "Tech Lead", "task": "weekly review"}
+        with scope(agent="Reviewer"):
+            assert attribute("plain prompt") == {"agent": "Reviewer", "task": "weekly review"}
+    assert attribute("plain prompt") == {"agent": "unknown", "task": "unknown"}
+
+
+def test_records_tokens_ttft_and_latency():
+    clock = Clock()
+    metrics = LLMMetrics(tokenizer=lambda text: len(text.split()), clock=clock)
+
+    metrics.start("run", PROMPT, model="llama")
+    clock.now = 0.5
+    metrics.token("run")
+    clock.now = 2.0
+    record = metrics.end("run", "four words of output")
+
+    assert record["agent"] == "Tech Lead" and record["model"] == "llama"
+    assert record["prompt_tokens"] == len(PROMPT.split()) and record["completion_tokens"] == 4
+    assert record["ttft_seconds"] == 0.5 and record["latency_seconds"] == 2.0
+    assert record["tokens_per_second"] == 2.0
+
+
+def test_reported_usage_wins_over_tokenizer():
+    metrics = LLMMetrics(tokenizer=lambda text: 999, clock=Clock())
+    metrics.start("run", PROMPT)
+
+    record = metrics.end("run", "text", prompt_tokens=12, completion_tokens=3)
+
+    assert (record["prompt_tokens"], record["completion_tokens"]) == (12, 3)
+
+
+def test_summary_groups_cache_hits_and_histogram():
+    clock = Clock()
+    metrics = LLMMetrics(tokenizer=lambda text: len(text.split()), clock=clock)
+    for i, latency in enumerate([0.4, 3.0, 200.0]):
+        metrics.start(i, PROMPT)
+        clock.now += latency
+        metrics.end(i, "a b")
+    metrics.cache_hit(PROMPT, "a b")
+    metrics.start("failed", "You are Project Manager. Plan")
+    metrics.end("failed", error="timeout")
+
+    rows = {row["agent"]: row for row in metrics.summary()}
+
+    lead = rows["Tech Lead"]
+    assert lead["calls"] == 4 and lead["cache_hits"] == 1 and lead["completion_tokens"] == 8
+    assert lead["latency_p50"] == 3.0 and lead["latency_total"] == 203.4
+    assert lead["latency_histogram"]["<=0.5s"] == 1 and lead["latency_histogram"][">120s"] == 1
+    assert rows["Project Manager"]["errors"] == 1 and rows["Project Manager"]["latency_p50"] is None
+    assert "Tech Lead" in metrics.format_summary()
+
+
+def test_export_jsonl(tmp_path):
+    metrics = LLMMetrics(clock=Clock())
+    metrics.start("run", PROMPT)
+    metrics.end("run", "done")
+
+    path = metrics.export_jsonl(str(tmp_path / "calls" / "run.jsonl"))
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 1 and records[0]["task"] == "Review technical debt"
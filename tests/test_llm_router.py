@@ -0,0 +1,233 @@
+import time
+
+import pytest
+
+from src.utils.llm_router import Backend, CircuitBreaker, LLMRouter, NoBackendAvailableError
+
+
+class StandIn:
+    """Local backend that answers after a delay, or raises while failing is set"""
+
+    def __init__(self, name, delay=0.0, failing=False):
+        self.name = name
+        self.delay = delay
+        self.failing = failing
+        self.calls = 0
+
+    def __call__(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError(f"{self.name} unavailable")
+        return f"{self.name}: {prompt}"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_router(*stand_ins, breaker=None, checks=None, **kwargs):
+    backends = [
+        Backend(s.name, lambda s=s: s, breaker() if breaker else None, (checks or {}).get(s.name)) for s in stand_ins
+    ]
+    return LLMRouter(backends, **kwargs)
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_reset():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == "half_open" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_routes_to_fastest_measured_backend():
+    slow, fast = StandIn("slow", delay=0.05), StandIn("fast", delay=0.0)
+    router = make_router(slow, fast)
+    # Latencies come from earlier real requests
+    router.backends[0].record_success(0.05)
+    router.backends[1].record_success(0.001)
+
+    assert router.healthy() == ["fast", "slow"]
+    assert router.generate("hi") == "fast: hi"
+
+
+def test_primary_goes_first_until_its_breaker_trips():
+    clock = Clock()
+    primary, fallback = StandIn("primary", failing=True), StandIn("fallback")
+    router = make_router(
+        primary,
+        fallback,
+        breaker=lambda: CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock),
+        primary="primary",
+    )
+    # A faster fallback does not displace a healthy primary
+    router.backends[1].record_success(0.001)
+    assert router.healthy() == ["primary", "fallback"]
+
+    # Runtime failures of the primary fail over and trip its breaker
+    assert router.generate("a") == "fallback: a"
+    assert router.generate("b") == "fallback: b"
+    assert primary.calls == 1
+
+    primary.failing = False
+    clock.now = 10
+    assert router.generate("c") == "primary: c"
+
+
+def test_probe_checks_liveness_without_generating():
+    local, api = StandIn("local"), StandIn("api")
+    router = make_router(local, api, checks={"api": lambda: False})
+
+    assert router.probe() == {"local": True, "api": False}
+    assert local.calls == 0 and api.calls == 0
+    assert router.stats()["local"]["latency_ms"] is None
+
+
+def test_fails_over_and_trips_breaker():
+    broken, backup = StandIn("broken", failing=True), StandIn("backup")
+    router = make_router(broken, backup, breaker=lambda: CircuitBreaker(failure_threshold=1, reset_seconds=60))
+
+    assert router.generate("a") == "backup: a"
+    assert router.stats()["broken"]["state"] == "open"
+
+    assert router.generate("b") == "backup: b"
+    assert broken.calls == 1
+
+
+def test_timeout_moves_to_next_backend():
+    hung, backup = StandIn("hung", delay=0.5), StandIn("backup")
+    router = make_router(hung, backup, timeout_seconds=0.05)
+
+    start = time.perf_counter()
+    assert router.generate("x") == "backup: x"
+    assert time.perf_counter() - start < 0.4
+    assert router.stats()["hung"]["timeouts"] == 1
+
+
+def test_hedged_request_takes_first_answer():
+    slow, fast = StandIn("slow", delay=0.5), StandIn("fast", delay=0.0)
+    router = make_router(slow, fast, hedge_after_seconds=0.02)
+
+    start = time.perf_counter()
+    assert router.generate("x") == "fast: x"
+    assert time.perf_counter() - start < 0.4
+    assert slow.calls == 1 and fast.calls == 1
+
+
+def test_backend_that_cannot_be_set_up_counts_as_failure():
+    router = LLMRouter([Backend("missing", lambda: None), Backend("ok", lambda: StandIn("ok"))])
+
+    assert router.probe() == {"missing": False, "ok": True}
+    assert router.generate("x") == "ok: x"
+
+
+def test_all_backends_down():
+    router = make_router(StandIn("a", failing=True), StandIn("b", failing=True))
+
+    with pytest.raises(NoBackendAvailableError) as excinfo:
+        router.generate("x")
+    assert set(excinfo.value.errors) == {"a", "b"}
+
+
+def test_background_probe_recovers_backend():
+    flaky = StandIn("flaky")
+    reachable = [False]
+    router = make_router(
+        flaky,
+        breaker=lambda: CircuitBreaker(failure_threshold=1, reset_seconds=60),
+        checks={"flaky": lambda: reachable[0]},
+        probe_interval_seconds=0.01,
+    )
+    router.probe()
+    assert router.stats()["flaky"]["state"] == "open"
+
+    reachable[0] = True
+    router.start()
+    deadline = time.time() + 2
+    while router.stats()["flaky"]["state"] != "closed" and time.time() < deadline:
+        time.sleep(0.01)
+    router.stop()
+
+    assert router.stats()["flaky"]["state"] == "closed"
+    assert flaky.calls == 0
+
+
+def test_from_config_orders_and_disables(tmp_path):
+    config = tmp_path / "router.json"
+    config.write_text('{"order": ["anthropic", "llama"], "timeout_seconds": 5}')
+    router = LLMRouter.from_config({"llama": object, "openai": object, "anthropic": object}, str(config))
+
+    assert [backend.name for backend in router.backends] == ["anthropic", "llama", "openai"]
+    assert router.timeout_seconds == 5
+
+    router = LLMRouter.from_config({"llama": object, "openai": object, "anthropic": object}, str(config), "openai")
+    assert [backend.name for backend in router.backends] == ["openai", "anthropic", "llama"]
+    assert router.primary == "openai"
+
+    config.write_text('{"enabled": false}')
+    assert LLMRouter.from_config({"llama": object}, str(config)) is None
+
+
+def test_routed_pooled_call_is_recorded_once(tmp_path, monkeypatch):
+    pytest.importorskip("langchain")
+    from src.utils import llm_metrics, model_pool
+
+    class FakeLlama:
+        def __call__(self, prompt, **kwargs):
+            return {"choices": [{"text": "ok"}]}
+
+        def tokenize(self, text):
+            return text.split()
+
+    path = tmp_path / "model.gguf"
+    path.write_bytes(b"GGUF")
+    metrics = llm_metrics.LLMMetrics()
+    monkeypatch.setattr(llm_metrics, "_metrics", metrics)
+    monkeypatch.setattr(model_pool, "_pool", model_pool.ModelPool(loader=lambda model_path, **params: FakeLlama()))
+    monkeypatch.setattr(model_pool, "install_llm_cache", lambda: None)
+    monkeypatch.setenv("LLM_SERVER_URL", "")
+    pooled = model_pool.get_llm(str(path))
+    router = LLMRouter([Backend("llama", lambda: pooled)])
+
+    assert router.as_llm()("one two three") == "ok"
+    assert len(metrics.records) == 1
+
+
+def test_routed_llm_leaves_response_caching_to_backends(monkeypatch):
+    langchain = pytest.importorskip("langchain")
+
+    class DictCache:
+        def __init__(self):
+            self.entries = {}
+
+        def lookup(self, prompt, llm_string):
+            return self.entries.get((prompt, llm_string))
+
+        def update(self, prompt, llm_string, return_val):
+            self.entries[(prompt, llm_string)] = return_val
+
+    cache = DictCache()
+    monkeypatch.setattr(langchain, "llm_cache", cache)
+    sampler = StandIn("sampler")
+    routed = make_router(sampler).as_llm()
+
+    routed("hello")
+    routed("hello")
+
+    assert sampler.calls == 2 and cache.entries == {}
@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.monitoring.metrics_store import MetricsStore, import_monitoring_reports, import_status_reports
+
+START = datetime(2024, 12, 1)
+
+
+class TestMetricsStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = MetricsStore(str(tmp_path / "metrics.npz"))
+        for hour in range(48):
+            when = START + timedelta(hours=hour)
+            store.append("o/a", when, open_issues=hour, stars=10)
+            store.append("o/b", when, open_issues=100 - hour)
+        return store
+
+    def test_range_scan(self, store):
+        result = store.query(START + timedelta(hours=10), START + timedelta(hours=11), repos=["o/a"])
+
+        assert result["repo"].tolist() == ["o/a", "o/a"]
+        assert result["open_issues"].tolist() == [10, 11]
+        assert result["timestamp"][0] == np.datetime64("2024-12-01T10:00:00")
+
+    def test_group_by_repo(self, store):
+        assert store.group_by_repo("open_issues", "last") == {"o/a": 47, "o/b": 53}
+        assert store.group_by_repo("open_issues", "max", end=START + timedelta(hours=5)) == {"o/a": 5, "o/b": 100}
+        # o/b never reported stars, so its aggregate is NaN rather than 0
+        assert np.isnan(store.group_by_repo("stars", "mean")["o/b"])
+
+    def test_downsample(self, store):
+        starts, values = store.downsample("open_issues", "1d", "mean")["o/a"]
+
+        assert starts.tolist() == [datetime(2024, 12, 1), datetime(2024, 12, 2)]
+        assert values.tolist() == [11.5, 35.5]
+
+    def test_save_and_reload_deduplicates(self, store, tmp_path):
+        store.append("o/a", START, open_issues=999)
+        store.save()
+
+        reloaded = MetricsStore(str(tmp_path / "metrics.npz"))
+        assert len(reloaded) == 96
+        assert reloaded.series("o/a", "open_issues", end=START)[1].tolist() == [999]
+
+
+def test_import_monitoring_reports(tmp_path):
+    report = {
+        "repository_status": {
+            "timestamp": "2024-12-27T06:10:45",
+            "total_repositories": 1,
+            "repositories": [{"name": "r", "full_name": "o/r", "stars": 3, "forks": 1, "open_issues": 4}],
+        },
+        "workflow_runs": {
+            "workflow_runs": [
+                {"repository": "o/r", "workflow_name": "CI", "conclusion": "failure", "created_at": "x"},
+                {"repository": "o/r", "workflow_name": "CI", "conclusion": "success", "created_at": "y"},
+            ]
+        },
+    }
+    (tmp_path / "report_20241227_061045.json").write_text(json.dumps(report))
+    store = MetricsStore(str(tmp_path / "metrics.npz"))
+
+    assert import_monitoring_reports(store, str(tmp_path)) == 1
+    result = store.query()
+    assert result["timestamp"].tolist() == [datetime(2024, 12, 27, 6, 10, 45)]
+    assert (result["stars"][0], result["workflow_failure"][0], result["workflow_success"][0]) == (3, 1, 1)
+
+
+def test_status_reports_use_full_names(tmp_path):
+    (tmp_path / "status_20241228_0900.json").write_text(
+        json.dumps({"r": {"open_issues": 5, "open_prs": 2}, "new": {"open_issues": 1, "open_prs": 0}})
+    )
+    store = MetricsStore(str(tmp_path / "metrics.npz"))
+    store.append("o/r", datetime(2024, 12, 27), open_issues=4)
+
+    assert import_status_reports(store, str(tmp_path), owner="me") == 2
+
+    # Status rows land on the same series as the live monitoring rows
+    assert store.series("o/r", "open_issues")[1].tolist() == [4, 5]
+    assert store.series("me/new", "open_prs")[1].tolist() == [0]
+    assert "r" not in store.repos
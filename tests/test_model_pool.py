@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.model_pool import ModelPool
+
+
+class FakeLlama:
+    def __init__(self):
+        self.active = 0
+        self.overlapped = False
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        self.active += 1
+        self.overlapped |= self.active > 1
+        time.sleep(0.01)
+        self.active -= 1
+        if stream:
+            return iter(["a", "b"])
+        return {"choices": [{"text": prompt.upper()}]}
+
+    def tokenize(self, text):
+        return list(text)
+
+
+class Handle:
+    def __init__(self, client, model_path, **params):
+        self.client = client
+        self.model_path = model_path
+        self.params = params
+
+
+def make_pool(loads):
+    def loader(model_path, **params):
+        loads.append((model_path, params))
+        return FakeLlama()
+
+    return ModelPool(loader=loader, wrapper=Handle)
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    def create(name="model.gguf"):
+        path = tmp_path / name
+        path.write_bytes(b"GGUF")
+        return str(path)
+
+    return create
+
+
+def test_model_is_loaded_once_per_path(model_file):
+    loads = []
+    pool = make_pool(loads)
+    path = model_file()
+
+    first = pool.get(path, n_ctx=4096, temperature=0.7)
+    second = pool.get(path, n_ctx=2048, temperature=0.2, max_tokens=500)
+    first.client("hello")
+    second.client("hello")
+
+    assert len(loads) == 1
+    assert loads[0][1] == {"n_ctx": 4096, "use_mmap": True}
+    assert first.client is second.client
+    assert (first.params["temperature"], second.params["temperature"]) == (0.7, 0.2)
+    assert pool.stats()[path]["handles"] == 2
+
+
+def test_weights_load_on_first_generation(model_file):
+    loads = []
+    pool = make_pool(loads)
+    path = model_file()
+    handle = pool.get(path, temperature=0.7)
+
+    assert loads == []
+    assert not pool.stats()[path]["loaded"]
+
+    assert handle.client("hi") == {"choices": [{"text": "HI"}]}
+    assert len(loads) == 1
+
+    pool.get(model_file("other.gguf"), lazy=False)
+    assert len(loads) == 2
+
+
+def test_concurrent_generations_are_serialized(model_file):
+    pool = make_pool([])
+    path = model_file()
+    handle = pool.get(path)
+
+    threads = [threading.Thread(target=handle.client, args=("hi",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not handle.client._client.overlapped
+    assert pool.stats()[path]["generations"] == 4
+
+
+def test_missing_model_fails_at_construction(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        make_pool([]).get(str(tmp_path / "missing.gguf"))
+
+
+def test_streaming_releases_lock_when_exhausted(model_file):
+    pool = make_pool([])
+    handle = pool.get(model_file())
+
+    assert list(handle.client("hi", stream=True)) == ["a", "b"]
+
+    # Another thread can generate once the stream is consumed
+    other = threading.Thread(target=handle.client, args=("hi",))
+    other.start()
+    other.join(timeout=1)
+    assert not other.is_alive()
+
+
+def test_abandoned_streams_do_not_hold_the_lock(model_file):
+    pool = make_pool([])
+    handle = pool.get(model_file())
+
+    never_iterated = handle.client("hi", stream=True)
+    dropped = handle.client("hi", stream=True)
+    assert next(dropped) == "a"
+    del dropped
+
+    # Daemon, so a held lock fails the test instead of hanging the run
+    other = threading.Thread(target=handle.client, args=("hi",), daemon=True)
+    other.start()
+    other.join(timeout=1)
+    assert not other.is_alive()
+    assert list(never_iterated) == ["a", "b"]
@@ -0,0 +1,265 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+from src.integrations.mutation_outbox import MutationOutbox
+from src.utils import github_client
+
+
+class FakeIssue:
+    def __init__(self, repo, number, title="", body="", labels=()):
+        self.repo = repo
+        self.number = number
+        self.title = title
+        self.body = body
+        self.html_url = f"https://github.com/{repo.name}/issues/{number}"
+        self.labels = [SimpleNamespace(name=label) for label in labels]
+        self.comments = []
+        self.created_at = datetime.utcnow()
+
+    def add_to_labels(self, *labels):
+        self.repo.calls.append(("add_labels", self.number, labels))
+        self.labels += [SimpleNamespace(name=label) for label in labels]
+
+    def remove_from_labels(self, label):
+        self.repo.calls.append(("remove_label", self.number, label))
+        if label not in [item.name for item in self.labels]:
+            raise GithubException(404, {"message": "Label does not exist"}, None)
+        self.labels = [item for item in self.labels if item.name != label]
+
+    def edit(self, **changes):
+        self.repo.calls.append(("edit", self.number, changes))
+
+    def create_comment(self, body):
+        self.repo.calls.append(("comment", self.number, body))
+        comment = SimpleNamespace(id=len(self.comments) + 1, body=body, html_url=f"{self.html_url}#c")
+        self.comments.append(comment)
+        return comment
+
+    def get_comments(self, since=None):
+        return self.comments
+
+
+class FakeRepo:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+        self.issues = {}
+        self.failures = []
+        self.listings = []
+
+    def create_issue(self, title, body, labels, assignees):
+        self.calls.append(("create", title))
+        issue = FakeIssue(self, 100 + len(self.issues), title, body, labels)
+        self.issues[issue.number] = issue
+        if self.failures:
+            raise self.failures.pop(0)
+        return issue
+
+    def get_issue(self, number):
+        return self.issues.setdefault(number, FakeIssue(self, number, labels=["bug"]))
+
+    def get_issues(self, **kwargs):
+        # Records whether the listing bypassed the response cache
+        self.listings.append(getattr(github_client._local, "uncached", False))
+        return sorted(self.issues.values(), key=lambda issue: -issue.number)
+
+
+class FakeGithub:
+    def __init__(self):
+        self.repos = {}
+
+    def get_repo(self, name, lazy=False):
+        return self.repos.setdefault(name, FakeRepo(name))
+
+
+@pytest.fixture
+def github():
+    return FakeGithub()
+
+
+class Clock:
+    """Fake time that moves forward only when the outbox sleeps"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def outbox(tmp_path, github):
+    clock = Clock()
+    return MutationOutbox(github, path=str(tmp_path / "outbox.db"), max_workers=4, clock=clock, sleep=clock.sleep)
+
+
+def test_label_changes_of_one_issue_are_coalesced(outbox, github):
+    outbox.edit_issue("o/p", 7, add_labels=["needs-development"])
+    outbox.edit_issue("o/p", 7, add_labels=["development-completed"], remove_labels=["needs-development"])
+    outbox.edit_issue("o/p", 7, assignees=["ana"])
+
+    [operation] = outbox.plan()
+    assert operation.payload == {
+        "add_labels": ["development-completed"],
+        "remove_labels": ["needs-development"],
+        "assignees": ["ana"],
+    }
+    assert len(operation.keys) == 3
+
+    assert outbox.flush() == {"done": 3}
+    assert github.repos["o/p"].calls == [
+        ("add_labels", 7, ("development-completed",)),
+        ("remove_label", 7, "needs-development"),
+        ("edit", 7, {"assignees": ["ana"]}),
+    ]
+
+
+def test_label_edits_keep_labels_set_by_others(outbox, github):
+    issue = github.get_repo("o/p").get_issue(4)
+    outbox.edit_issue("o/p", 4, add_labels=["a"], remove_labels=["bug", "gone"])
+    # Added by someone else after the issue was read
+    issue.labels.append(SimpleNamespace(name="urgent"))
+
+    assert outbox.flush() == {"done": 1}
+
+    assert [label.name for label in issue.labels] == ["urgent", "a"]
+    assert not any(call[0] == "edit" for call in github.repos["o/p"].calls)
+
+
+def test_adding_labels_only_posts_them(outbox, github):
+    outbox.edit_issue("o/p", 1, add_labels=["ai-development"])
+    outbox.edit_issue("o/p", 2, add_labels=["ai-development"])
+
+    outbox.flush()
+
+    assert sorted(github.repos["o/p"].calls) == [
+        ("add_labels", 1, ("ai-development",)),
+        ("add_labels", 2, ("ai-development",)),
+    ]
+
+
+def test_idempotency_key_queues_once(outbox, github):
+    for _ in range(3):
+        outbox.create_issue("o/dev", "Task", key="dev-issue:1")
+    outbox.flush()
+    outbox.create_issue("o/dev", "Task", key="dev-issue:1")
+    outbox.flush()
+
+    assert github.repos["o/dev"].calls == [("create", "Task")]
+    assert outbox.issue("dev-issue:1").number == 100
+
+
+def test_dependent_comment_uses_created_issue(outbox, github):
+    key = outbox.create_issue("o/dev", "Task")
+    outbox.comment("o/p", 5, "Assigned to Dev Orchestrator: {html_url} {unknown}", after=key)
+
+    outbox.flush()
+
+    assert (
+        github.repos["o/p"]
+        .calls[0][2]
+        .startswith("Assigned to Dev Orchestrator: https://github.com/o/dev/issues/100 {unknown}")
+    )
+
+
+def test_retry_after_ambiguous_failure_does_not_duplicate(outbox, github):
+    repo = github.get_repo("o/dev")
+    # GitHub created the issue but the response was lost
+    repo.failures.append(GithubException(502, "Bad Gateway", None))
+
+    key = outbox.create_issue("o/dev", "Task")
+    assert outbox.flush() == {"done": 1}
+
+    assert repo.calls == [("create", "Task")]
+    assert outbox.issue(key).number == 100
+
+
+def test_lost_create_is_found_past_newer_issues_without_the_cache(outbox, github):
+    repo = github.get_repo("o/dev")
+    timeout = ConnectionError("read timed out")
+
+    def create_then_time_out(**kwargs):
+        FakeRepo.create_issue(repo, **kwargs)
+        # Others open plenty of issues before the retry
+        for n in range(35):
+            FakeRepo.create_issue(repo, f"Other {n}", "", [], [])
+        raise timeout
+
+    repo.create_issue = create_then_time_out
+    key = outbox.create_issue("o/dev", "Task")
+    outbox.flush()
+
+    assert outbox.status(key) == "done"
+    assert outbox.issue(key).number == 100
+    assert len(repo.issues) == 36
+    assert repo.listings == [True]
+
+
+def test_client_errors_fail_without_retry_and_fail_dependents(outbox, github):
+    github.get_repo("o/dev").failures.append(GithubException(422, "Validation Failed", None))
+
+    key = outbox.create_issue("o/dev", "Task")
+    outbox.comment("o/p", 5, "See {html_url}", after=key)
+
+    assert outbox.flush() == {"failed": 2}
+    assert github.repos["o/dev"].calls == [("create", "Task")]
+
+
+def test_permission_errors_fail_but_rate_limits_retry(outbox, github):
+    repo = github.get_repo("o/dev")
+    repo.failures.append(GithubException(403, {"message": "Resource not accessible by integration"}, None))
+    denied = outbox.create_issue("o/dev", "Denied")
+    outbox.flush()
+    assert outbox.status(denied) == "failed"
+
+    repo.failures.append(GithubException(403, {"message": "You have exceeded a secondary rate limit"}, None))
+    limited = outbox.create_issue("o/dev", "Limited")
+    outbox.flush()
+    assert outbox.status(limited) == "done"
+
+
+def test_retries_back_off_until_max_attempts(tmp_path, github):
+    clock = Clock()
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        clock.sleep(seconds)
+
+    outbox = MutationOutbox(
+        github,
+        path=str(tmp_path / "outbox.db"),
+        max_attempts=3,
+        backoff_seconds=1,
+        max_wait_seconds=100,
+        clock=clock,
+        sleep=sleep,
+    )
+    issue = github.get_repo("o/p").get_issue(1)
+    issue.edit = lambda **changes: (_ for _ in ()).throw(ConnectionError("reset"))
+    outbox.edit_issue("o/p", 1, state="closed")
+
+    assert outbox.flush() == {"failed": 1}
+    assert len(waits) == 2
+    assert 1 <= waits[0] <= 1.25 and 2 <= waits[1] <= 2.5
+
+
+def test_dry_run_prints_plan_without_calling_github(outbox, github, capsys):
+    outbox.create_issue("o/dev", "Task", labels=["ai-development"])
+    outbox.edit_issue("o/p", 3, add_labels=["a"])
+    outbox.edit_issue("o/p", 3, remove_labels=["b"])
+
+    assert outbox.flush(dry_run=True) == {"pending": 3}
+
+    printed = capsys.readouterr().out.splitlines()
+    assert printed == [
+        "[dry-run] POST o/dev issue 'Task' labels=['ai-development']",
+        "[dry-run] POST+DELETE o/p#3 +a -b (2 mutations)",
+    ]
+    assert github.repos == {}
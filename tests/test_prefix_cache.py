@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import List
+
+from src.utils.disk_cache import DiskCache
+from src.utils.prefix_cache import PrefixCachingLlama, PrefixStateCache
+
+
+@dataclass
+class State:
+    input_ids: List[int]
+
+
+class FakeLlama:
+    """Counts evaluated prompt tokens, reusing the longest common prefix like llama.cpp"""
+
+    def __init__(self):
+        self.input_ids = []
+        self.n_tokens = 0
+        self.evaluated = 0
+
+    def tokenize(self, text):
+        return [sum(word) % 1000 for word in text.split()]
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        tokens = self.tokenize(prompt.encode())
+        common = 0
+        for current, wanted in zip(self.input_ids[: self.n_tokens], tokens):
+            if current != wanted:
+                break
+            common += 1
+        common = min(common, len(tokens) - 1)
+        self.evaluated += len(tokens) - common
+        self.input_ids = tokens + [7]
+        self.n_tokens = len(self.input_ids)
+        if stream:
+            return iter([{"choices": [{"text": "ok"}]}])
+        return {"choices": [{"text": "ok"}]}
+
+    def eval(self, tokens):
+        self.input_ids = self.input_ids[: self.n_tokens] + list(tokens)
+        self.n_tokens = len(self.input_ids)
+        self.evaluated += len(tokens)
+
+    def save_state(self):
+        return State(list(self.input_ids))
+
+    def load_state(self, state):
+        self.input_ids = list(state.input_ids)
+        self.n_tokens = len(state.input_ids)
+
+
+def preamble(role, words=40):
+    return " ".join(f"{role}{i}" for i in range(words))
+
+
+def test_prefix_keys_are_block_aligned_and_longest_first():
+    cache = PrefixStateCache(block_tokens=4)
+
+    keys = cache.prefix_keys("model", list(range(10)))
+
+    assert [length for length, _ in keys] == [8, 4]
+    assert keys[1][1] == cache.prefix_keys("model", list(range(4)) + [99] * 6)[1][1]
+    assert keys[1][1] != cache.prefix_keys("other-model", list(range(10)))[1][1]
+
+
+def test_interleaved_agents_reuse_their_preambles():
+    llama = FakeLlama()
+    client = PrefixCachingLlama(llama, PrefixStateCache(block_tokens=8), "model")
+    manager, tech_lead = preamble("manager"), preamble("lead")
+
+    for task in range(3):
+        client(f"{manager} task{task}")
+        client(f"{tech_lead} task{task}")
+
+    # Each preamble is snapshotted on its second use; the third call evaluates only the task token
+    assert llama.evaluated == 4 * 41 + 2
+    stats = client.cache.stats()
+    assert stats["hits"] == 2 and stats["reused_tokens"] == 80 and stats["saved"] == 2
+
+
+def test_one_off_prompts_are_not_saved():
+    client = PrefixCachingLlama(FakeLlama(), PrefixStateCache(block_tokens=8), "model")
+
+    client(preamble("a"))
+    client(preamble("b"))
+
+    assert client.cache.stats()["saved"] == 0
+
+
+def test_states_survive_restart_on_disk(tmp_path):
+    disk = DiskCache(str(tmp_path / "states.db"))
+    first = PrefixCachingLlama(FakeLlama(), PrefixStateCache(block_tokens=8, disk=disk), "model")
+    first(f"{preamble('manager')} task1")
+    first(f"{preamble('manager')} task2")
+
+    llama = FakeLlama()
+    second = PrefixCachingLlama(llama, PrefixStateCache(block_tokens=8, disk=disk), "model")
+    list(second(f"{preamble('manager')} task3", stream=True))
+
+    assert second.cache.stats()["hits"] == 1
+    # Only the task token is evaluated; the 40-token preamble comes from the saved state
+    assert llama.evaluated == 1
+
+
+def test_memory_tier_is_bounded():
+    cache = PrefixStateCache(block_tokens=2, max_memory_bytes=1)
+    cache.store(["a"], State([1, 2]))
+    cache.store(["b"], State([3, 4]))
+
+    assert cache.stats()["states"] == 1
+    assert cache.lookup([(2, "a")]) is None
+    assert cache.lookup([(2, "b")])[1] == State([3, 4])
+
+
+def test_snapshot_holds_the_prefix_not_the_completion():
+    llama = FakeLlama()
+    client = PrefixCachingLlama(llama, PrefixStateCache(block_tokens=8), "model")
+    prompt = preamble("manager")
+
+    client(f"{prompt} task1")
+    client(f"{prompt} task2")
+
+    (state, _), = client.cache._states.values()
+    assert state.input_ids == llama.tokenize(prompt.encode())
+
+
+def test_failed_or_oversized_snapshot_does_not_fail_the_call():
+    class BrokenDisk:
+        def get(self, key):
+            return None
+
+        def set(self, key, value):
+            raise OverflowError("string or blob too big")
+
+    broken = PrefixCachingLlama(FakeLlama(), PrefixStateCache(block_tokens=8, disk=BrokenDisk()), "model")
+    capped = PrefixCachingLlama(FakeLlama(), PrefixStateCache(block_tokens=8, max_state_bytes=1), "model")
+
+    for client in (broken, capped):
+        for task in range(2):
+            assert client(f"{preamble('manager')} task{task}") == {"choices": [{"text": "ok"}]}
+    assert capped.cache.stats()["states"] == 0
@@ -0,0 +1,104 @@
+import json
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.database.profile_store import ProfileStore
+
+
+def make_profile_issue(number, username, skills, updated_at=datetime(2024, 12, 1), state="open", body=None):
+    issue = Mock()
+    issue.number = number
+    issue.state = state
+    issue.updated_at = updated_at
+    issue.body = body if body is not None else json.dumps({"username": username, "skill_weights": skills})
+    return issue
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileStore(str(tmp_path / "profiles.db"))
+
+
+@pytest.fixture
+def repository():
+    repository = Mock()
+    repository.full_name = "o/ai-dev-orchestrator"
+    repository.get_issues.return_value = [
+        make_profile_issue(1, "ana", {"Python": 1.0, "docker": 0.4}),
+        make_profile_issue(2, "bo", {"react": 1.0}, updated_at=datetime(2024, 12, 3)),
+        make_profile_issue(3, "cy", {}, body="not json"),
+    ]
+    return repository
+
+
+def test_refresh_is_incremental(store, repository):
+    assert store.refresh(repository) == 2
+    repository.get_issues.assert_called_once_with(
+        labels=["developer-profile"], state="all", sort="updated", direction="asc"
+    )
+
+    repository.get_issues.return_value = []
+    store.refresh(repository)
+    repository.get_issues.assert_called_with(
+        labels=["developer-profile"], state="all", sort="updated", direction="asc", since=datetime(2024, 12, 3)
+    )
+    # Newest profile issue first, as the issue listing returned them
+    assert [profile["username"] for profile in store.profiles()] == ["bo", "ana"]
+
+
+def test_candidates_use_skill_index(store, repository):
+    store.refresh(repository)
+
+    assert store.candidates(["python"]) == ["ana"]
+    assert store.candidates(["React", "docker"]) == ["ana", "bo"]
+    assert store.candidates(["rust"]) == []
+    assert store.candidates([]) == []
+
+
+def test_revision_changes_only_with_stored_profiles(store, repository):
+    store.refresh(repository)
+    revision = store.revision
+
+    repository.get_issues.return_value = []
+    store.refresh(repository)
+    assert store.revision == revision
+
+    store.upsert({"username": "dee", "skill_weights": {"go": 1.0}})
+    assert store.revision > revision
+
+
+def test_older_issue_does_not_overwrite_newer_profile(store, repository):
+    store.refresh(repository)
+    repository.get_issues.return_value = [
+        make_profile_issue(4, "bo", {"vue": 1.0}, updated_at=datetime(2024, 11, 1)),
+        make_profile_issue(5, "ana", {"go": 1.0}, updated_at=datetime(2024, 12, 9)),
+    ]
+
+    assert store.refresh(repository) == 1
+    assert store.get("bo")["skill_weights"] == {"react": 1.0}
+    assert store.candidates(["python"]) == []
+    assert store.candidates(["go"]) == ["ana"]
+
+
+def test_closed_profile_issue_removes_profile(store, repository):
+    store.refresh(repository)
+    repository.get_issues.return_value = [
+        make_profile_issue(2, "bo", {}, updated_at=datetime(2024, 12, 4), state="closed")
+    ]
+
+    store.refresh(repository)
+
+    assert store.get("bo") is None
+    assert store.candidates(["react"]) == []
+    assert store.count() == 1
+
+
+def test_profiles_persist_across_instances(store, repository, tmp_path):
+    store.refresh(repository)
+
+    reopened = ProfileStore(str(tmp_path / "profiles.db"))
+
+    assert reopened.count() == 2
+    assert reopened.watermark("o/ai-dev-orchestrator") == datetime(2024, 12, 3)
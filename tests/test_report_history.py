@@ -0,0 +1,73 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.monitoring.report_history import ReportHistory, convert_directory
+
+
+def make_report(run, repos=("a", "b", "c"), stars=None):
+    stars = stars or {}
+    return {
+        "repository_status": {
+            "timestamp": f"2024-12-27T06:{run:02d}:00",
+            "total_repositories": len(repos),
+            "repositories": [{"name": r, "full_name": f"o/{r}", "stars": stars.get(r, 1)} for r in repos],
+        },
+        "workflow_runs": {"timestamp": f"2024-12-27T06:{run:02d}:00", "workflow_runs": []},
+    }
+
+
+START = datetime(2024, 12, 27, 6, 0)
+
+
+class TestReportHistory:
+    @pytest.fixture
+    def history(self, tmp_path):
+        return ReportHistory(str(tmp_path / "history"), keyframe_interval=3)
+
+    def test_keyframes_and_deltas(self, history):
+        for run in range(5):
+            history.append(make_report(run), START + timedelta(minutes=run))
+
+        assert [kind for _, kind, _ in history.entries()] == ["keyframe", "delta", "delta", "keyframe", "delta"]
+
+    def test_delta_only_stores_changed_repositories(self, history):
+        history.append(make_report(0), START)
+        path = history.append(make_report(1, stars={"b": 5}), START + timedelta(minutes=1))
+
+        with open(path) as f:
+            delta = json.load(f)
+        assert list(delta["repository_status"]["repositories"]["changed"]) == ["o/b"]
+
+    def test_snapshot_at_reconstructs_point_in_time(self, history):
+        reports = [
+            make_report(0),
+            make_report(1, stars={"a": 7}),
+            make_report(2, repos=("c", "a", "d")),
+            make_report(3, repos=("d",)),
+        ]
+        for run, report in enumerate(reports):
+            history.append(report, START + timedelta(minutes=run))
+
+        for run, report in enumerate(reports):
+            assert history.snapshot_at(START + timedelta(minutes=run, seconds=30)) == report
+        assert history.snapshot_at(START - timedelta(minutes=1)) is None
+
+    def test_rejects_out_of_order_runs(self, history):
+        history.append(make_report(0), START)
+        with pytest.raises(ValueError):
+            history.append(make_report(1), START)
+
+
+def test_convert_directory(tmp_path):
+    source = tmp_path / "monitoring"
+    source.mkdir()
+    for run in range(4):
+        name = (START + timedelta(minutes=run)).strftime("report_%Y%m%d_%H%M%S.json")
+        (source / name).write_text(json.dumps(make_report(run, stars={"a": run})))
+
+    history = ReportHistory(str(tmp_path / "history"))
+    assert convert_directory(str(source), history, remove=True) == 4
+    assert history.latest() == make_report(3, stars={"a": 3})
+    assert not list(source.glob("report_*.json"))
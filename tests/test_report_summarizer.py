@@ -0,0 +1,112 @@
+import threading
+from datetime import datetime, timedelta
+
+from src.workflows.report_summarizer import ReportSummarizer, chunk_reports
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        return f"summary {len(self.prompts)}"
+
+
+def hourly_reports(days=2, repos=3, start=datetime(2024, 12, 16)):
+    reports = []
+    for hour in range(days * 24):
+        when = start + timedelta(hours=hour)
+        reports.append(
+            {
+                "timestamp": when.isoformat(),
+                "repositories": {
+                    f"repo-{r}": {
+                        "open_issues": 5 + (hour // 6 if r == 0 else 0),
+                        "open_prs": 2,
+                        "last_commit": 100 + r,
+                        "last_updated": "2024-12-16T00:00:00",
+                    }
+                    for r in range(repos)
+                },
+            }
+        )
+    return reports
+
+
+def test_chunks_per_repo_and_day_without_repeated_snapshots():
+    chunks = chunk_reports(hourly_reports())
+
+    assert [(chunk.repo, chunk.day) for chunk in chunks] == [
+        ("repo-0", "2024-12-16"),
+        ("repo-0", "2024-12-17"),
+        ("repo-1", "2024-12-16"),
+        ("repo-2", "2024-12-16"),
+    ]
+    # repo-0 changes every 6 hours; the others only appear in their first snapshot
+    assert len(chunks[0].text.splitlines()) == 4
+    assert chunks[2].text == "00:00: 5 / 2 / 101 / 2024-12-16T00:00:00"
+
+
+def test_flat_reports_and_long_days_are_split():
+    report = {"timestamp": "2024-12-16T10:00:00", "repo": {"open_issues": 1, "open_prs": 0, "last_commit": 1}}
+    reports = [dict(report, repo=dict(report["repo"], open_issues=i)) for i in range(50)]
+
+    chunks = chunk_reports(reports, max_chars=200)
+
+    assert len(chunks) > 1 and all(len(chunk.text) <= 200 for chunk in chunks)
+    assert chunk_reports([{"repo": {"open_issues": 1}}])[0].day == "unknown"
+
+
+def test_rerun_only_summarizes_new_chunks(tmp_path):
+    llm = FakeLLM()
+    summarizer = ReportSummarizer(llm, cache_path=str(tmp_path / "summaries.db"), max_workers=4)
+
+    first = summarizer.summarize(hourly_reports(days=2))
+    calls = len(llm.prompts)
+    assert calls == 4 + 1
+
+    assert summarizer.summarize(hourly_reports(days=2)) == first
+    assert len(llm.prompts) == calls
+
+    summarizer.summarize(hourly_reports(days=3))
+    # One new repo-0 day plus the final reduce
+    assert len(llm.prompts) == calls + 2
+
+
+def test_reduce_stays_within_budget(tmp_path):
+    llm = FakeLLM()
+    summarizer = ReportSummarizer(llm, cache_path=str(tmp_path / "summaries.db"), max_chars=100)
+
+    result = summarizer.reduce([f"repo-{i}: " + "x" * 40 for i in range(20)])
+
+    assert result.startswith("summary")
+    assert all(len(prompt) < 100 + 200 for prompt in llm.prompts)
+
+
+def test_no_reports(tmp_path):
+    summarizer = ReportSummarizer(FakeLLM(), cache_path=str(tmp_path / "summaries.db"))
+
+    assert summarizer.summarize([]) == "No status reports this week."
+
+
+def test_cached_summaries_are_per_model(tmp_path):
+    class ModelLLM(FakeLLM):
+        def __init__(self, model_path, temperature):
+            super().__init__()
+            self._identifying_params = {"model_path": model_path, "temperature": temperature}
+
+    path = str(tmp_path / "summaries.db")
+    reports = hourly_reports(days=1, repos=1)
+    first = ModelLLM("models/a.gguf", 0.2)
+    ReportSummarizer(first, cache_path=path).summarize(reports)
+
+    same = ModelLLM("models/a.gguf", 0.2)
+    other_model, other_temperature = ModelLLM("models/b.gguf", 0.2), ModelLLM("models/a.gguf", 0.7)
+    for llm in (same, other_model, other_temperature):
+        ReportSummarizer(llm, cache_path=path).summarize(reports)
+
+    assert len(first.prompts) == 1 and same.prompts == []
+    assert len(other_model.prompts) == 1 and len(other_temperature.prompts) == 1
@@ -0,0 +1,52 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.utils.repository_counts import RepositoryCountsFetcher
+
+
+def repository_node(name, open_issues=3):
+    return {
+        "nameWithOwner": name,
+        "updatedAt": "2024-12-27T06:10:24Z",
+        "pushedAt": "2024-12-26T18:00:00Z",
+        "openIssues": {"totalCount": open_issues},
+        "closedIssues": {"totalCount": 7},
+        "openPullRequests": {"totalCount": 2},
+        "defaultBranchRef": {"target": {"history": {"totalCount": 120}}},
+        "deployments": {"nodes": [{"createdAt": "2024-12-20T10:00:00Z"}]},
+    }
+
+
+class TestRepositoryCountsFetcher:
+    @pytest.fixture
+    def fetcher(self):
+        fetcher = RepositoryCountsFetcher("token", batch_size=2)
+        fetcher.session = Mock()
+        fetcher.session.post.return_value.json.return_value = {
+            "data": {"r0": repository_node("ZubeidHendricks/a"), "r1": None}
+        }
+        return fetcher
+
+    def test_build_query_aliases_each_repository(self, fetcher):
+        query = fetcher.build_query(["ZubeidHendricks/a", "octo/b"])
+
+        assert 'r0: repository(owner: "ZubeidHendricks", name: "a")' in query
+        assert 'r1: repository(owner: "octo", name: "b")' in query
+
+    def test_fetch_batches_and_parses(self, fetcher):
+        counts = fetcher.fetch(["a", "missing"])
+
+        assert fetcher.session.post.call_count == 1
+        assert counts["ZubeidHendricks/a"]["open_issues"] == 3
+        assert counts["ZubeidHendricks/a"]["commits"] == 120
+        assert counts["ZubeidHendricks/a"]["last_deployment"].day == 20
+        assert counts["ZubeidHendricks/a"]["pushed_at"].day == 26
+        assert counts["ZubeidHendricks/missing"] is None
+
+    def test_results_are_memoised(self, fetcher):
+        fetcher.fetch(["a"])
+        fetcher.get("a")
+
+        assert fetcher.session.post.call_count == 1
+        assert fetcher.cached("a")["open_prs"] == 2
@@ -0,0 +1,86 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.monitoring.repository_pool import RepositoryPool, default_max_workers
+
+
+def repos(count):
+    return [SimpleNamespace(name=f"repo{i}", full_name=f"owner/repo{i}") for i in range(count)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_results_keep_repository_order(max_workers):
+    pool = RepositoryPool(max_workers)
+
+    # Earlier repositories finish last, so completion order is the reverse of repository order
+    results = pool.map("status", repos(6), lambda repo: time.sleep(0.01 * (6 - int(repo.name[4:]))) or repo.name)
+
+    assert results == [f"repo{i}" for i in range(6)]
+
+
+def test_failing_repository_yields_none_and_spares_the_others():
+    pool = RepositoryPool(4)
+
+    def fetch(repo):
+        if repo.name == "repo2":
+            raise RuntimeError("404")
+        return repo.name
+
+    assert pool.map("status", repos(4), fetch) == ["repo0", "repo1", None, "repo3"]
+    assert len(pool.latencies["status"]) == 4
+
+
+def test_concurrency_is_bounded_by_max_workers(monkeypatch):
+    monkeypatch.delenv("MONITOR_MAX_WORKERS", raising=False)
+    pool = RepositoryPool(default_max_workers({"concurrency": {"max_workers": 2}}))
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def fetch(repo):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    pool.map("status", repos(8), fetch)
+
+    assert pool.max_workers == 2 and peak[0] == 2
+
+
+def test_max_workers_from_env_and_at_least_one(monkeypatch):
+    monkeypatch.setenv("MONITOR_MAX_WORKERS", "3")
+    assert default_max_workers({"concurrency": {"max_workers": 16}}) == 3
+
+    monkeypatch.delenv("MONITOR_MAX_WORKERS")
+    assert default_max_workers({}) == 8
+    assert RepositoryPool(0).max_workers == 1
+
+
+def test_latency_summary(capsys):
+    pool = RepositoryPool(2)
+    pool.latencies = {
+        "status": {f"owner/repo{i}": float(i) for i in range(1, 11)},
+        "runs": {},
+    }
+
+    summary = pool.latency_summary()
+
+    assert list(summary) == ["status"]
+    assert summary["status"] == {
+        "repositories": 10,
+        "total": 55.0,
+        "p50": 6.0,
+        "p95": 10.0,
+        "max": 10.0,
+        "slowest": ["owner/repo10", "owner/repo9", "owner/repo8", "owner/repo7", "owner/repo6"],
+    }
+    pool.print_latency_summary()
+    assert capsys.readouterr().out == (
+        "status: 10 repositories, p50 6.00s, p95 10.00s, max 10.00s "
+        "(2 workers, slowest: owner/repo10, owner/repo9, owner/repo8, owner/repo7, owner/repo6)\n"
+    )
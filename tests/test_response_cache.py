@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from github.Requester import HTTPSRequestsConnectionClass
+
+from src.utils import github_client
+from src.utils.disk_cache import DiskCache
+from src.utils.response_cache import CachedResponse, ResponseCache
+
+AUTH = {"Authorization": "token abc"}
+
+
+class TestDiskCache:
+    def test_lru_eviction(self, tmp_path):
+        cache = DiskCache(str(tmp_path / "cache.db"), max_bytes=30)
+        cache.set("a", "x" * 10)
+        cache.set("b", "x" * 10)
+        cache.get("a")
+        cache.set("c", "x" * 10)
+        cache.set("d", "x" * 10)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.stats()["bytes"] <= 30
+
+    def test_delete_prefix(self, tmp_path):
+        cache = DiskCache(str(tmp_path / "cache.db"))
+        cache.set("repo:1", "a")
+        cache.set("repo:2", "b")
+        cache.set("other", "c")
+
+        assert cache.delete_prefix("repo:") == 2
+        assert len(cache) == 1
+
+
+class TestResponseCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ResponseCache(
+            str(tmp_path / "responses.db"),
+            default_ttl=0,
+            ttl_rules=[{"pattern": "^/rate_limit", "ttl": -1}, {"pattern": "/languages$", "ttl": 3600}],
+        )
+
+    def test_ttl_rules(self, cache):
+        assert cache.ttl_for("/repos/o/r/languages") == 3600
+        assert cache.ttl_for("/rate_limit") == -1
+        assert cache.ttl_for("/repos/o/r/issues?state=open") == 0
+
+    def test_revalidation_headers(self, cache):
+        url = "/repos/o/r/issues?state=open"
+        cache.store_response(url, AUTH, 200, [("ETag", 'W/"123"'), ("Last-Modified", "Mon")], "[]")
+
+        entry = cache.lookup(url, AUTH)
+        assert not entry["fresh"]
+        assert cache.conditional_headers(entry) == {"If-None-Match": 'W/"123"', "If-Modified-Since": "Mon"}
+
+    def test_fresh_entry(self, cache):
+        url = "/repos/o/r/languages"
+        cache.store_response(url, AUTH, 200, [("ETag", '"1"')], json.dumps({"Python": 10}))
+
+        entry = cache.lookup(url, AUTH)
+        assert entry["fresh"]
+        assert json.loads(entry["body"]) == {"Python": 10}
+
+    def test_entries_scoped_to_token(self, cache):
+        url = "/repos/o/r/languages"
+        cache.store_response(url, AUTH, 200, [("ETag", '"1"')], "{}")
+
+        assert cache.lookup(url, {"Authorization": "token other"}) is None
+
+    def test_write_invalidates_repository(self, cache):
+        cache.store_response("/repos/o/r/issues", AUTH, 200, [("ETag", '"1"')], "[]")
+        cache.store_response("/repos/o/other/issues", AUTH, 200, [("ETag", '"2"')], "[]")
+
+        cache.invalidate("/repos/o/r/issues/4/labels", AUTH)
+
+        assert cache.lookup("/repos/o/r/issues", AUTH) is None
+        assert cache.lookup("/repos/o/other/issues", AUTH) is not None
+
+
+def test_uncached_block_reads_past_fresh_entries(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "responses.db"), default_ttl=60)
+    monkeypatch.setattr(github_client, "_response_cache", cache)
+    monkeypatch.setattr(
+        HTTPSRequestsConnectionClass, "getresponse", lambda self: CachedResponse(200, {"ETag": '"2"'}, "[2]")
+    )
+    url = "/repos/o/r/issues"
+    cache.store_response(url, AUTH, 200, [("ETag", '"1"')], "[1]")
+
+    def get():
+        connection = github_client.CachingHTTPSConnection("api.github.com")
+        connection.request("GET", url, None, dict(AUTH))
+        return connection.getresponse().read()
+
+    assert get() == "[1]"
+    with github_client.uncached():
+        assert get() == "[2]"
+    # The fresh response replaced the cached one
+    assert get() == "[2]"
@@ -0,0 +1,144 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.monitoring.metrics_store import MetricsStore
+from src.monitoring.report_history import ReportHistory
+from src.monitoring.retention import RetentionJob, add_to_index, indexed_files, load_index
+
+NOW = datetime(2024, 12, 31, 12, 0)
+
+
+def write(directory, name, content=None):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / name).write_text(json.dumps(content or {}))
+
+
+def report(full_name="o/a", open_issues=1):
+    return {
+        "repository_status": {"repositories": [{"full_name": full_name, "open_issues": open_issues}]},
+        "workflow_runs": {"workflow_runs": []},
+    }
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "monitoring.json"
+    path.write_text(
+        json.dumps(
+            {
+                "retention": {"alerts": 30, "metrics": 90, "reports": 180},
+                "compaction": {"daily_after_days": 7, "weekly_after_days": 30},
+                "metrics": {"store_path": "metrics.npz"},
+            }
+        )
+    )
+    return str(path)
+
+
+def test_expired_files_are_deleted(tmp_path, config):
+    alerts = tmp_path / "alerts"
+    write(alerts, "alerts_20241101_0900.json")
+    write(alerts, "alerts_20241230_0900.json")
+    write(alerts, "thresholds.json")
+
+    summary = RetentionJob(config, root=str(tmp_path)).run(NOW)
+
+    assert summary["alerts"] == {"kept": 1, "compacted": 0, "deleted": 1}
+    assert sorted(p.name for p in alerts.iterdir()) == ["alerts_20241230_0900.json", "index.json", "thresholds.json"]
+
+
+def test_snapshots_are_thinned_to_daily_then_weekly(tmp_path, config):
+    monitoring = tmp_path / "data" / "monitoring"
+    recent = NOW - timedelta(days=1)
+    for hour in (6, 12, 18):
+        write(monitoring, (recent.replace(hour=hour)).strftime("report_%Y%m%d_%H%M%S.json"), report())
+        write(monitoring, datetime(2024, 12, 15, hour).strftime("report_%Y%m%d_%H%M%S.json"), report())
+    for day in (2, 3, 4):
+        write(monitoring, datetime(2024, 11, day, 8).strftime("report_%Y%m%d_%H%M%S.json"), report(open_issues=day))
+
+    summary = RetentionJob(config, root=str(tmp_path)).run(NOW)
+
+    assert summary["data/monitoring"] == {"kept": 6, "compacted": 3, "deleted": 0}
+    index = {entry["name"]: entry for entry in load_index(str(monitoring))}
+    assert index["report_20241215_180000.json"]["period"] == "daily"
+    assert index["report_20241215_180000.json"]["covers"] == 3
+    # 2024-11-02 is in ISO week 44, 11-03 ends it; 11-04 starts week 45
+    assert index["report_20241103_080000.json"]["covers"] == 2
+    # The kept snapshot aggregates the ones dropped from its bucket
+    assert index["report_20241103_080000.json"]["aggregate"]["o/a"]["open_issues"] == {
+        "min": 2,
+        "max": 3,
+        "mean": 2.5,
+        "sum": 5,
+        "count": 2,
+    }
+    # Thinned monitoring reports stay queryable in the metrics store
+    assert len(MetricsStore(str(tmp_path / "metrics.npz"))) == 3
+
+
+def test_daily_aggregates_roll_up_into_weekly(tmp_path, config):
+    monitoring = tmp_path / "data" / "monitoring"
+    for hour, open_issues in ((6, 1), (12, 9), (18, 2)):
+        write(
+            monitoring,
+            datetime(2024, 12, 1, hour).strftime("report_%Y%m%d_%H%M%S.json"),
+            report(open_issues=open_issues),
+        )
+    write(monitoring, datetime(2024, 12, 1, 20).strftime("report_%Y%m%d_%H%M%S.json"), report(open_issues=4))
+
+    RetentionJob(config, root=str(tmp_path)).run(datetime(2024, 12, 10))
+    # Three weeks later the daily snapshot and one more run of the same week fold into a weekly one
+    write(monitoring, datetime(2024, 11, 30, 8).strftime("report_%Y%m%d_%H%M%S.json"), report(open_issues=6))
+    RetentionJob(config, root=str(tmp_path)).run(datetime(2025, 1, 10))
+
+    [entry] = load_index(str(monitoring))
+    assert entry["period"] == "weekly" and entry["covers"] == 5
+    assert entry["aggregate"]["o/a"]["open_issues"] == {"min": 1, "max": 9, "mean": 4.4, "sum": 22, "count": 5}
+
+
+def test_report_history_is_expired_and_compacted(tmp_path, config):
+    directory = tmp_path / "data" / "monitoring" / "history"
+    history = ReportHistory(str(directory), keyframe_interval=4)
+    runs = [datetime(2024, 9, 1, 8)] + [datetime(2024, 12, 15, hour) for hour in range(6, 12)]
+    runs += [NOW - timedelta(hours=hours) for hours in (3, 2, 1)]
+    for n, when in enumerate(runs):
+        history.append(report(open_issues=n), when)
+    recent = {when: history.snapshot_at(when) for when in runs[-3:]}
+
+    summary = RetentionJob(config, root=str(tmp_path)).run(NOW)
+
+    assert summary["data/monitoring/history"] == {"kept": 4, "compacted": 5, "deleted": 1}
+    history = ReportHistory(str(directory))
+    assert history.timestamps() == [datetime(2024, 12, 15, 11)] + runs[-3:]
+    assert history.entries()[0][1] == "keyframe"
+    assert all(history.snapshot_at(when) == snapshot for when, snapshot in recent.items())
+    assert history.latest() == report(open_issues=9)
+
+    [daily] = [entry for entry in load_index(str(directory)) if entry["period"] == "daily"]
+    assert daily["covers"] == 6
+    assert daily["aggregate"]["o/a"]["open_issues"] == {"min": 1, "max": 6, "mean": 3.5, "sum": 21, "count": 6}
+    assert len(MetricsStore(str(tmp_path / "metrics.npz"))) == 5
+
+    # Nothing left to thin: the chain is not rewritten again
+    assert RetentionJob(config, root=str(tmp_path)).run(NOW)["data/monitoring/history"]["compacted"] == 0
+
+
+def test_dry_run_changes_nothing(tmp_path, config):
+    write(tmp_path / "alerts", "alerts_20241101_0900.json")
+
+    RetentionJob(config, root=str(tmp_path), dry_run=True).run(NOW)
+
+    assert (tmp_path / "alerts" / "alerts_20241101_0900.json").exists()
+
+
+def test_readers_use_the_index(tmp_path):
+    status = tmp_path / "status"
+    write(status, "status_20241230_0900.json")
+    assert indexed_files(str(status), prefix="status_") == ["status_20241230_0900.json"]
+
+    write(status, "status_20241231_0900.json")
+    add_to_index(str(status), str(status / "status_20241231_0900.json"))
+
+    assert indexed_files(str(status), prefix="status_", since=datetime(2024, 12, 31)) == ["status_20241231_0900.json"]
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sklearn.dummy import DummyClassifier
+
+from src.database.risk_model_store import RiskModelStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RiskModelStore(str(tmp_path / "risk"), retrain_after=2)
+
+
+def test_add_skips_unchanged_issues_and_replaces_updated_ones(store):
+    assert store.add([1, 2], [datetime(2024, 12, 1), datetime(2024, 12, 5)], [[1, 0], [2, 1]], ["low", "high"]) == 2
+    # The next query re-reads the cursor's second; unchanged issues are skipped
+    assert store.add([2], [datetime(2024, 12, 5)], [[2, 1]], ["high"]) == 0
+    assert store.fetch_since() == datetime(2024, 12, 4, 23, 59, 59)
+
+    # Issue 1 was relabelled after it closed: same closed_at, newer updated_at
+    assert store.add([1], [datetime(2024, 12, 9)], [[5, 1]], ["medium"]) == 1
+
+    assert sorted(zip(store.numbers.tolist(), store.labels.tolist())) == [(1, "medium"), (2, "high")]
+    assert store.features[store.numbers == 1].tolist() == [[5.0, 1.0]]
+    assert store.cursor == datetime(2024, 12, 9)
+
+
+def test_stores_versioned_by_closed_at_still_load(store, tmp_path):
+    store.add([1], [datetime(2024, 12, 1)], [[1]], ["low"])
+    store.save()
+    with np.load(store.features_path) as data:
+        arrays = {("closed_at" if name == "updated_at" else name): data[name] for name in data.files}
+    np.savez_compressed(store.features_path, **arrays)
+
+    reopened = RiskModelStore(str(tmp_path / "risk"))
+    assert reopened.add([1], [datetime(2024, 12, 1)], [[1]], ["low"]) == 0
+    assert reopened.add([1], [datetime(2024, 12, 3)], [[2]], ["low"]) == 1
+
+
+def test_retraining_waits_for_enough_new_issues(store):
+    assert not store.needs_training()
+    store.add([1], [datetime(2024, 12, 1)], [[1]], ["low"])
+    # Nothing fitted yet
+    assert store.needs_training()
+
+    store.save_model(DummyClassifier().fit(store.features, store.labels))
+    assert not store.needs_training()
+
+    store.add([2], [datetime(2024, 12, 2)], [[2]], ["low"])
+    assert not store.needs_training()
+    store.add([3], [datetime(2024, 12, 3)], [[3]], ["high"])
+    assert store.needs_training()
+
+
+def test_features_and_model_persist(store, tmp_path):
+    store.add([1, 2], [datetime(2024, 12, 1), datetime(2024, 12, 2)], [[1, 0], [2, 1]], ["low", "high"])
+    store.save_model(DummyClassifier(strategy="constant", constant="high").fit(store.features, store.labels))
+    store.add([3], [datetime(2024, 12, 3)], [[3, 0]], ["low"])
+    store.save()
+
+    reopened = RiskModelStore(str(tmp_path / "risk"), retrain_after=2)
+    assert reopened.numbers.tolist() == [1, 2, 3]
+    assert reopened.pending == 1
+    assert reopened.cursor == datetime(2024, 12, 3)
+    assert reopened.model.predict(np.zeros((3, 2))).tolist() == ["high"] * 3
+
+    reopened.clear()
+    assert len(reopened) == 0
+    assert reopened.model is None
+    assert reopened.fetch_since() is None
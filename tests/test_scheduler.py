@@ -0,0 +1,87 @@
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src.monitoring.scheduler import CheckScheduler, build_default_scheduler
+
+NOW = datetime(2024, 12, 27, 12, 0)
+
+
+class TestCheckScheduler:
+    @pytest.fixture
+    def fetcher(self):
+        fetcher = Mock()
+        fetcher.fetch.return_value = {
+            "o/a": {"pushed_at": datetime(2024, 12, 27, 9, 0)},
+            "o/b": {"pushed_at": datetime(2024, 12, 26, 9, 0)},
+        }
+        return fetcher
+
+    @pytest.fixture
+    def scheduler(self, tmp_path, fetcher):
+        return CheckScheduler(
+            {"basic": 300, "detailed": 3600},
+            state_path=str(tmp_path / "state.json"),
+            counts_fetcher=fetcher,
+            repositories=["o/a", "o/b"],
+        )
+
+    def test_tiers_follow_their_intervals(self, scheduler):
+        basic, detailed = Mock(), Mock()
+        scheduler.register("counts", "basic", basic)
+        scheduler.register("workflows", "detailed", detailed)
+
+        assert scheduler.run_pending(NOW) == {"counts": "ran", "workflows": "ran"}
+        assert scheduler.run_pending(NOW + timedelta(minutes=10)) == {"counts": "ran"}
+        assert scheduler.run_pending(NOW + timedelta(minutes=61)) == {"counts": "ran", "workflows": "ran"}
+        assert basic.call_count == 3 and detailed.call_count == 2
+
+    def test_unchanged_repositories_are_skipped(self, scheduler, fetcher):
+        check = Mock()
+        scheduler.register("workflows", "detailed", check, per_repository=True, skip_unchanged=True)
+
+        scheduler.run_pending(NOW)
+        check.assert_called_once_with(["o/a", "o/b"])
+
+        fetcher.fetch.return_value = dict(fetcher.fetch.return_value, **{"o/b": {"pushed_at": NOW}})
+        scheduler.run_pending(NOW + timedelta(hours=1))
+        check.assert_called_with(["o/b"])
+
+        assert scheduler.run_pending(NOW + timedelta(hours=2)) == {"workflows": "skipped"}
+        assert check.call_count == 2
+
+    def test_state_survives_restart(self, scheduler, tmp_path, fetcher):
+        scheduler.register("counts", "basic", Mock())
+        scheduler.run_pending(NOW)
+
+        restarted = CheckScheduler(state_path=str(tmp_path / "state.json"), counts_fetcher=fetcher)
+        restarted.register("counts", "basic", Mock())
+        assert restarted.run_pending(NOW + timedelta(minutes=1)) == {}
+        assert restarted.next_run(NOW) == NOW + timedelta(minutes=5)
+
+    def test_failed_check_is_retried_for_the_same_pushes(self, scheduler):
+        check = Mock(side_effect=[RuntimeError("boom"), None])
+        scheduler.register("workflows", "detailed", check, per_repository=True, skip_unchanged=True)
+
+        assert scheduler.run_pending(NOW) == {"workflows": "failed"}
+        assert scheduler.run_pending(NOW + timedelta(hours=1)) == {"workflows": "ran"}
+        check.assert_called_with(["o/a", "o/b"])
+
+    def test_monitoring_report_covers_only_pushed_repositories(self, tmp_path, fetcher, monkeypatch):
+        monitor = Mock()
+        monkeypatch.setitem(sys.modules, "src.monitoring.monitor", SimpleNamespace(RepositoryMonitor=monitor))
+        scheduler = build_default_scheduler(
+            state_path=str(tmp_path / "state.json"), counts_fetcher=fetcher, repositories=["o/a", "o/b"]
+        )
+        scheduler.checks = {"monitoring_report": scheduler.checks["monitoring_report"]}
+
+        scheduler.run_pending(NOW)
+        assert monitor.call_args.kwargs["repositories"] == ["o/a", "o/b"]
+
+        fetcher.fetch.return_value = dict(fetcher.fetch.return_value, **{"o/b": {"pushed_at": NOW}})
+        scheduler.run_pending(NOW + timedelta(hours=1))
+        assert monitor.call_args.kwargs["repositories"] == ["o/b"]
+        assert monitor.return_value.generate_comprehensive_report.call_count == 2
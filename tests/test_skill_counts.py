@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.skill_counts import SkillCountStore
+
+NOW = datetime(2024, 12, 31)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SkillCountStore(str(tmp_path / "skills.db"))
+
+
+def test_fold_counts_each_issue_once(store):
+    issues = [
+        (1, "ana", ["backend", "api"], datetime(2024, 12, 1)),
+        (2, "ana", ["backend"], datetime(2024, 12, 5)),
+        (3, "bo", ["frontend", "frontend"], datetime(2024, 12, 3)),
+    ]
+
+    assert store.fold(issues, now=NOW) == 3
+    # The next query re-reads the cursor's second; those issues are skipped by number
+    assert store.fold(issues[1:], now=NOW) == 0
+
+    assert store.skills() == {"ana": {"backend": 2, "api": 1}, "bo": {"frontend": 1}}
+    assert store.cursor == datetime(2024, 12, 5)
+    assert store.fetch_since() == datetime(2024, 12, 4, 23, 59, 59)
+
+
+def test_counts_persist_and_clear(store, tmp_path):
+    store.fold([(1, "ana", ["backend"], datetime(2024, 12, 1))], now=NOW)
+
+    reopened = SkillCountStore(str(tmp_path / "skills.db"))
+    assert reopened.skills() == {"ana": {"backend": 1}}
+    assert reopened.cursor == datetime(2024, 12, 1)
+
+    reopened.clear()
+    assert reopened.skills() == {}
+    assert reopened.fetch_since() is None
+
+
+def test_half_life_weights_recent_work_more(tmp_path):
+    store = SkillCountStore(str(tmp_path / "skills.db"), half_life_days=30)
+    store.fold(
+        [(1, "ana", ["backend"], NOW - timedelta(days=30)), (2, "bo", ["backend"], NOW)],
+        now=NOW,
+    )
+
+    skills = store.skills(now=NOW)
+    assert skills["ana"]["backend"] == pytest.approx(0.5)
+    assert skills["bo"]["backend"] == pytest.approx(1.0)
+
+    # Weights decay as time passes without re-reading issues, and new issues add on top
+    store.fold([(3, "ana", ["backend"], NOW + timedelta(days=30))], now=NOW + timedelta(days=30))
+    skills = store.skills(now=NOW + timedelta(days=30))
+    assert skills["ana"]["backend"] == pytest.approx(1.25)
+    assert skills["bo"]["backend"] == pytest.approx(0.5)
+
+
+def test_from_config_reads_half_life(tmp_path, monkeypatch):
+    config = tmp_path / "skill_model.json"
+    config.write_text(f'{{"path": "{tmp_path / "skills.db"}", "half_life_days": 14}}')
+
+    assert SkillCountStore.from_config(str(config)).half_life_days == 14.0
+
+    monkeypatch.setenv("SKILL_HALF_LIFE_DAYS", "off")
+    assert SkillCountStore.from_config(str(config)).half_life_days is None
@@ -0,0 +1,92 @@
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from src.assignment.skill_matcher import SkillMatcher, _synthetic, benchmark
+
+PROFILES = [
+    {"username": "ana", "skill_weights": {"python": 0.6, "docker": 0.4}},
+    {"username": "ben", "skill_weights": {"javascript": 0.6, "react": 0.4}},
+    {"username": "cy", "skills": {"languages": {"python": 1.0}, "technologies": {"django": 2}}},
+]
+
+
+def reference_scores(issue_skills, profiles):
+    """The previous per-developer MultiLabelBinarizer + cosine_similarity computation"""
+    skills = [
+        list(p.get("skill_weights") or {**p["skills"]["languages"], **p["skills"]["technologies"]}) for p in profiles
+    ]
+    mlb = MultiLabelBinarizer()
+    mlb.fit([issue_skills] + skills)
+    issue = mlb.transform([issue_skills])
+    return [cosine_similarity(issue, mlb.transform([s]))[0][0] for s in skills]
+
+
+def test_scores_match_per_developer_cosine():
+    profiles, issues = _synthetic(developers=40, issues=25, vocabulary=30)
+    matcher = SkillMatcher(profiles)
+
+    scores = matcher.scores(issues)
+
+    for row, issue in enumerate(issues):
+        np.testing.assert_allclose(scores[row], reference_scores(issue, profiles), atol=1e-9)
+
+
+def test_best_match_and_unknown_skills():
+    matcher = SkillMatcher(PROFILES)
+
+    assert matcher.best_match(["python", "django"]) == "cy"
+    assert matcher.best_match(["React", "kubernetes"]) == "ben"
+    # No overlap with anyone: ties resolve to the first profile, like argmax did
+    assert matcher.best_match(["rust"]) == "ana"
+    np.testing.assert_allclose(matcher.scores([["python", "rust"]])[0], reference_scores(["python", "rust"], PROFILES))
+
+
+def test_top_k_orders_by_score():
+    matcher = SkillMatcher(PROFILES)
+
+    top = matcher.top_k([["python"], ["javascript", "react"]], k=2)
+
+    # ana and cy tie at 1/sqrt(2); ties keep profile order
+    assert [name for name, _ in top[0]] == ["ana", "cy"]
+    assert top[1][0] == ("ben", 1.0)
+    assert SkillMatcher([]).top_k([["python"]]) == [[]]
+
+
+def test_matrix_is_rebuilt_only_when_profiles_change():
+    matcher = SkillMatcher(PROFILES)
+
+    assert matcher.update([dict(profile) for profile in PROFILES]) is False
+    changed = PROFILES[:2] + [{"username": "cy", "skill_weights": {"go": 1.0}}]
+    assert matcher.update(changed) is True
+    assert matcher.best_match(["go"]) == "cy"
+
+
+def test_best_match_among_candidates_matches_scoring_everyone():
+    profiles, issues = _synthetic(developers=60, issues=40, vocabulary=30)
+    matcher = SkillMatcher(profiles)
+
+    for issue in issues:
+        candidates = [p["username"] for p in profiles if {s.lower() for s in p["skill_weights"]} & set(issue)]
+        assert matcher.best_match(issue, among=candidates) == matcher.best_match(issue)
+    # Scoring a subset leaves the shared matrix as built
+    assert matcher.update(profiles) is False
+
+
+def test_best_match_among_keeps_previous_results():
+    matcher = SkillMatcher(PROFILES)
+
+    # ana and cy tie on python: profile order, not username order, decides
+    assert SkillMatcher(PROFILES[::-1]).best_match(["python"], among=["ana", "cy"]) == "cy"
+    # No candidate shares a skill: the first developer, as before
+    assert matcher.best_match(["rust"], among=[]) == "ana"
+    assert matcher.best_match(["python"], among=["unknown"]) == "ana"
+    assert SkillMatcher([]).best_match(["python"], among=["ana"]) is None
+
+
+def test_benchmark_1k_developers_10k_issues():
+    result = benchmark(developers=1000, issues=10000)
+
+    assert result["issues"] == 10000
+    # Typically well under a second; the bound only catches a return to per-developer loops
+    assert result["match_seconds"] < 10
@@ -0,0 +1,87 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.reporting.weekly_metrics import compute_weekly_metrics, format_for_prompt, load_status_history
+
+NOW = datetime(2024, 12, 23, 12, 0)
+
+
+def snapshot(days_ago, **repos):
+    return {
+        "timestamp": (NOW - timedelta(days=days_ago)).isoformat(),
+        "repositories": {
+            name: {"open_issues": issues, "open_prs": prs, "last_commit": commits}
+            for name, (issues, prs, commits) in repos.items()
+        },
+    }
+
+
+@pytest.fixture
+def history():
+    return [
+        # Previous week: api closes 2 of 10 open items over 10 commits, opening 1 issue
+        snapshot(13, api=(8, 2, 100), web=(3, 0, 50)),
+        snapshot(10, api=(9, 2, 105), web=(3, 0, 50)),
+        snapshot(8, api=(7, 1, 110), web=(3, 0, 50)),
+        # This week: api closes 4 and opens 2 issues over 20 commits
+        snapshot(6, api=(5, 1, 120), web=(4, 1, 52)),
+        snapshot(3, api=(7, 1, 125)),
+        snapshot(1, api=(4, 0, 130), web=(4, 0, 60)),
+    ]
+
+
+def test_per_repository_metrics_and_deltas(history):
+    result = compute_weekly_metrics(history, now=NOW)
+
+    api = result["repositories"]["api"]
+    # 8 -> 6 -> 8 -> 4 open items: closed 2 + 4, opened 2, starting from 8 open
+    assert api["velocity"] == 6
+    assert api["completion_rate"] == 0.6
+    assert api["commits"] == 20 and api["bug_rate"] == 0.1
+    assert api["deltas"]["velocity"] == 6 - 3
+
+    web = result["repositories"]["web"]
+    assert web["velocity"] == 1 and web["bug_rate"] == pytest.approx(1 / 10)
+
+
+def test_totals_match_repositories(history):
+    result = compute_weekly_metrics(history, now=NOW)
+
+    assert result["metrics"]["velocity"] == 7
+    assert result["previous"]["velocity"] == 3
+    assert result["deltas"]["velocity"] == 4
+    assert set(result["metrics"]) == {"velocity", "completion_rate", "bug_rate"}
+
+
+def test_first_week_has_no_deltas():
+    result = compute_weekly_metrics([snapshot(5, api=(5, 0, 10)), snapshot(1, api=(3, 0, 12))], now=NOW)
+
+    assert result["repositories"]["api"]["velocity"] == 2
+    assert result["repositories"]["api"]["deltas"]["velocity"] is None
+    assert result["deltas"]["completion_rate"] is None
+
+
+def test_empty_history():
+    result = compute_weekly_metrics([], now=NOW)
+
+    assert result["repositories"] == {}
+    assert result["metrics"] == {"velocity": 0.0, "completion_rate": None, "bug_rate": None}
+
+
+def test_prompt_text_is_compact(history):
+    many = history + [snapshot(2, **{f"repo-{i}": (i, 0, i) for i in range(200)})]
+
+    text = format_for_prompt(compute_weekly_metrics(many, now=NOW), top=10)
+
+    assert text.splitlines()[2].startswith("api:")
+    assert len(text.splitlines()) == 13 and len(text) < 1500
+
+
+def test_load_status_history_wraps_flat_files(tmp_path):
+    (tmp_path / "status_20241222_100000.json").write_text(json.dumps({"api": {"open_issues": 1}}))
+
+    reports = load_status_history(str(tmp_path))
+
+    assert reports == [{"timestamp": "2024-12-22T10:00:00", "repositories": {"api": {"open_issues": 1}}}]